@@ -2,12 +2,21 @@ from __future__ import unicode_literals
 import argparse
 import json
 import os
-import csv
+import time
 from collections import deque
 import numpy as np
 from src.io.utils import load_instance_as_list
+from src.io.catalog import get_all_instances, get_jobshop_instance
+from src.io.result_cache import DEFAULT_CACHE_FOLDER, ResultCache, dispatch_parameters
+from src.io.results import ResultsWriter
+from src.io.store import DEFAULT_STORE_PATH, InstanceStore
 from src.common.job_shop import JobShop
 from src.common.dispatcher import Dispatcher
+from src.common.event_dispatcher import EventDispatcher
+from src.common.rules import available_rules
+from src.plot.pipeline import PlotPipeline
+from src.solvers.portfolio import PORTFOLIO_METHODS
+from src.sweep import SWEEP_FIELDS, gap_percent, iter_sweep, print_sweep_summary, select_instances
 
 
 def createParser():
@@ -22,13 +31,139 @@ def createParser():
                         action='store',
                         default='./output/results.csv',
                         required=False,
-                        help='csv Schedule File')
+                        help='Results file, .csv or .jsonl. Rows are appended as soon as each run finishes.')
     parser.add_argument('--algorithm', '-a',
                         type=str,
                         action='store',
                         default='fifo',
                         required=False,
-                        help='algorithm choice from [fifo, lifo, mwkr, lwkr, random]')
+                        help=f'algorithm choice from [{", ".join(available_rules())}, random, ga, bnb, sb, portfolio] or all')
+    parser.add_argument('--engine', '-e',
+                        type=str,
+                        action='store',
+                        default='event',
+                        required=False,
+                        help='dispatching engine from [event, scan]. Both produce the same schedules, event is faster.')
+    parser.add_argument('--sweep', '-sw',
+                        action='store_true',
+                        default=False,
+                        required=False,
+                        help='Run all selected rules on all selected instances of instances.json on a process pool.')
+    parser.add_argument('--authors',
+                        type=str,
+                        nargs='*',
+                        default=None,
+                        help='Sweep: only instances by these authors, e.g. Taillard Demirkol')
+    parser.add_argument('--names',
+                        type=str,
+                        nargs='*',
+                        default=None,
+                        help='Sweep: only instances whose name matches one of these glob patterns, e.g. "ta*" "la0?"')
+    parser.add_argument('--min_jobs', type=int, default=None, help='Sweep: minimum number of jobs')
+    parser.add_argument('--max_jobs', type=int, default=None, help='Sweep: maximum number of jobs')
+    parser.add_argument('--min_machines', type=int, default=None, help='Sweep: minimum number of machines')
+    parser.add_argument('--max_machines', type=int, default=None, help='Sweep: maximum number of machines')
+    parser.add_argument('--rules',
+                        type=str,
+                        nargs='*',
+                        default=["fifo", "lifo", "mwkr", "lwkr", "random"],
+                        help='Sweep: rules to run on every instance')
+    parser.add_argument('--processes', '-p',
+                        type=int,
+                        default=None,
+                        help='Number of worker processes of a sweep (default: number of cores) or the ga algorithm (default: none)')
+    parser.add_argument('--seed',
+                        type=int,
+                        default=None,
+                        help='Seed for the random dispatching rule')
+    parser.add_argument('--rollouts', '-r',
+                        type=int,
+                        default=1,
+                        help='Number of random dispatching runs, the best one is kept. More than 1 runs them batched with numpy (semi-active mode only).')
+    parser.add_argument('--improve',
+                        type=str,
+                        default=None,
+                        required=False,
+                        help='Improve every dispatched schedule with a local search from [tabu]')
+    parser.add_argument('--time_limit', '-t',
+                        type=float,
+                        default=10.0,
+                        help='Time limit in seconds for --improve and the ga, bnb, sb and portfolio algorithms')
+    parser.add_argument('--iterations',
+                        type=int,
+                        default=None,
+                        help='Maximum number of iterations for --improve, generations for ga or nodes for bnb')
+    parser.add_argument('--population',
+                        type=int,
+                        default=100,
+                        help='Population size of the ga algorithm')
+    parser.add_argument('--crossover',
+                        type=str,
+                        default="pox",
+                        help='Crossover of the ga algorithm from [pox, jox]')
+    parser.add_argument('--mode', '-m',
+                        type=str,
+                        default="semi-active",
+                        help='Schedule mode of the dispatching rules from [semi-active, active, non-delay]')
+    parser.add_argument('--save_plots',
+                        action='store_true',
+                        default=False,
+                        required=False,
+                        help='Sweep: save a Gantt chart of every schedule in ./plots. Default is False.')
+    parser.add_argument('--plot_format',
+                        type=str,
+                        default="png",
+                        help='Format of the Gantt charts from [png, svg, none]. none skips plotting (also without matplotlib).')
+    parser.add_argument('--dpi',
+                        type=int,
+                        default=150,
+                        help='Resolution of png Gantt charts')
+    parser.add_argument('--plot_workers',
+                        type=int,
+                        default=1,
+                        help='Processes that render Gantt charts in the background while dispatching goes on (only with more than one algorithm). 0 renders them in the main process.')
+    parser.add_argument('--wait_for_plots',
+                        action='store_true',
+                        default=False,
+                        required=False,
+                        help='Wait for all background renders at exit and report the written charts.')
+    parser.add_argument('--export',
+                        type=str,
+                        default=None,
+                        help='Export every schedule as [json, csv] to --export_folder for external viewers')
+    parser.add_argument('--export_folder',
+                        type=str,
+                        default="./output/schedules",
+                        help='Folder of the exported schedules')
+    parser.add_argument('--resume',
+                        action='store_true',
+                        default=False,
+                        required=False,
+                        help='Keep the rows in --output and skip the (instance, algorithm, mode, seed) runs already in it')
+    parser.add_argument('--fsync',
+                        action='store_true',
+                        default=False,
+                        required=False,
+                        help='Force every result row to disk, not only to the OS')
+    parser.add_argument('--no_cache', '--no-cache',
+                        action='store_true',
+                        default=False,
+                        required=False,
+                        help='Always dispatch instead of reading deterministic schedules from the result cache in ./data/cache')
+    parser.add_argument('--cache_size',
+                        type=int,
+                        default=64,
+                        help='Size limit of the result cache in MB; the least recently used schedules are evicted')
+    parser.add_argument('--stop_at_bound',
+                        action='store_true',
+                        default=False,
+                        required=False,
+                        help='Sweep: skip the remaining rules of an instance once a schedule reaches its lower bound.')
+    parser.add_argument('--no_store',
+                        action='store_true',
+                        default=False,
+                        required=False,
+                        help='Sweep: parse the text instance files instead of the compiled binary instance store.')
     parser.add_argument('--show_plots', '-sp',
                         action='store_true',
                         default=False,
@@ -46,64 +181,21 @@ def createParser():
                         help='Verify all instances present in instances.json')
     return parser
 
-def get_nested(data, keys):
-    """
-    Retrieve value from nested dictionary.
-    
-    Parameters:
-    - data: The dictionary to search.
-    - keys: A list of keys representing the path in the nested dictionary.
-    
-    Returns:
-    - The value at the specified path or None if any key in the path does not exist.
-    """
-    for key in keys:
-        try:
-            data = data[key]
-        except KeyError:
-            return None
-    return data
-
-def get_all_instances():
-    instance_file = open(os.path.join(os.path.dirname( __file__ ), './instances.json'),"r")
-    json_data = json.load( instance_file )
-
-    json_instances = [ inst for inst in json_data ]
-    return json_instances
-
-def get_all_instances_as_dict():
-     json_instances = get_all_instances()
-     # Preprocess data into a dictionary for efficient lookup
-     benchmark_dict = {entry['name']: entry for entry in json_instances}
-     return benchmark_dict
-
-def get_jobshop_instance(instance_name: str) -> JobShop:
-    benchmark_dict = get_all_instances_as_dict()
-
-    if instance_name not in benchmark_dict:
-        raise KeyError(f"Instance '{instance_name}' not found in benchmark data.")
-    
-    benchmark_instance = benchmark_dict.get(instance_name)
-    job_shop = JobShop(file_path=benchmark_instance.get("path", None),
-                            name=benchmark_instance.get("name", None),
-                            optimum=benchmark_instance.get("optimum", None),
-                            info=benchmark_instance.get("info", None),
-                            author=benchmark_instance.get("author", None),
-                            upper_bound=get_nested(benchmark_dict, "upper"),
-                            lower_bound=get_nested(benchmark_dict, "lower"))
-    return job_shop
-
-def write_to_csv(output_file, results):
-    with open(output_file, mode='w', newline='') as file:
-        writer = csv.writer(file)
-        writer.writerow(['Algorithm', 'Instance', 'Makespan'])
-        for result in results:
-            writer.writerow(result)
+RUN_FIELDS = ['Instance', 'Algorithm', 'Mode', 'Seed', 'Jobs', 'Machines', 'Makespan', 'Optimum', 'Lower bound',
+              'Upper bound', 'Gap (%)', 'Verified', 'Wall time (s)']
+
+def open_results(args, fields):
+    """Open the --output file for streaming rows, or return None without an output file."""
+    if not args.output:
+        return None
+    return ResultsWriter(args.output, fields, resume=args.resume, fsync=args.fsync)
 
 def main():
     # parse args
     parser = createParser()
     args = parser.parse_args()
+    if args.rollouts > 1 and args.mode.lower() != "semi-active":
+        parser.error("--rollouts only applies to random dispatching in semi-active mode")
 
     if args.verify_instances:
         """
@@ -148,18 +240,89 @@ def main():
         print(f"{len(json_instances)} instances in total.")
         exit()
 
+    if args.sweep:
+        instances = select_instances(get_all_instances(),
+                                     authors=args.authors,
+                                     names=args.names,
+                                     min_jobs=args.min_jobs,
+                                     max_jobs=args.max_jobs,
+                                     min_machines=args.min_machines,
+                                     max_machines=args.max_machines)
+        rules = [rule.lower() for rule in args.rules]
+        store_path = None
+        if not args.no_store:
+            # Compile or refresh the store once here, workers only map it
+            InstanceStore.open_store(get_all_instances())
+            store_path = DEFAULT_STORE_PATH
+        mode = args.mode.lower()
+        writer = open_results(args, SWEEP_FIELDS)
+        skip = None
+        if writer is not None and writer.rows:
+            optimal = {row['Instance'] for row in writer.rows if str(row['Optimal']) == "True"} if args.stop_at_bound else set()
+            skip = lambda instance, rule: instance['name'] in optimal or writer.completed(
+                {'Instance': instance['name'], 'Algorithm': rule, 'Mode': mode, 'Seed': args.seed})
+            print(f"Resuming {args.output}: {len(writer.rows)} rows done")
+        print(f"Sweep: {len(instances)} instances x {len(rules)} rules")
+        results = []
+        try:
+            for row in iter_sweep(instances, rules,
+                                  processes=args.processes,
+                                  seed=args.seed,
+                                  plot_folder="./plots" if args.save_plots and args.plot_format.lower() != "none" else None,
+                                  store_path=store_path,
+                                  stop_at_bound=args.stop_at_bound,
+                                  skip=skip,
+                                  mode=mode,
+                                  plot_format=args.plot_format.lower(),
+                                  dpi=args.dpi,
+                                  export_folder=args.export_folder if args.export else None,
+                                  export_format=(args.export or "json").lower(),
+                                  cache_folder=None if args.no_cache else DEFAULT_CACHE_FOLDER,
+                                  cache_bytes=args.cache_size * 1024 * 1024):
+                results.append(row)
+                if writer is not None:
+                    writer.write(row)
+        except KeyboardInterrupt:
+            print(f"Interrupted after {len(results)} new rows" + (", rerun with --resume to continue" if writer else ""))
+        finally:
+            if writer is not None:
+                writer.close()
+        print_sweep_summary(results)
+        exit()
+
     if args.input:
         jobshop_instance = get_jobshop_instance(args.input.lower())
 
-    results = []
-
     if args.algorithm:
-        dispatcher = Dispatcher(jobshop_instance)
+        save_plots = args.plot_format.lower() != "none" and not args.show_plots
+        dispatcher = EventDispatcher(jobshop_instance) if args.engine.lower() == "event" else Dispatcher(jobshop_instance)
         algorithms = ["fifo", "lifo", "mwkr", "lwkr", "random"] if args.algorithm.lower() == "all" else [args.algorithm.lower()]
+        # Starting a process pool costs more than rendering a single chart in the main process
+        use_pipeline = save_plots and args.plot_workers > 0 and len(algorithms) > 1
+        pipeline = PlotPipeline(processes=args.plot_workers) if use_pipeline else None
+
+        writer = open_results(args, RUN_FIELDS)
+        cache = None if args.no_cache else ResultCache(max_bytes=args.cache_size * 1024 * 1024)
 
         for algo in algorithms: # match = Python 3.10 feature
+            name = f"{algo}+{args.improve.lower()}" if args.improve else algo
+            key = {'Instance': jobshop_instance.name, 'Algorithm': name, 'Mode': args.mode.lower(), 'Seed': args.seed}
+            if writer is not None and writer.completed(key):
+                print(f"Skipping {name.upper()}: already in {args.output}")
+                continue
             jobshop_instance.reset()
+            start = time.perf_counter()
+            parameters = None
+            if cache is not None and algo in available_rules() + ["random"] and not args.improve:
+                parameters = dispatch_parameters(algo, args.mode.lower(), args.seed, args.rollouts)
+            cached_makespan = dispatcher.load_cached(cache, algo, parameters) if parameters is not None else None
             match algo:
+                case _ if cached_makespan is not None:
+                    print(f"Cached: {dispatcher.used_algo}")
+                    makespan = cached_makespan
+                case _ if args.mode.lower() != "semi-active" and (algo in available_rules() or algo == "random"):
+                    print(f"Dispatching rule: {algo.upper()} ({args.mode.lower()})")
+                    makespan = dispatcher.apply_rule(algo, mode=args.mode.lower(), seed=args.seed)
                 case "fifo":
                     print("Dispatching rule: FIFO")
                     makespan = dispatcher.fifo()
@@ -172,20 +335,97 @@ def main():
                 case "lwkr":
                     print("Dispatching rule: LWKR")
                     makespan = dispatcher.lwkr()
+                case "random" if args.rollouts > 1:
+                    print(f"Dispatching rule: Random (best of {args.rollouts})")
+                    makespan = dispatcher.random_restarts(args.rollouts, seed=args.seed)
+                    print(dispatcher.rollouts)
+                case "random" if args.seed is not None:
+                    # Dispatcher.random is not seeded, a single batched rollout is
+                    print(f"Dispatching rule: Random (seed {args.seed})")
+                    makespan = dispatcher.random_restarts(1, seed=args.seed)
                 case "random":
                     print("Dispatching rule: Random")
                     makespan = dispatcher.random()
+                case "ga":
+                    print(f"Genetic algorithm: population {args.population}, {args.crossover.upper()} crossover")
+                    makespan = dispatcher.genetic_algorithm(population_size=args.population,
+                                                            max_generations=args.iterations,
+                                                            time_limit=args.time_limit,
+                                                            crossover=args.crossover.lower(),
+                                                            processes=args.processes,
+                                                            seed=args.seed)
+                    print(dispatcher.improvement)
+                case "bnb":
+                    print("Branch and bound")
+                    makespan = dispatcher.branch_and_bound(time_limit=args.time_limit, max_nodes=args.iterations)
+                    print(dispatcher.improvement)
+                case "sb":
+                    print("Shifting bottleneck")
+                    makespan = dispatcher.shifting_bottleneck(time_limit=args.time_limit)
+                    print(dispatcher.improvement)
+                case "portfolio":
+                    print(f"Portfolio: {', '.join(PORTFOLIO_METHODS)} for {args.time_limit}s")
+                    makespan = dispatcher.portfolio(time_limit=args.time_limit, seed=args.seed)
+                    print(dispatcher.improvement)
+                case _ if algo in available_rules():
+                    print(f"Dispatching rule: {algo.upper()}")
+                    makespan = dispatcher.apply_rule(algo)
                 case _:
                     print(f"Unknown algorithm: {algo}")
                     continue
 
+            if args.improve:
+                match args.improve.lower():
+                    case "tabu":
+                        makespan = dispatcher.tabu_search(max_iterations=args.iterations,
+                                                          time_limit=args.time_limit,
+                                                          seed=args.seed)
+                        print(dispatcher.improvement)
+                    case _:
+                        print(f"Unknown improvement heuristic: {args.improve}")
+
+            wall_time = time.perf_counter() - start if cached_makespan is None else dispatcher.cached_seconds
+            if parameters is not None and cached_makespan is None:
+                dispatcher.store_cached(cache, algo, parameters, wall_time)
             print(f"Makespan for instance {jobshop_instance.file_path} using {algo.upper()}: {makespan}")
-            print(f"Verification of {algo.upper()} schedule: {jobshop_instance.verify_schedule()}")
-            dispatcher.plot_gantt_chart()
-            results.append([algo, jobshop_instance.name, makespan])
+            report = jobshop_instance.check_schedule()
+            print(f"Verification of {algo.upper()} schedule: {report.valid}")
+            for violation in report.violations:
+                print(f"  {violation}")
+            print(report)
+            plot_path = f"./plots/{dispatcher.used_algo}_applied_to_{jobshop_instance.name}.{args.plot_format.lower()}"
+            # A cached schedule was plotted before, unless the chart was deleted
+            replot = cached_makespan is None or args.show_plots or not os.path.exists(plot_path)
+            if args.plot_format.lower() != "none" and replot:
+                dispatcher.plot_gantt_chart(save_plot_only=not args.show_plots,
+                                            plot_format=args.plot_format.lower(),
+                                            dpi=args.dpi,
+                                            pipeline=pipeline)
+            if args.export:
+                dispatcher.export_schedule(os.path.join(
+                    args.export_folder, f"{dispatcher.used_algo}_applied_to_{jobshop_instance.name}.{args.export.lower()}"))
+            if writer is not None:
+                reference = jobshop_instance.optimum if jobshop_instance.optimum is not None else jobshop_instance.lower_bound
+                writer.write(dict(key,
+                                  **{'Jobs': jobshop_instance.nr_of_jobs,
+                                     'Machines': jobshop_instance.nr_of_machines,
+                                     'Makespan': makespan,
+                                     'Optimum': jobshop_instance.optimum,
+                                     'Lower bound': jobshop_instance.lower_bound,
+                                     'Upper bound': jobshop_instance.upper_bound,
+                                     'Gap (%)': gap_percent(makespan, reference),
+                                     'Verified': report.valid,
+                                     'Wall time (s)': wall_time}))
+
+        if writer is not None:
+            writer.close()
 
-        if args.output:
-            write_to_csv(args.output, results)
+        if pipeline is not None:
+            seconds = pipeline.close(wait_for_renders=args.wait_for_plots)
+            if args.wait_for_plots:
+                print(f"Gantt charts: {len(pipeline.written)} written, waited {seconds:.2f}s after dispatching")
+                for failure in pipeline.failed:
+                    print(f"  Failed: {failure}")
                 
 
 if __name__ == "__main__":
@@ -0,0 +1,199 @@
+import heapq
+import random
+from typing import Optional
+import numpy as np
+from src.common.array_shop import ArrayJobShop
+from src.common.idle_intervals import IdleIntervalIndex
+from src.common.rollouts import random_rollouts
+from src.common.rules import JobFeatures, PriorityRule, get_rule
+from src.common.schedule_state import ScheduleState
+
+SCHEDULE_MODES = ("semi-active", "active", "non-delay")
+
+
+def schedule_label(rule: str, mode: str = "semi-active") -> str:
+    """Name of a rule run in a schedule mode for used_algo, chart titles and file names, e.g. FIFO-ACTIVE."""
+    name = "random" if rule == "random" else get_rule(rule).name
+    return name.upper() if mode == "semi-active" else f"{name.upper()}-{mode.upper()}"
+
+
+class ArrayDispatcher:
+    """
+    Dispatcher that runs directly on an ArrayJobShop. It offers the same rules as
+    Dispatcher and produces the same schedules for fifo, lifo, mwkr and lwkr.
+    The schedule is written to its own ScheduleState, so any number of dispatchers
+    can share one instance.
+
+    Every rule runs in one of three modes:
+    - semi-active: the selected operation starts behind the last operation of its machine.
+    - active: the selected operation is inserted into the first idle gap of its machine
+      where it fits (IdleIntervalIndex, O(log gaps) per lookup), so no operation can be started
+      earlier without delaying another one.
+    - non-delay: only operations that can start at the earliest possible start time of
+      all next operations, on the machine where that minimum is reached, are candidates;
+      the rule chooses among them. No machine is kept idle while an operation could run.
+    """
+
+    def __init__(self, array_shop: ArrayJobShop, state: Optional[ScheduleState] = None):
+        self.array_shop = array_shop
+        self.state = state if state is not None else array_shop.new_state()
+        self.features = None
+        self.rollouts = None
+        self.used_algo = None
+        self.makespan = None
+
+    def dispatch(self, rule: str, seed: Optional[int] = None, mode: str = "semi-active") -> int:
+        if mode not in SCHEDULE_MODES:
+            raise ValueError(f"Unknown schedule mode: {mode}. Available modes: {', '.join(SCHEDULE_MODES)}")
+        if mode == "non-delay":
+            return self.apply_rule(get_rule(rule) if rule != "random" else None, mode=mode, seed=seed)
+        shop = self.array_shop
+        machine_ids = shop.machine_ids.tolist()
+        processing_times = shop.processing_times.tolist()
+        offsets = shop.job_offsets.tolist()
+        nr_of_jobs = shop.nr_of_jobs
+
+        # Remaining processing time of every job, kept up to date while dispatching
+        total_times = [sum(processing_times[offsets[j]:offsets[j + 1]]) for j in range(nr_of_jobs)]
+        remaining_times = list(total_times)
+        next_operation = offsets[:-1]
+        job_ready = [0] * nr_of_jobs
+        machine_ready = [0] * shop.nr_of_machines
+        start_times = [-1] * shop.nr_of_operations
+        gaps = IdleIntervalIndex(shop.nr_of_machines) if mode == "active" else None
+
+        match rule:
+            case "fifo" | "lifo":
+                sign = 1 if rule == "fifo" else -1
+                sort_key = lambda j: sign * job_ready[j]
+            case "mwkr" | "lwkr":
+                sign = -1 if rule == "mwkr" else 1
+                sort_key = lambda j: sign * (remaining_times[j] / total_times[j] if total_times[j] > 0 else 0)
+            case "random":
+                sort_key = None
+            case _:
+                return self.apply_rule(get_rule(rule), mode=mode)
+
+        candidates = [j for j in range(nr_of_jobs) if offsets[j] < offsets[j + 1]]
+        if sort_key is not None:
+            # Ties are broken by the lowest job id, like the stable sort in Dispatcher.dispatch
+            heap = [(sort_key(j), j) for j in candidates]
+            heapq.heapify(heap)
+            rng = None
+        else:
+            heap = None
+            rng = random.Random(seed)
+
+        while (heap if heap is not None else candidates):
+            if heap is not None:
+                _, job_id = heapq.heappop(heap)
+            else:
+                job_id = rng.choice(candidates)
+
+            op = next_operation[job_id]
+            machine_id = machine_ids[op]
+            if gaps is not None:
+                start_time = gaps.earliest_start(machine_id, job_ready[job_id], processing_times[op])
+                end_time = start_time + processing_times[op]
+                gaps.reserve(machine_id, start_time, end_time)
+            else:
+                start_time = max(job_ready[job_id], machine_ready[machine_id])
+                end_time = start_time + processing_times[op]
+                machine_ready[machine_id] = end_time
+            start_times[op] = start_time
+            job_ready[job_id] = end_time
+            remaining_times[job_id] -= processing_times[op]
+            next_operation[job_id] = op + 1
+
+            if op + 1 < offsets[job_id + 1]:
+                if heap is not None:
+                    heapq.heappush(heap, (sort_key(job_id), job_id))
+            elif heap is None:
+                candidates.remove(job_id)
+
+        self.state.set_start_times(start_times)
+        self.makespan = self.state.makespan
+        return self.makespan
+
+    def apply_rule(self, rule: Optional[PriorityRule], mode: str = "semi-active", seed: Optional[int] = None) -> int:
+        """
+        Dispatch with any registered PriorityRule. All unfinished jobs are scored
+        in one vectorized call per step, the features are updated incrementally.
+        Without a rule the jobs are scored randomly. In active mode machine_ready
+        (used by est and ect) is the end of the last operation of the machine,
+        not the start of its first fitting gap.
+        """
+        if mode not in SCHEDULE_MODES:
+            raise ValueError(f"Unknown schedule mode: {mode}. Available modes: {', '.join(SCHEDULE_MODES)}")
+        if self.features is None:
+            self.features = JobFeatures(self.array_shop)
+        features = self.features
+        features.reset()
+        start_times = [-1] * self.array_shop.nr_of_operations
+        gaps = IdleIntervalIndex(self.array_shop.nr_of_machines) if mode == "active" else None
+        rng = np.random.default_rng(seed) if rule is None else None
+
+        for _ in range(self.array_shop.nr_of_operations):
+            candidates = features.unfinished
+            if mode == "non-delay":
+                earliest = np.where(candidates,
+                                    np.maximum(features.job_ready, features.machine_ready[features.next_machine]),
+                                    np.iinfo(np.int64).max)
+                first = int(np.argmin(earliest))
+                candidates = (earliest == earliest[first]) & (features.next_machine == features.next_machine[first])
+            scores = rule(features) if rule is not None else rng.random(len(candidates))
+            job_id = int(np.argmin(np.where(candidates, scores, np.inf)))
+            if gaps is not None:
+                machine_id = int(features.next_machine[job_id])
+                processing_time = int(features.next_processing_time[job_id])
+                start_time = gaps.earliest_start(machine_id, int(features.job_ready[job_id]), processing_time)
+                gaps.reserve(machine_id, start_time, start_time + processing_time)
+            else:
+                start_time = features.earliest_start_time(job_id)
+            start_times[int(features.next_operation[job_id])] = start_time
+            features.advance(job_id, start_time)
+
+        self.state.set_start_times(start_times)
+        self.used_algo = rule.name.upper() if rule is not None else "RANDOM"
+        self.makespan = self.state.makespan
+        return self.makespan
+
+    def fifo(self) -> int:
+        self.used_algo = "FIFO"
+        return self.dispatch("fifo")
+
+    def lifo(self) -> int:
+        self.used_algo = "LIFO"
+        return self.dispatch("lifo")
+
+    def mwkr(self) -> int:
+        self.used_algo = "MWKR"
+        return self.dispatch("mwkr")
+
+    def lwkr(self) -> int:
+        self.used_algo = "LWKR"
+        return self.dispatch("lwkr")
+
+    def random(self, seed: Optional[int] = None) -> int:
+        self.used_algo = "RANDOM"
+        return self.dispatch("random", seed=seed)
+
+    def random_restarts(self, nr_of_rollouts: int, seed: Optional[int] = None, batch_size: int = 256) -> int:
+        """Run batched random rollouts (see src.common.rollouts) and keep the best schedule."""
+        self.used_algo = "RANDOM"
+        self.rollouts = random_rollouts(self.array_shop, nr_of_rollouts, seed=seed, batch_size=batch_size)
+        self.state.set_start_times(self.rollouts.best_state.start_times)
+        self.makespan = self.state.makespan
+        return self.makespan
+
+    def plot_gantt_chart(self, save_plot_only=True, plot_format: str = "png", dpi: Optional[int] = None) -> None:
+        file_path = f"./plots/{self.used_algo}_applied_to_{self.array_shop.name}.{plot_format}" if save_plot_only else None
+        self.array_shop.plot_gantt_chart(
+            self.state,
+            title=f"{self.used_algo} applied to instance {self.array_shop.name} with makespan {self.makespan}",
+            file_path=file_path,
+            dpi=dpi)
+
+    def export_schedule(self, file_path: str) -> None:
+        """Write the schedule as .json or .csv (see src.io.schedule_export)."""
+        self.array_shop.export_schedule(self.state, file_path, algorithm=self.used_algo)
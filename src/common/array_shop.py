@@ -0,0 +1,142 @@
+from typing import Optional
+import numpy as np
+from src.common.job_shop import JobShop
+from src.common.schedule_state import ScheduleState
+from src.common.verification import ScheduleReport, verify_schedule
+
+
+def _read_only_int32(values) -> np.ndarray:
+    """Return values as contiguous int32 array that nobody can write to, copying only if needed."""
+    if isinstance(values, np.ndarray) and not values.flags.writeable:
+        return np.ascontiguousarray(values, dtype=np.int32)
+    return np.array(values, dtype=np.int32)
+
+
+class ArrayJobShop:
+    """
+    Structure-of-arrays representation of a job shop instance.
+
+    Operations are stored job by job in flat contiguous int32 arrays. The operations
+    of job j are the index range job_offsets[j]:job_offsets[j + 1], in routing order.
+    The arrays are read-only so one instance can be shared by many runs; schedules
+    live in separate ScheduleState objects (see new_state). Read-only input arrays (e.g.
+    slices of a memory-mapped InstanceStore) are used without copying, anything the
+    caller can still write to is copied.
+    """
+
+    def __init__(self, machine_ids, processing_times, job_offsets, nr_of_machines: int,
+                 name=None, optimum=None, info=None, author=None, upper_bound=None, lower_bound=None,
+                 file_path=None):
+        self.machine_ids = _read_only_int32(machine_ids)
+        self.processing_times = _read_only_int32(processing_times)
+        self.job_offsets = _read_only_int32(job_offsets)
+        self.nr_of_jobs = len(self.job_offsets) - 1
+        self.nr_of_machines = nr_of_machines
+        self.nr_of_operations = len(self.machine_ids)
+        self.job_ids = np.repeat(np.arange(self.nr_of_jobs, dtype=np.int32), np.diff(self.job_offsets))
+        for array in (self.machine_ids, self.processing_times, self.job_offsets, self.job_ids):
+            array.flags.writeable = False
+        self.file_path = file_path
+        self.name = name
+        self.optimum = optimum
+        self.info = info
+        self.author = author
+        self.upper_bound = upper_bound
+        self.lower_bound = lower_bound
+
+    @classmethod
+    def from_file(cls, file_path: str, **kwargs) -> "ArrayJobShop":
+        """Parse an instance file in the standard (machine_id processing_time)* format."""
+        with open(file_path) as f:
+            lines = f.readlines()
+
+        first_line = lines[0].split()
+        nr_of_jobs = int(first_line[0])
+        nr_of_machines = int(first_line[1])
+
+        rows = [np.array(lines[job_id + 1].split(), dtype=np.int32) for job_id in range(nr_of_jobs)]
+        job_offsets = np.zeros(nr_of_jobs + 1, dtype=np.int32)
+        job_offsets[1:] = np.cumsum([len(row) // 2 for row in rows])
+        elements = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int32)
+        return cls(elements[0::2], elements[1::2], job_offsets, nr_of_machines, file_path=file_path, **kwargs)
+
+    @classmethod
+    def from_job_shop(cls, job_shop: JobShop) -> "ArrayJobShop":
+        """Convert the instance data of a JobShop into arrays. Use ScheduleState.from_job_shop for its schedule."""
+        operations = [operation for job in job_shop.jobs for operation in job.operations]
+        job_offsets = np.zeros(len(job_shop.jobs) + 1, dtype=np.int32)
+        job_offsets[1:] = np.cumsum([job.nr_of_operations for job in job_shop.jobs])
+        return cls([operation.machine_id for operation in operations],
+                   [operation.processing_time for operation in operations],
+                   job_offsets,
+                   job_shop.nr_of_machines,
+                   name=job_shop.name,
+                   optimum=job_shop.optimum,
+                   info=job_shop.info,
+                   author=job_shop.author,
+                   upper_bound=job_shop.upper_bound,
+                   lower_bound=job_shop.lower_bound,
+                   file_path=job_shop.file_path)
+
+    def to_job_list(self):
+        """Return the instance as nested list of (machine_id, processing_time) tuples, one list per job."""
+        machine_ids = self.machine_ids.tolist()
+        processing_times = self.processing_times.tolist()
+        offsets = self.job_offsets.tolist()
+        return [list(zip(machine_ids[offsets[j]:offsets[j + 1]], processing_times[offsets[j]:offsets[j + 1]]))
+                for j in range(self.nr_of_jobs)]
+
+    def new_state(self) -> ScheduleState:
+        """Return an empty schedule for this instance."""
+        return ScheduleState(self)
+
+    def to_job_shop(self, state: Optional[ScheduleState] = None) -> JobShop:
+        """Convert into the object model. If a state is given, its schedule is applied to the JobShop."""
+        job_shop = JobShop(file_path=None,
+                           name=self.name,
+                           optimum=self.optimum,
+                           info=self.info,
+                           author=self.author,
+                           upper_bound=self.upper_bound,
+                           lower_bound=self.lower_bound)
+        job_shop.file_path = self.file_path
+        job_shop.load_job_list(self.nr_of_machines, self.to_job_list())
+        if state is not None:
+            state.apply_to(job_shop)
+        return job_shop
+
+    @property
+    def nbytes(self) -> int:
+        """Return the number of bytes used by the operation arrays."""
+        return sum(array.nbytes for array in (self.machine_ids, self.processing_times, self.job_offsets, self.job_ids))
+
+    def check_schedule(self, state: ScheduleState) -> ScheduleReport:
+        """Return all constraint violations and the KPIs of a schedule (see src.common.verification)."""
+        return verify_schedule(self.job_ids, self.machine_ids, self.processing_times,
+                               state.start_times, state.end_times, self.nr_of_machines)
+
+    def verify_schedule(self, state: ScheduleState) -> bool:
+        """
+        Check that every operation was scheduled with its processing time, that the operations
+        of each job follow their routing and that no machine processes two operations at once.
+        """
+        return self.check_schedule(state).valid
+
+    def plot_gantt_chart(self, state: ScheduleState, title: str, file_path: Optional[str] = None,
+                         dpi: Optional[int] = None) -> None:
+        from src.plot.gantt import DEFAULT_DPI, plot_gantt_chart
+        plot_gantt_chart(job_ids=self.job_ids,
+                         machine_ids=self.machine_ids,
+                         start_times=state.start_times,
+                         end_times=state.end_times,
+                         nr_of_machines=self.nr_of_machines,
+                         nr_of_jobs=self.nr_of_jobs,
+                         title=title,
+                         file_path=file_path,
+                         dpi=dpi or DEFAULT_DPI)
+
+    def export_schedule(self, state: ScheduleState, file_path: str, algorithm: Optional[str] = None) -> None:
+        """Write the schedule as .json or .csv for external viewers (see src.io.schedule_export)."""
+        from src.io.schedule_export import export_schedule
+        export_schedule(file_path, self.job_ids, self.machine_ids, state.start_times, state.end_times,
+                        instance_name=self.name, algorithm=algorithm)
@@ -0,0 +1,125 @@
+import heapq
+from typing import Dict, List, Sequence
+import numpy as np
+from src.common.array_shop import ArrayJobShop
+
+'''
+Lower bounds on the makespan of ArrayJobShop instances.
+
+- job: the longest total processing time of a job
+- machine: the largest total processing time on a machine
+- head_tail: for every machine, the smallest head plus the load plus the smallest tail,
+  where the head of an operation is the work before it in its job and the tail the work after it
+- one_machine: Jackson's preemptive schedule of every machine with these heads and tails,
+  the optimum of the preemptive one-machine relaxation
+- lower: the maximum of all bounds
+
+compute_bounds concatenates many instances into one set of arrays, so the job, machine and
+head/tail bounds of all instances are computed with a few numpy calls.
+'''
+
+BOUND_NAMES = ("job", "machine", "head_tail", "one_machine")
+
+
+def jackson_preemptive_bound(heads: Sequence[int], processing_times: Sequence[int], tails: Sequence[int]) -> int:
+    """
+    Makespan of Jackson's preemptive schedule on one machine: at every moment the released
+    operation with the largest tail runs. This is the optimum of the preemptive one-machine
+    problem with heads and tails and therefore a lower bound for the job shop.
+    """
+    order = sorted(range(len(heads)), key=heads.__getitem__)
+    available = [] # (-tail, remaining processing time, operation)
+    bound = 0
+    time_now = 0
+    index = 0
+    while index < len(order) or available:
+        if not available and time_now < heads[order[index]]:
+            time_now = heads[order[index]]
+        while index < len(order) and heads[order[index]] <= time_now:
+            op = order[index]
+            heapq.heappush(available, (-tails[op], processing_times[op], op))
+            index += 1
+        negative_tail, remaining, op = heapq.heappop(available)
+        next_release = heads[order[index]] if index < len(order) else None
+        if next_release is not None and time_now + remaining > next_release:
+            # Run until the next release, then decide again
+            heapq.heappush(available, (negative_tail, remaining - (next_release - time_now), op))
+            time_now = next_release
+        else:
+            time_now += remaining
+            bound = max(bound, time_now - negative_tail)
+    return bound
+
+
+def compute_bounds(instances: Sequence[ArrayJobShop]) -> List[Dict[str, int]]:
+    """Return the bounds of every instance as dict with the keys of BOUND_NAMES and "lower"."""
+    if not instances:
+        return []
+    instances = list(instances)
+    processing_times = np.concatenate([instance.processing_times for instance in instances]).astype(np.int64)
+    nr_of_operations = np.array([instance.nr_of_operations for instance in instances])
+    instance_ids = np.repeat(np.arange(len(instances)), nr_of_operations)
+
+    # Number every job and every machine of all instances consecutively
+    nr_of_jobs = np.array([instance.nr_of_jobs for instance in instances])
+    job_base = np.concatenate(([0], np.cumsum(nr_of_jobs)))
+    global_jobs = np.concatenate([instance.job_ids for instance in instances]) + np.repeat(job_base[:-1], nr_of_operations)
+    nr_of_machines = np.array([instance.nr_of_machines for instance in instances])
+    machine_base = np.concatenate(([0], np.cumsum(nr_of_machines)))
+    global_machines = np.concatenate([instance.machine_ids for instance in instances]) + np.repeat(machine_base[:-1], nr_of_operations)
+
+    job_totals = np.bincount(global_jobs, weights=processing_times, minlength=job_base[-1]).astype(np.int64)
+    machine_loads = np.bincount(global_machines, weights=processing_times, minlength=machine_base[-1]).astype(np.int64)
+
+    # Heads: work of the job before the operation (operations of a job are contiguous)
+    ends = np.cumsum(processing_times)
+    first_of_job = np.concatenate(([True], global_jobs[1:] != global_jobs[:-1]))
+    job_start_work = np.zeros(job_base[-1], dtype=np.int64)
+    job_start_work[global_jobs[first_of_job]] = (ends - processing_times)[first_of_job]
+    heads = ends - processing_times - job_start_work[global_jobs]
+    tails = job_totals[global_jobs] - heads - processing_times
+
+    big = np.iinfo(np.int64).max
+    min_heads = np.full(machine_base[-1], big, dtype=np.int64)
+    min_tails = np.full(machine_base[-1], big, dtype=np.int64)
+    np.minimum.at(min_heads, global_machines, heads)
+    np.minimum.at(min_tails, global_machines, tails)
+    unused = machine_loads == 0
+    min_heads[unused] = 0
+    min_tails[unused] = 0
+    head_tail = np.where(unused, 0, min_heads + machine_loads + min_tails)
+
+    def per_instance_max(values: np.ndarray, base: np.ndarray) -> np.ndarray:
+        result = np.zeros(len(instances), dtype=np.int64)
+        np.maximum.at(result, np.repeat(np.arange(len(instances)), np.diff(base)), values)
+        return result
+
+    job_bounds = per_instance_max(job_totals, job_base)
+    machine_bounds = per_instance_max(machine_loads, machine_base)
+    head_tail_bounds = per_instance_max(head_tail, machine_base)
+
+    # One-machine relaxation: Jackson's preemptive schedule per machine
+    order = np.argsort(global_machines, kind='stable')
+    boundaries = np.flatnonzero(np.diff(global_machines[order])) + 1
+    one_machine_bounds = np.zeros(len(instances), dtype=np.int64)
+    for group in np.split(order, boundaries):
+        if len(group) == 0:
+            continue
+        instance_id = instance_ids[group[0]]
+        bound = jackson_preemptive_bound(heads[group].tolist(), processing_times[group].tolist(), tails[group].tolist())
+        one_machine_bounds[instance_id] = max(one_machine_bounds[instance_id], bound)
+
+    rows = []
+    for index in range(len(instances)):
+        row = {"job": int(job_bounds[index]),
+               "machine": int(machine_bounds[index]),
+               "head_tail": int(head_tail_bounds[index]),
+               "one_machine": int(one_machine_bounds[index])}
+        row["lower"] = max(row.values())
+        rows.append(row)
+    return rows
+
+
+def lower_bound(instance: ArrayJobShop) -> int:
+    """Return the best lower bound of one instance."""
+    return compute_bounds([instance])[0]["lower"]
@@ -0,0 +1,191 @@
+from typing import Optional, Tuple
+import numpy as np
+from src.common.array_shop import ArrayJobShop
+from src.common.schedule_state import ScheduleState
+
+'''
+Batched decoding of operation sequences into schedules.
+
+A sequence is an operation-based (repetition) permutation: a row of job ids in which
+job j appears once for each of its operations. The k-th occurrence of job j stands for
+the k-th operation of that job. All decoders take a 2-D array (batch x operations) and
+return the start times (batch x operations, in the operation order of the instance)
+and the makespan of every row. The loops run over the operations, each step is
+vectorized over the whole batch.
+'''
+
+
+def validate_sequences(instance: ArrayJobShop, sequences) -> np.ndarray:
+    """Return the sequences as 2-D int64 array or raise a ValueError if a row is not a valid repetition permutation."""
+    sequences = np.atleast_2d(np.asarray(sequences, dtype=np.int64))
+    if sequences.shape[1] != instance.nr_of_operations:
+        raise ValueError(f"Sequences must have {instance.nr_of_operations} columns, got {sequences.shape[1]}.")
+    if sequences.size and (sequences.min() < 0 or sequences.max() >= instance.nr_of_jobs):
+        raise ValueError("Sequences contain job ids outside of the instance.")
+    expected = np.repeat(np.arange(instance.nr_of_jobs), np.diff(instance.job_offsets))
+    if not np.array_equal(np.sort(sequences, axis=1), np.broadcast_to(expected, sequences.shape)):
+        raise ValueError("Every job must appear exactly once per operation in each sequence.")
+    return sequences
+
+
+def operation_sequences_to_job_sequences(instance: ArrayJobShop, operation_sequences) -> np.ndarray:
+    """Convert rows of operation ids (e.g. operations sorted by start time) into job id sequences."""
+    return instance.job_ids[np.asarray(operation_sequences, dtype=np.int64)].astype(np.int64)
+
+
+def sequence_from_state(instance: ArrayJobShop, state: ScheduleState) -> np.ndarray:
+    """Return the job sequence that lists the operations of a schedule by start time."""
+    order = np.lexsort((np.arange(instance.nr_of_operations), state.end_times, state.start_times))
+    return operation_sequences_to_job_sequences(instance, order)
+
+
+def random_sequences(instance: ArrayJobShop, batch_size: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """Return batch_size uniformly shuffled repetition permutations."""
+    rng = rng if rng is not None else np.random.default_rng()
+    base = np.repeat(np.arange(instance.nr_of_jobs, dtype=np.int64), np.diff(instance.job_offsets))
+    return rng.permuted(np.tile(base, (batch_size, 1)), axis=1)
+
+
+def decode_semi_active(instance: ArrayJobShop, sequences, validate: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Schedule the operations in the order of each sequence, each one as early as its job
+    and machine allow (appending to the machine). This yields semi-active schedules.
+    """
+    if validate:
+        sequences = validate_sequences(instance, sequences)
+    batch_size = len(sequences)
+    machine_ids = instance.machine_ids.astype(np.int64)
+    processing_times = instance.processing_times.astype(np.int64)
+    rows = np.arange(batch_size)
+
+    next_operation = np.tile(instance.job_offsets[:-1].astype(np.int64), (batch_size, 1))
+    job_ready = np.zeros((batch_size, instance.nr_of_jobs), dtype=np.int64)
+    machine_ready = np.zeros((batch_size, instance.nr_of_machines), dtype=np.int64)
+    start_times = np.empty((batch_size, instance.nr_of_operations), dtype=np.int64)
+
+    for position in range(instance.nr_of_operations):
+        jobs = sequences[:, position]
+        operations = next_operation[rows, jobs]
+        machines = machine_ids[operations]
+        starts = np.maximum(job_ready[rows, jobs], machine_ready[rows, machines])
+        ends = starts + processing_times[operations]
+        start_times[rows, operations] = starts
+        job_ready[rows, jobs] = ends
+        machine_ready[rows, machines] = ends
+        next_operation[rows, jobs] += 1
+
+    return start_times, job_ready.max(axis=1, initial=0)
+
+
+def decode_active(instance: ArrayJobShop, sequences, validate: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Giffler-Thompson decoding into active schedules. In every step the operation with the
+    earliest completion time fixes a machine; among the operations on that machine that can
+    start before this completion time, the one that comes first in the sequence is scheduled.
+    """
+    if validate:
+        sequences = validate_sequences(instance, sequences)
+    batch_size = len(sequences)
+    nr_of_jobs = instance.nr_of_jobs
+    machine_ids = instance.machine_ids.astype(np.int64)
+    processing_times = instance.processing_times.astype(np.int64)
+    job_ends = instance.job_offsets[1:].astype(np.int64)
+    rows = np.arange(batch_size)
+
+    # Sorting a sequence stably by job id lists its positions in operation order,
+    # so priority[b, op] is the position of operation op in sequence b.
+    priority = _inverse_permutation(np.argsort(sequences, axis=1, kind='stable'))
+
+    next_operation = np.tile(instance.job_offsets[:-1].astype(np.int64), (batch_size, 1))
+    job_ready = np.zeros((batch_size, nr_of_jobs), dtype=np.int64)
+    machine_ready = np.zeros((batch_size, instance.nr_of_machines), dtype=np.int64)
+    start_times = np.empty((batch_size, instance.nr_of_operations), dtype=np.int64)
+    big = np.iinfo(np.int64).max // 4
+    last_operation = max(instance.nr_of_operations - 1, 0)
+
+    for _ in range(instance.nr_of_operations):
+        unfinished = next_operation < job_ends
+        operations = np.minimum(next_operation, last_operation)
+        machines = machine_ids[operations]
+        earliest_starts = np.maximum(job_ready, np.take_along_axis(machine_ready, machines, axis=1))
+        earliest_ends = np.where(unfinished, earliest_starts + processing_times[operations], big)
+
+        critical_jobs = earliest_ends.argmin(axis=1)
+        critical_ends = earliest_ends[rows, critical_jobs]
+        critical_machines = machines[rows, critical_jobs]
+
+        conflict = unfinished & (machines == critical_machines[:, None]) & (earliest_starts < critical_ends[:, None])
+        conflict[rows, critical_jobs] = True # needed if the critical operation has no processing time
+        conflict_priority = np.where(conflict, np.take_along_axis(priority, operations, axis=1), big)
+        jobs = conflict_priority.argmin(axis=1)
+
+        selected = operations[rows, jobs]
+        starts = earliest_starts[rows, jobs]
+        ends = starts + processing_times[selected]
+        start_times[rows, selected] = starts
+        job_ready[rows, jobs] = ends
+        machine_ready[rows, critical_machines] = ends
+        next_operation[rows, jobs] += 1
+
+    return start_times, job_ready.max(axis=1, initial=0)
+
+
+def _inverse_permutation(permutations: np.ndarray) -> np.ndarray:
+    inverse = np.empty_like(permutations)
+    rows = np.arange(len(permutations))[:, None]
+    inverse[rows, permutations] = np.arange(permutations.shape[1])
+    return inverse
+
+
+def decode(instance: ArrayJobShop, sequences, mode: str = "semi-active", validate: bool = True):
+    """Decode a batch of job sequences; mode is "semi-active" or "active"."""
+    match mode:
+        case "semi-active":
+            return decode_semi_active(instance, sequences, validate)
+        case "active":
+            return decode_active(instance, sequences, validate)
+        case _:
+            raise ValueError(f"Unknown decoding mode: {mode}")
+
+
+def decode_machine_orders(instance: ArrayJobShop, machine_orders) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decode per-machine orders (batch x machines x operations per machine, operation ids)
+    into semi-active schedules. Heads are relaxed in parallel for the whole batch until they
+    are stable. Rows whose orders contain a cycle get a makespan of -1 and start times of -1.
+    """
+    machine_orders = np.asarray(machine_orders, dtype=np.int64)
+    batch_size = machine_orders.shape[0]
+    nr_of_operations = instance.nr_of_operations
+    processing_times = instance.processing_times.astype(np.int64)
+    rows = np.arange(batch_size)[:, None]
+
+    # Machine predecessor of every operation per row, -1 for the first operation on a machine
+    flat_orders = machine_orders.reshape(batch_size, -1)
+    previous = np.full_like(machine_orders, -1)
+    previous[:, :, 1:] = machine_orders[:, :, :-1]
+    machine_pred = np.full((batch_size, nr_of_operations), -1, dtype=np.int64)
+    machine_pred[rows, flat_orders] = previous.reshape(batch_size, -1)
+
+    job_pred = np.arange(nr_of_operations, dtype=np.int64) - 1
+    job_pred[instance.job_offsets[:-1]] = -1
+
+    start_times = np.zeros((batch_size, nr_of_operations), dtype=np.int64)
+    end_times = start_times + processing_times
+    padded_end = np.zeros((batch_size, nr_of_operations + 1), dtype=np.int64) # index -1 reads the 0 column
+    converged = np.zeros(batch_size, dtype=bool)
+
+    for _ in range(nr_of_operations + 1):
+        padded_end[:, :nr_of_operations] = end_times
+        new_starts = np.maximum(padded_end[:, job_pred], padded_end[rows, machine_pred])
+        changed = (new_starts != start_times).any(axis=1)
+        converged |= ~changed
+        if not changed.any():
+            break
+        start_times = new_starts
+        end_times = start_times + processing_times
+
+    makespans = end_times.max(axis=1, initial=0)
+    start_times[~converged] = -1
+    makespans[~converged] = -1
+    return start_times, makespans
@@ -1,18 +1,45 @@
+import copy
 import random
-from typing import Union
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
+from bisect import bisect_right
+from typing import Dict, Optional, Union
+from src.common.array_dispatcher import ArrayDispatcher, schedule_label
+from src.common.array_shop import ArrayJobShop
 from src.common.job import Job
 from src.common.job_shop import JobShop
+from src.common.machine import Machine
+from src.common.operation import Operation
+from src.common.repair import JobInsertion, ProcessingTimeChange, ScheduleRepair
+from src.common.rules import get_rule
+from src.common.schedule_state import ScheduleState
+from src.solvers.branch_and_bound import BranchAndBound
+from src.solvers.genetic_algorithm import GeneticAlgorithm
+from src.solvers.portfolio import PORTFOLIO_METHODS, PortfolioSolver
+from src.solvers.shifting_bottleneck import ShiftingBottleneck
+from src.solvers.tabu_search import TabuSearch
 
 
 class Dispatcher:
     def __init__(self, job_shop: JobShop):
         self.job_shop = job_shop
         self.max_time_jobs = max(sum(op.processing_time for op in job.operations) for job in self.job_shop.jobs)
+        # suffix_processing_times[job.id][k] is the processing time of operations k, k+1, ... of the job
+        self.suffix_processing_times = {}
+        for job in self.job_shop.jobs:
+            self.update_suffix_processing_times(job)
         self.job_shop.current_time = {job.id: 0 for job in self.job_shop.jobs}  # Initialize current time for each job
         self.used_algo = None
         self.makespan = None
+        self.rollouts = None
+        self.improvement = None
+        self.cached_seconds = None
+        self.owns_job_shop = False # True once repair replaced the (possibly shared) JobShop by a copy
+        self.schedule_repair = None # ScheduleRepair of the current schedule, kept across repairs
+
+    def update_suffix_processing_times(self, job: Job) -> None:
+        suffix = [0] * (job.nr_of_operations + 1)
+        for k in range(job.nr_of_operations - 1, -1, -1):
+            suffix[k] = suffix[k + 1] + job.operations[k].processing_time
+        self.suffix_processing_times[job.id] = suffix
 
     def dispatch(self, sort_key=None, reverse=False, random_selection=False) -> int:
         job_queue = [job for job in self.job_shop.jobs]
@@ -43,6 +70,7 @@ class Dispatcher:
             if not job.has_more_operations():
                 job_queue.remove(job)
         self.makespan = makespan
+        self.schedule_repair = None
         return self.makespan
 
     def fifo(self) -> int:
@@ -65,19 +93,213 @@ class Dispatcher:
         self.used_algo = "RANDOM"
         return self.dispatch(random_selection=True)
 
+    def random_restarts(self, nr_of_rollouts: int, seed: Optional[int] = None) -> int:
+        """
+        Run nr_of_rollouts random dispatching runs at once as numpy arrays and apply
+        the best schedule to the (reset) JobShop.
+        """
+        array_dispatcher = ArrayDispatcher(ArrayJobShop.from_job_shop(self.job_shop))
+        self.makespan = array_dispatcher.random_restarts(nr_of_rollouts, seed=seed)
+        array_dispatcher.state.apply_to(self.job_shop)
+        self.schedule_repair = None
+        self.rollouts = array_dispatcher.rollouts
+        self.used_algo = "RANDOM"
+        return self.makespan
+
+    def tabu_search(self, max_iterations: Optional[int] = None, time_limit: Optional[float] = 10.0,
+                    seed: Optional[int] = None) -> int:
+        """
+        Improve the current (complete) schedule of the JobShop with a tabu search on its
+        critical path and apply the best schedule found to the JobShop.
+        """
+        array_shop = ArrayJobShop.from_job_shop(self.job_shop)
+        initial_state = ScheduleState.from_job_shop(array_shop, self.job_shop)
+        target_makespan = self.job_shop.optimum if self.job_shop.optimum is not None else self.job_shop.lower_bound
+        self.improvement = TabuSearch(array_shop, seed=seed).solve(initial_state,
+                                                                   max_iterations=max_iterations,
+                                                                   time_limit=time_limit,
+                                                                   target_makespan=target_makespan)
+        self.job_shop.reset()
+        self.improvement.best_state.apply_to(self.job_shop)
+        self.schedule_repair = None
+        self.makespan = self.improvement.best_makespan
+        self.used_algo = f"{self.used_algo}+TS"
+        return self.makespan
+
+    def genetic_algorithm(self, population_size: int = 100, max_generations: Optional[int] = None,
+                          time_limit: Optional[float] = 10.0, crossover: str = "pox",
+                          processes: Optional[int] = None, seed: Optional[int] = None) -> int:
+        """
+        Run a genetic algorithm whose population is seeded with the fifo, lifo, mwkr and lwkr
+        schedules and apply the best schedule found to the (reset) JobShop.
+        """
+        array_shop = ArrayJobShop.from_job_shop(self.job_shop)
+        target_makespan = self.job_shop.optimum if self.job_shop.optimum is not None else self.job_shop.lower_bound
+        solver = GeneticAlgorithm(array_shop, population_size=population_size, crossover=crossover,
+                                  processes=processes, seed=seed)
+        self.improvement = solver.solve(max_generations=max_generations,
+                                        time_limit=time_limit,
+                                        target_makespan=target_makespan)
+        self.job_shop.reset()
+        self.improvement.best_state.apply_to(self.job_shop)
+        self.schedule_repair = None
+        self.makespan = self.improvement.best_makespan
+        self.used_algo = "GA"
+        return self.makespan
+
+    def branch_and_bound(self, time_limit: Optional[float] = 60.0, max_nodes: Optional[int] = None) -> int:
+        """
+        Search for an optimal schedule with branch and bound over active schedules and apply
+        the best schedule found (optimal unless a limit was hit) to the (reset) JobShop.
+        """
+        array_shop = ArrayJobShop.from_job_shop(self.job_shop)
+        self.improvement = BranchAndBound(array_shop).solve(time_limit=time_limit, max_nodes=max_nodes)
+        self.job_shop.reset()
+        self.improvement.best_state.apply_to(self.job_shop)
+        self.schedule_repair = None
+        self.makespan = self.improvement.best_makespan
+        self.used_algo = "BNB"
+        return self.makespan
+
+    def shifting_bottleneck(self, time_limit: Optional[float] = None) -> int:
+        """
+        Schedule with the shifting bottleneck procedure and apply the schedule to the (reset) JobShop.
+        After time_limit seconds the remaining machines are sequenced without re-optimization.
+        """
+        array_shop = ArrayJobShop.from_job_shop(self.job_shop)
+        self.improvement = ShiftingBottleneck(array_shop).solve(time_limit=time_limit)
+        self.job_shop.reset()
+        self.improvement.best_state.apply_to(self.job_shop)
+        self.schedule_repair = None
+        self.makespan = self.improvement.best_makespan
+        self.used_algo = "SB"
+        return self.makespan
+
+    def portfolio(self, time_limit: float = 10.0, methods=PORTFOLIO_METHODS, seed: Optional[int] = None) -> int:
+        """
+        Run dispatching rules, random restarts and the improvement heuristics concurrently in separate
+        processes that share the best schedule (see PortfolioSolver) and apply the best schedule to
+        the (reset) JobShop. The portfolio stops early at the optimum or lower bound of the instance.
+        """
+        array_shop = ArrayJobShop.from_job_shop(self.job_shop)
+        target_makespan = self.job_shop.optimum if self.job_shop.optimum is not None else self.job_shop.lower_bound
+        self.improvement = PortfolioSolver(array_shop, methods=methods, target_makespan=target_makespan,
+                                           seed=seed).solve(time_limit=time_limit)
+        self.job_shop.reset()
+        self.improvement.best_state.apply_to(self.job_shop)
+        self.schedule_repair = None
+        self.makespan = self.improvement.best_makespan
+        self.used_algo = "PORTFOLIO"
+        return self.makespan
+
+    def apply_rule(self, rule_name: str, mode: str = "semi-active", seed: Optional[int] = None) -> int:
+        """
+        Dispatch with any rule registered in src.common.rules, or random, in the given
+        schedule mode (semi-active, active or non-delay, see ArrayDispatcher). The rule runs
+        on the arrays of the instance and the schedule is then applied to the (reset) JobShop.
+        """
+        name = "random" if rule_name == "random" else get_rule(rule_name).name
+        array_dispatcher = ArrayDispatcher(ArrayJobShop.from_job_shop(self.job_shop))
+        self.makespan = array_dispatcher.dispatch(name, seed=seed, mode=mode)
+        self.job_shop.reset()
+        array_dispatcher.state.apply_to(self.job_shop)
+        self.schedule_repair = None
+        self.used_algo = schedule_label(name, mode)
+        return self.makespan
+
+    def repair(self, disruption, freeze_time: int = 0):
+        """
+        Repair the current (complete) schedule after a disruption of src.common.repair (machine
+        breakdown, processing time change, inserted job) instead of dispatching again from time 0.
+        Only the operations behind the disruption move and operations that started before
+        freeze_time stay as they are. Returns the RepairResult. The ScheduleRepair of the first
+        repair is kept until a new schedule is dispatched, so later repairs respect earlier
+        breakdowns and the JobShop is only converted once.
+
+        A processing time change or an inserted job changes the instance itself. The JobShop may be
+        shared (the instance registry hands out one object per instance), so the first such repair
+        replaces self.job_shop by a private copy and the JobShop passed in is never modified.
+        """
+        if isinstance(disruption, (ProcessingTimeChange, JobInsertion)) and not self.owns_job_shop:
+            self.job_shop = copy.deepcopy(self.job_shop)
+            self.owns_job_shop = True
+        if self.schedule_repair is None:
+            self.schedule_repair = ScheduleRepair.from_job_shop(self.job_shop)
+        schedule_repair = self.schedule_repair
+        result = schedule_repair.repair(disruption, freeze_time)
+        operations = [operation for job in self.job_shop.jobs for operation in job.operations]
+        for op_id, start_time in zip(result.moved_operations.tolist(), result.start_times.tolist()):
+            operations[op_id].schedule(start_time)
+
+        if isinstance(disruption, ProcessingTimeChange):
+            operation = operations[disruption.operation_id]
+            operation.processing_time = disruption.processing_time
+            operation.schedule(operation.start_time)
+            self.update_suffix_processing_times(self.job_shop.jobs[operation.job_id])
+        if isinstance(disruption, JobInsertion):
+            job = Job(len(self.job_shop.jobs))
+            for op_id, (machine_id, processing_time) in enumerate(disruption.operations, start=len(operations)):
+                operation = Operation(op_id, job.id, machine_id, processing_time)
+                operation.schedule(schedule_repair.start_times[op_id])
+                job.add_operation(operation)
+                job.complete_current_operation()
+                machine = self.job_shop.machines.setdefault(machine_id, Machine(machine_id))
+                machine.schedule.insert(bisect_right(machine.schedule, operation.start_time,
+                                                     key=lambda scheduled: scheduled.start_time), operation)
+                operations.append(operation)
+            self.job_shop.jobs.append(job)
+            self.job_shop.nr_of_jobs += 1
+            self.job_shop.current_time[job.id] = job.operations[-1].end_time
+            self.update_suffix_processing_times(job)
+
+        for job in self.job_shop.jobs:
+            self.job_shop.current_time[job.id] = job.operations[-1].end_time if job.operations else 0
+        self.max_time_jobs = max(suffix[0] for suffix in self.suffix_processing_times.values())
+        self.makespan = result.makespan
+        return result
+
+    def load_cached(self, cache, algorithm: str, parameters: Optional[Dict] = None) -> Optional[int]:
+        """
+        Apply the schedule of a deterministic algorithm from a ResultCache (src.io.result_cache)
+        to the (reset) JobShop. Returns the makespan, or None if the schedule is not cached.
+        cached_seconds is then the wall time of the run that computed the schedule. used_algo is
+        derived from the rule and the mode of the parameters, like apply_rule does.
+        """
+        array_shop = ArrayJobShop.from_job_shop(self.job_shop)
+        entry = cache.get(array_shop, algorithm, parameters)
+        if entry is None:
+            return None
+        self.job_shop.reset()
+        ScheduleState.from_start_times(array_shop, entry['start_times']).apply_to(self.job_shop)
+        self.schedule_repair = None
+        self.makespan = entry['makespan']
+        self.used_algo = schedule_label(algorithm, (parameters or {}).get('mode', "semi-active"))
+        self.cached_seconds = entry['seconds']
+        return self.makespan
+
+    def store_cached(self, cache, algorithm: str, parameters: Optional[Dict] = None, seconds: float = 0.0) -> None:
+        """Store the current schedule of a deterministic algorithm in a ResultCache."""
+        array_shop = ArrayJobShop.from_job_shop(self.job_shop)
+        state = ScheduleState.from_job_shop(array_shop, self.job_shop)
+        cache.put(array_shop, algorithm, parameters, state.start_times, self.makespan, seconds)
+
     def remaining_processing_time(self, job: Job) -> Union[int, float]:
         """ Calculate the total remaining processing time for a job """
-        return sum(op.processing_time for op in job.operations[job.current_op_index:])
+        return self.suffix_processing_times[job.id][job.current_op_index]
+
+    def total_processing_time(self, job: Job) -> Union[int, float]:
+        """ Calculate the total processing time for a job """
+        return self.suffix_processing_times[job.id][0]
 
     def normalized_remaining_processing_time(self, job: Job) -> Union[int, float]:
         """ Calculate the normalized remaining processing time for a job """
-        total_processing_time = sum(op.processing_time for op in job.operations)
+        total_processing_time = self.total_processing_time(job)
         remaining_processing_time = self.remaining_processing_time(job)
         return remaining_processing_time / total_processing_time if total_processing_time > 0 else 0
 
     def scaled_remaining_processing_time(self, job: Job) -> Union[int, float]:
         """ Calculate the scaled remaining processing time for a job """
-        total_processing_time = sum(op.processing_time for op in job.operations)
+        total_processing_time = self.total_processing_time(job)
 
         if total_processing_time == 0:
             return 0
@@ -86,36 +308,36 @@ class Dispatcher:
         scaled_remaining_processing_time = (remaining_percentage * self.max_time_jobs) / total_processing_time
         return scaled_remaining_processing_time
     
-    def plot_gantt_chart(self, save_plot_only=True) -> None:
-        fig, gnt = plt.subplots(figsize=(12, 6))
-        nr_of_machines = self.job_shop.nr_of_jobs
-
-        # Setting the labels for x-axis and y-axis
-        gnt.set_xlabel('Time')
-        gnt.set_ylabel('Machines')
+    def schedule_arrays(self):
+        """Job ids, machine ids, start and end times (-1 if unscheduled) of all operations, job by job."""
+        operations = [operation for job in self.job_shop.jobs for operation in job.operations]
+        return ([operation.job_id for operation in operations],
+                [operation.machine_id for operation in operations],
+                [operation.start_time if operation.was_scheduled else -1 for operation in operations],
+                [operation.end_time if operation.was_scheduled else -1 for operation in operations])
 
-        # Setting the y-ticks to the number of machines
-        gnt.set_yticks([i + 1 for i in range(nr_of_machines)])
-        gnt.set_yticklabels([f'Machine {i}' for i in range(nr_of_machines)])
-        gnt.set_ylim(0, nr_of_machines + 1)
+    def plot_gantt_chart(self, save_plot_only=True, plot_format: str = "png", dpi: Optional[int] = None,
+                         pipeline=None) -> None:
+        """Plot the schedule. With a PlotPipeline (src.plot.pipeline) a saved chart is rendered in the background."""
+        job_ids, machine_ids, start_times, end_times = self.schedule_arrays()
+        file_path = f"./plots/{self.used_algo}_applied_to_{self.job_shop.name}.{plot_format}" if save_plot_only else None
+        title = f"{self.used_algo} applied to instance {self.job_shop.name} with makespan {self.makespan}"
+        if pipeline is not None and file_path is not None:
+            pipeline.submit(job_ids, machine_ids, start_times, end_times,
+                            self.job_shop.nr_of_machines, len(self.job_shop.jobs), title, file_path, dpi)
+            return
+        from src.plot.gantt import DEFAULT_DPI, plot_gantt_chart
+        plot_gantt_chart(job_ids=job_ids,
+                         machine_ids=machine_ids,
+                         start_times=start_times,
+                         end_times=end_times,
+                         nr_of_machines=self.job_shop.nr_of_machines,
+                         nr_of_jobs=len(self.job_shop.jobs),
+                         title=title,
+                         file_path=file_path,
+                         dpi=dpi or DEFAULT_DPI)
 
-        # Plotting the tasks
-        for job in self.job_shop.jobs:
-            for operation in job.operations:
-                if operation.start_time is not None and operation.end_time is not None:
-                    gnt.broken_barh([(operation.start_time, operation.end_time - operation.start_time)], (operation.machine_id + 0.5, 1),
-                                    facecolors=(f'C{job.id % 10}'), edgecolor='black')
-                    gnt.text(operation.start_time + (operation.end_time - operation.start_time) / 2, operation.machine_id + 1, 
-                             f"{job.id}", ha='center', va='center', color='white', fontweight='bold')
-
-        # Adding legend
-        handles = [mpatches.Patch(color=f'C{i % 10}', label=f'Job {i}') for i in range(len(self.job_shop.jobs))]
-        plt.legend(handles=handles, bbox_to_anchor=(1.01, 1.015), loc='upper left')
-        plt.title(f"{self.used_algo} applied to instance {self.job_shop.name} with makespan {self.makespan}")
-        plt.grid(True)
-        plt.tight_layout(rect=[0, 0, 0.99, 1])  # Adjust layout to make room for the legend
-
-        if save_plot_only:
-            plt.savefig(f"./plots/{self.used_algo}_applied_to_{self.job_shop.name}.png", dpi=300)
-        else:
-            plt.show()
\ No newline at end of file
+    def export_schedule(self, file_path: str) -> None:
+        """Write the schedule as .json or .csv for external viewers (see src.io.schedule_export)."""
+        from src.io.schedule_export import export_schedule
+        export_schedule(file_path, *self.schedule_arrays(), instance_name=self.job_shop.name, algorithm=self.used_algo)
@@ -0,0 +1,182 @@
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+from src.common.array_shop import ArrayJobShop
+from src.common.schedule_state import ScheduleState
+
+JOB_FEATURES = ("next_processing_time", "remaining_work", "remaining_operations", "ready_time", "earliest_start")
+MACHINE_FEATURES = ("ready_time", "queue_load", "remaining_work")
+
+
+class VectorJobShopEnv:
+    """
+    A batch of job shop environments with a gymnasium-style reset/step API, stepped in NumPy.
+
+    Every env dispatches one instance, drawn from instances at every reset. An action is a job
+    index per env; the next operation of that job is appended to its machine at the earliest
+    time, like JobShop.schedule_operation, so an episode takes one step per operation. The reward
+    is the decrease of the makespan of the partial schedule, so the rewards of an episode add up
+    to -makespan. With normalize, times in observations and rewards are divided by the largest
+    processing time of the instance.
+
+    Instances of different sizes are padded to the largest number of jobs, operations per job and
+    machines; padded jobs are never valid actions. Observations are a dict of arrays:
+    - jobs: float32 (envs, jobs, JOB_FEATURES)
+    - machines: float32 (envs, machines, MACHINE_FEATURES)
+    - next_machine: int64 (envs, jobs), machine of the next operation of every job, -1 if finished
+    - action_mask: bool (envs, jobs), the unfinished jobs
+    Envs that finish an episode are reset in the same step (auto-reset): the returned observation
+    is the first one of the next episode and info["final_makespan"] holds the makespan of the
+    finished episode (-1 for envs that did not finish).
+    """
+
+    def __init__(self, instances: Sequence[ArrayJobShop], nr_of_envs: int, seed: Optional[int] = None,
+                 normalize: bool = True):
+        if not instances:
+            raise ValueError("At least one instance is needed.")
+        self.instances = list(instances)
+        self.nr_of_envs = nr_of_envs
+        self.normalize = normalize
+        self.rng = np.random.default_rng(seed)
+
+        nr_of_instances = len(self.instances)
+        self.max_jobs = max(instance.nr_of_jobs for instance in self.instances)
+        self.max_machines = max(instance.nr_of_machines for instance in self.instances)
+        self.max_operations = max(int(np.diff(instance.job_offsets).max(initial=0)) for instance in self.instances)
+
+        # Operation k of job j of instance i; column max_operations is padding for finished jobs
+        shape = (nr_of_instances, self.max_jobs, self.max_operations + 1)
+        self.machine_ids = np.zeros(shape, dtype=np.int64)
+        self.processing_times = np.zeros(shape, dtype=np.int64)
+        self.job_lengths = np.zeros((nr_of_instances, self.max_jobs), dtype=np.int64)
+        self.machine_work = np.zeros((nr_of_instances, self.max_machines), dtype=np.int64)
+        for index, instance in enumerate(self.instances):
+            lengths = np.diff(instance.job_offsets)
+            positions = np.arange(instance.nr_of_operations) - np.repeat(instance.job_offsets[:-1], lengths)
+            self.machine_ids[index, instance.job_ids, positions] = instance.machine_ids
+            self.processing_times[index, instance.job_ids, positions] = instance.processing_times
+            self.job_lengths[index, :instance.nr_of_jobs] = lengths
+            self.machine_work[index, :instance.nr_of_machines] = np.bincount(
+                instance.machine_ids, weights=instance.processing_times, minlength=instance.nr_of_machines)
+        self.total_work = self.processing_times.sum(axis=2)
+        self.nr_of_operations = self.job_lengths.sum(axis=1)
+        self.time_scales = (np.maximum(self.processing_times.max(axis=(1, 2)), 1).astype(np.float64)
+                            if normalize else np.ones(nr_of_instances))
+
+        envs, jobs, machines = nr_of_envs, self.max_jobs, self.max_machines
+        self.instance_index = np.zeros(envs, dtype=np.int64)
+        self.next_operation = np.zeros((envs, jobs), dtype=np.int64)
+        self.next_machine = np.zeros((envs, jobs), dtype=np.int64)
+        self.next_processing_time = np.zeros((envs, jobs), dtype=np.int64)
+        self.job_lengths_of_envs = np.zeros((envs, jobs), dtype=np.int64)
+        self.job_ready = np.zeros((envs, jobs), dtype=np.int64)
+        self.remaining_work = np.zeros((envs, jobs), dtype=np.int64)
+        self.machine_ready = np.zeros((envs, machines), dtype=np.int64)
+        self.machine_remaining_work = np.zeros((envs, machines), dtype=np.int64)
+        self.queue_load = np.zeros((envs, machines), dtype=np.int64)
+        self.makespan = np.zeros(envs, dtype=np.int64)
+        self.steps = np.zeros(envs, dtype=np.int64)
+        self.start_times = np.full((envs, jobs, self.max_operations + 1), -1, dtype=np.int64)
+        self.rows = np.arange(envs)
+        self.episodes = 0
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[Dict[str, np.ndarray], Dict]:
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._reset_envs(self.rows)
+        return self.observe(), {"instance": self.instance_index.copy()}
+
+    def _reset_envs(self, envs: np.ndarray) -> None:
+        instances = self.rng.integers(len(self.instances), size=len(envs))
+        self.instance_index[envs] = instances
+        self.next_operation[envs] = 0
+        self.next_machine[envs] = self.machine_ids[instances, :, 0]
+        self.next_processing_time[envs] = self.processing_times[instances, :, 0]
+        self.job_lengths_of_envs[envs] = self.job_lengths[instances]
+        self.job_ready[envs] = 0
+        self.remaining_work[envs] = self.total_work[instances]
+        self.machine_ready[envs] = 0
+        self.machine_remaining_work[envs] = self.machine_work[instances]
+        self.makespan[envs] = 0
+        self.steps[envs] = 0
+        self.start_times[envs] = -1
+        # The first operation of every job waits for its machine
+        self.queue_load[envs] = 0
+        rows = np.repeat(envs, self.max_jobs)
+        np.add.at(self.queue_load, (rows, self.next_machine[envs].ravel()), self.next_processing_time[envs].ravel())
+
+    def action_mask(self) -> np.ndarray:
+        return self.next_operation < self.job_lengths_of_envs
+
+    def observe(self) -> Dict[str, np.ndarray]:
+        mask = self.action_mask()
+        earliest_start = np.maximum(self.job_ready, self.machine_ready[self.rows[:, None], self.next_machine])
+        earliest_start[~mask] = 0
+        # Features are written straight into fresh float32 arrays, without float64 temporaries
+        scale = (1 / self.time_scales[self.instance_index]).astype(np.float32)[:, None]
+        jobs = np.empty((self.nr_of_envs, self.max_jobs, len(JOB_FEATURES)), dtype=np.float32)
+        job_times = {"next_processing_time": self.next_processing_time, "remaining_work": self.remaining_work,
+                     "ready_time": self.job_ready, "earliest_start": earliest_start}
+        for index, name in enumerate(JOB_FEATURES):
+            if name == "remaining_operations":
+                np.subtract(self.job_lengths_of_envs, self.next_operation, out=jobs[:, :, index], casting="unsafe")
+            else:
+                np.multiply(job_times[name], scale, out=jobs[:, :, index], casting="unsafe")
+        machines = np.empty((self.nr_of_envs, self.max_machines, len(MACHINE_FEATURES)), dtype=np.float32)
+        for index, feature in enumerate((self.machine_ready, self.queue_load, self.machine_remaining_work)):
+            np.multiply(feature, scale, out=machines[:, :, index], casting="unsafe")
+        return {"jobs": jobs,
+                "machines": machines,
+                "next_machine": np.where(mask, self.next_machine, -1),
+                "action_mask": mask}
+
+    def step(self, actions) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, np.ndarray, Dict]:
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.nr_of_envs,):
+            raise ValueError(f"Expected one action per env, shape ({self.nr_of_envs},), got {actions.shape}.")
+        rows, instances = self.rows, self.instance_index
+        if ((actions < 0) | (actions >= self.max_jobs)).any():
+            raise ValueError(f"Actions must be job indices in [0, {self.max_jobs}).")
+        operations = self.next_operation[rows, actions]
+        invalid = operations >= self.job_lengths_of_envs[rows, actions]
+        if invalid.any():
+            raise ValueError(f"Envs {np.flatnonzero(invalid).tolist()} chose a finished or padded job.")
+
+        machines = self.next_machine[rows, actions]
+        processing_times = self.next_processing_time[rows, actions]
+        starts = np.maximum(self.job_ready[rows, actions], self.machine_ready[rows, machines])
+        ends = starts + processing_times
+        self.start_times[rows, actions, operations] = starts
+        self.job_ready[rows, actions] = ends
+        self.machine_ready[rows, machines] = ends
+        self.remaining_work[rows, actions] -= processing_times
+        self.machine_remaining_work[rows, machines] -= processing_times
+        self.queue_load[rows, machines] -= processing_times
+        self.next_operation[rows, actions] += 1
+        # The next operation of the job now waits for its machine (one row per env, so no duplicate indices)
+        following_machines = self.machine_ids[instances, actions, operations + 1]
+        following_times = self.processing_times[instances, actions, operations + 1]
+        self.next_machine[rows, actions] = following_machines
+        self.next_processing_time[rows, actions] = following_times
+        self.queue_load[rows, following_machines] += following_times
+
+        makespan = np.maximum(self.makespan, ends)
+        rewards = ((self.makespan - makespan) / self.time_scales[instances]).astype(np.float32)
+        self.makespan = makespan
+        self.steps += 1
+        terminated = self.steps == self.nr_of_operations[instances]
+        truncated = np.zeros(self.nr_of_envs, dtype=bool)
+
+        info = {"final_makespan": np.where(terminated, makespan, -1)}
+        if terminated.any():
+            finished = np.flatnonzero(terminated)
+            self.episodes += len(finished)
+            self._reset_envs(finished)
+        info["instance"] = self.instance_index.copy()
+        return self.observe(), rewards, terminated, truncated, info
+
+    def schedule_state(self, env: int) -> ScheduleState:
+        """The (partial) schedule of the current episode of an env as ScheduleState of its instance."""
+        instance = self.instances[self.instance_index[env]]
+        lengths = np.diff(instance.job_offsets)
+        positions = np.arange(instance.nr_of_operations) - np.repeat(instance.job_offsets[:-1], lengths)
+        return ScheduleState.from_start_times(instance, self.start_times[env, instance.job_ids, positions])
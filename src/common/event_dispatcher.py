@@ -0,0 +1,39 @@
+import heapq
+from src.common.dispatcher import Dispatcher
+
+
+class EventDispatcher(Dispatcher):
+    """
+    Dispatcher that keeps the candidate jobs in a priority heap instead of
+    rescanning and sorting every job before each operation.
+
+    The sort keys of the deterministic rules (fifo, lifo, mwkr, lwkr) only
+    depend on the state of the job itself, so after scheduling an operation
+    only that job has to be re-keyed and pushed back onto the heap. This turns
+    the O(ops * jobs * log jobs) scan of Dispatcher.dispatch into
+    O(ops * log jobs) while producing exactly the same schedules.
+    """
+
+    def dispatch(self, sort_key=None, reverse=False, random_selection=False) -> int:
+        if random_selection or sort_key is None:
+            return super().dispatch(sort_key=sort_key, reverse=reverse, random_selection=random_selection)
+
+        # Ties are broken by the position in the job list, which is what the
+        # stable sort (also with reverse=True) in Dispatcher.dispatch does.
+        sign = -1 if reverse else 1
+        heap = [(sign * sort_key(job), position, job)
+                for position, job in enumerate(self.job_shop.jobs) if job.has_more_operations()]
+        heapq.heapify(heap)
+        makespan = 0
+
+        while heap:
+            _, position, job = heapq.heappop(heap)
+            operation = job.get_current_operation()
+            end_time = self.job_shop.schedule_operation(job, operation)
+            makespan = max(makespan, end_time)
+
+            if job.has_more_operations():
+                heapq.heappush(heap, (sign * sort_key(job), position, job))
+        self.makespan = makespan
+        self.schedule_repair = None
+        return self.makespan
@@ -0,0 +1,190 @@
+import random
+from typing import List, Tuple
+
+
+class IdleIntervals:
+    """
+    Idle time of one machine: the gaps between its scheduled operations as disjoint
+    intervals [start, end) plus the horizon, the end of the last operation.
+
+    The gaps are kept in a treap ordered by start time in which every node also holds the
+    longest gap of its subtree. earliest_start() checks the gap that contains the ready time
+    and then descends to the first later gap that is long enough, and reserve() splits a gap
+    with split/merge, so both take O(log gaps) expected time. Operations appended behind
+    the horizon never look at the gaps.
+    """
+
+    def __init__(self):
+        self.horizon = 0
+        # Treap nodes in parallel lists; -1 is no node
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self._longest: List[int] = []
+        self._left: List[int] = []
+        self._right: List[int] = []
+        self._priorities: List[float] = []
+        self._root = -1
+        self._random = random.Random(0)
+        self._count = 0
+        self._idle_time = 0
+
+    def earliest_start(self, ready: int, duration: int) -> int:
+        """Return the earliest start time >= ready at which an operation of this duration fits."""
+        # Only the gap that starts at or before ready can contain it
+        node = self._floor(ready)
+        if node >= 0 and self._ends[node] > ready and ready + duration <= self._ends[node]:
+            return ready
+        node = self._first_fit(ready, duration)
+        if node >= 0:
+            return self._starts[node]
+        return ready if ready > self.horizon else self.horizon
+
+    def reserve(self, start: int, end: int) -> None:
+        """Mark [start, end) as busy. The interval must be idle (a result of earliest_start)."""
+        if start >= self.horizon:
+            if start > self.horizon:
+                # The new gap starts behind every other gap
+                self._root = self._merge(self._root, self._new(self.horizon, start))
+                self._count += 1
+                self._idle_time += start - self.horizon
+            self.horizon = max(self.horizon, end)
+            return
+        if start == end:
+            return
+        node = self._floor(start)
+        if node < 0 or self._ends[node] < end:
+            raise ValueError(f"[{start}, {end}) is not idle.")
+        gap_start, gap_end = self._starts[node], self._ends[node]
+        before, rest = self._split(self._root, gap_start)
+        gap, after = self._split(rest, gap_start + 1)
+        middle = -1
+        if gap_start < start:
+            # Reuse the node of the gap, now alone, for the part in front of the operation
+            self._ends[gap] = start
+            self._longest[gap] = start - gap_start
+            middle = gap
+        if end < gap_end:
+            middle = self._merge(middle, self._new(end, gap_end))
+        self._root = self._merge(before, self._merge(middle, after))
+        self._count += (gap_start < start) + (end < gap_end) - 1
+        self._idle_time -= end - start
+
+    @property
+    def idle_time(self) -> int:
+        """Total idle time before the horizon."""
+        return self._idle_time
+
+    @property
+    def gaps(self) -> List[Tuple[int, int]]:
+        """All gaps in time order."""
+        gaps, stack, node = [], [], self._root
+        while stack or node >= 0:
+            while node >= 0:
+                stack.append(node)
+                node = self._left[node]
+            node = stack.pop()
+            gaps.append((self._starts[node], self._ends[node]))
+            node = self._right[node]
+        return gaps
+
+    def __len__(self):
+        return self._count
+
+    def _new(self, start: int, end: int) -> int:
+        self._starts.append(start)
+        self._ends.append(end)
+        self._longest.append(end - start)
+        self._left.append(-1)
+        self._right.append(-1)
+        self._priorities.append(self._random.random())
+        return len(self._starts) - 1
+
+    def _update(self, node: int) -> None:
+        longest = self._ends[node] - self._starts[node]
+        left, right = self._left[node], self._right[node]
+        if left >= 0 and self._longest[left] > longest:
+            longest = self._longest[left]
+        if right >= 0 and self._longest[right] > longest:
+            longest = self._longest[right]
+        self._longest[node] = longest
+
+    def _split(self, node: int, key: int) -> Tuple[int, int]:
+        """Split a subtree into the gaps starting before key and the others."""
+        if node < 0:
+            return -1, -1
+        if self._starts[node] < key:
+            self._right[node], right = self._split(self._right[node], key)
+            self._update(node)
+            return node, right
+        left, self._left[node] = self._split(self._left[node], key)
+        self._update(node)
+        return left, node
+
+    def _merge(self, left: int, right: int) -> int:
+        """Merge two subtrees whose gaps in left all start before those in right."""
+        if left < 0:
+            return right
+        if right < 0:
+            return left
+        if self._priorities[left] > self._priorities[right]:
+            self._right[left] = self._merge(self._right[left], right)
+            self._update(left)
+            return left
+        self._left[right] = self._merge(left, self._left[right])
+        self._update(right)
+        return right
+
+    def _floor(self, time: int) -> int:
+        """The gap with the latest start <= time, or -1."""
+        found, node = -1, self._root
+        while node >= 0:
+            if self._starts[node] <= time:
+                found, node = node, self._right[node]
+            else:
+                node = self._left[node]
+        return found
+
+    def _first_fit(self, ready: int, duration: int) -> int:
+        """The first gap starting after ready that is at least duration long, or -1."""
+        # Nodes starting after ready on the search path of ready, with their right subtrees,
+        # cover all later gaps; deeper nodes come first in time
+        candidates, node = [], self._root
+        while node >= 0:
+            if self._starts[node] > ready:
+                candidates.append(node)
+                node = self._left[node]
+            else:
+                node = self._right[node]
+        longest, left_of, right_of = self._longest, self._left, self._right
+        for node in reversed(candidates):
+            if self._ends[node] - self._starts[node] >= duration:
+                return node
+            subtree = right_of[node]
+            if subtree >= 0 and longest[subtree] >= duration:
+                # Leftmost node of the subtree that is long enough
+                node = subtree
+                while True:
+                    left = left_of[node]
+                    if left >= 0 and longest[left] >= duration:
+                        node = left
+                    elif self._ends[node] - self._starts[node] >= duration:
+                        return node
+                    else:
+                        node = right_of[node]
+        return -1
+
+
+class IdleIntervalIndex:
+    """IdleIntervals of every machine of an instance."""
+
+    def __init__(self, nr_of_machines: int):
+        self.machines = [IdleIntervals() for _ in range(nr_of_machines)]
+
+    def earliest_start(self, machine_id: int, ready: int, duration: int) -> int:
+        return self.machines[machine_id].earliest_start(ready, duration)
+
+    def reserve(self, machine_id: int, start: int, end: int) -> None:
+        self.machines[machine_id].reserve(start, end)
+
+    def horizon(self, machine_id: int) -> int:
+        return self.machines[machine_id].horizon
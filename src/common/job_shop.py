@@ -1,9 +1,9 @@
-from typing import Dict, List
-import copy
+from typing import Dict, List, Tuple
 import random
 from src.common.operation import Operation
 from src.common.job import Job
 from src.common.machine import Machine
+from src.common.verification import ScheduleReport, verify_schedule
 
 
 class JobShop:
@@ -20,28 +20,38 @@ class JobShop:
         self.upper_bound = upper_bound
         self.lower_bound = lower_bound
         self.current_time = {} # dict containing the end_time of last scheduled operation for each job
-        self.original_jobs = []
-        self.original_machines = {}
 
-        self.load_instance(file_path)
+        if file_path is not None:
+            self.load_instance(file_path)
 
     def load_instance(self, file_path: str) -> None:
         with open(file_path) as f:
             lines = f.readlines()
 
         first_line = lines[0].split()
-        self.nr_of_jobs = int(first_line[0])
-        self.nr_of_machines = int(first_line[1])
+        nr_of_jobs = int(first_line[0])
+        nr_of_machines = int(first_line[1])
+
+        job_list = []
+        for job_id in range(nr_of_jobs):
+            elements = lines[job_id + 1].strip().split()
+            job_list.append([(int(elements[i]), int(elements[i + 1])) for i in range(0, len(elements), 2)])
+        self.load_job_list(nr_of_machines, job_list)
+
+    def load_job_list(self, nr_of_machines: int, job_list: List[List[Tuple[int, int]]]) -> None:
+        """
+        Build jobs and machines from a nested list of (machine_id, processing_time) tuples,
+        one list per job. This is the same format as src.io.utils.load_instance_as_list.
+        """
+        self.nr_of_jobs = len(job_list)
+        self.nr_of_machines = nr_of_machines
 
         self.jobs = []
         self.machines = {}
         op_id = 0
-        for job_id in range(self.nr_of_jobs):
+        for job_id, job_operations in enumerate(job_list):
             job = Job(job_id)
-            elements = lines[job_id + 1].strip().split()
-            for i in range(0, len(elements), 2):
-                machine_id = int(elements[i])
-                processing_time = int(elements[i + 1])
+            for machine_id, processing_time in job_operations:
                 operation = Operation(op_id, job_id, machine_id, processing_time)
                 op_id += 1
                 job.add_operation(operation)
@@ -49,8 +59,6 @@ class JobShop:
                     self.machines[machine_id] = Machine(machine_id)
             self.jobs.append(job)
         self.current_time = {job.id: 0 for job in self.jobs}
-        self.original_jobs = copy.deepcopy(self.jobs)
-        self.original_machines = copy.deepcopy(self.machines)
 
     def can_schedule_operation(self, job: Job, operation: Operation) -> bool:
         machine = self.machines[operation.machine_id]
@@ -78,30 +86,30 @@ class JobShop:
 
         return scheduled_operation.end_time
 
-    def verify_schedule(self) -> bool:
-        # Check for overlapping processing times on the same machine
-        for machine in self.machines.values():
-            operations = sorted(machine.schedule, key=lambda op: op.start_time)
-            for i in range(1, len(operations)):
-                prev_op = operations[i - 1]
-                curr_op = operations[i]
-                if curr_op.start_time < prev_op.end_time:
-                    print(f"Overlap detected on machine {machine.machine_id} between operation {prev_op} and {curr_op}")
-                    return False
+    def check_schedule(self) -> ScheduleReport:
+        """Return all constraint violations and the KPIs of the current schedule (see src.common.verification)."""
+        operations = [operation for job in self.jobs for operation in job.operations]
+        start_times = [operation.start_time if operation.start_time is not None else -1 for operation in operations]
+        end_times = [operation.end_time if operation.end_time is not None else -1 for operation in operations]
+        return verify_schedule([operation.job_id for operation in operations],
+                               [operation.machine_id for operation in operations],
+                               [operation.processing_time for operation in operations],
+                               start_times, end_times, self.nr_of_machines)
 
-        # Check for order of operations for each job
-        for job in self.jobs:
-            operations = job.operations
-            for i in range(1, len(operations)):
-                prev_op = operations[i - 1]
-                curr_op = operations[i]
-                if prev_op.end_time is not None and curr_op.start_time is not None:
-                    if curr_op.start_time < prev_op.end_time:
-                        print(f"Order violation detected for job {job.job_id} between operation {prev_op} and {curr_op}")
-                        return False
-        return True
+    def verify_schedule(self) -> bool:
+        """
+        Check that every operation was scheduled with its processing time, that the operations
+        of each job follow their routing and that no machine processes two operations at once.
+        """
+        return self.check_schedule().valid
 
     def reset(self) -> None:
-        self.jobs = copy.deepcopy(self.original_jobs)
-        self.machines = copy.deepcopy(self.original_machines)
+        """
+        Reset the schedule in place. Only the per-run state (operation times, machine
+        schedules, operation pointers) is cleared; the parsed instance is kept as is.
+        """
+        for job in self.jobs:
+            job.reset()
+        for machine in self.machines.values():
+            machine.reset()
         self.current_time = {job.id: 0 for job in self.jobs}
\ No newline at end of file
@@ -0,0 +1,332 @@
+import heapq
+import math
+import time
+from bisect import insort
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from src.common.array_shop import ArrayJobShop
+from src.common.rules import get_rule
+
+# An arriving job: (release time, [(machine_id, processing_time), ...] in routing order)
+Arrival = Tuple[int, Sequence[Tuple[int, int]]]
+
+
+class LatencyHistogram:
+    """
+    Latencies in log-spaced buckets, sub_buckets per power of two (2.2% resolution for 32), so
+    the memory stays constant however many decisions are recorded. Percentiles are reported as
+    the upper bound of their bucket; min, max and mean are exact.
+    """
+
+    def __init__(self, sub_buckets: int = 32):
+        self.sub_buckets = sub_buckets
+        self.counts = [0] * (64 * sub_buckets)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, nanoseconds: int) -> None:
+        self.counts[int(math.log2(nanoseconds) * self.sub_buckets) if nanoseconds > 1 else 0] += 1
+        self.count += 1
+        self.total += nanoseconds
+        self.max = max(self.max, nanoseconds)
+        self.min = nanoseconds if self.min is None else min(self.min, nanoseconds)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Latency in nanoseconds below which q percent of the recorded latencies fall."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(2 ** ((bucket + 1) / self.sub_buckets), self.max)
+        return float(self.max)
+
+    def percentiles(self, q=(50, 90, 99, 99.9)) -> dict:
+        return {p: self.percentile(p) for p in q}
+
+
+class ActiveJobs:
+    """
+    Dispatching features of the jobs in the system, in slots of growing arrays. A finished job
+    frees its slot for a later arrival, so the memory grows with the number of jobs that are in
+    the shop at the same time, not with the number of jobs that ever arrived. The arrays have the
+    names of JobFeatures, so the registered rules score a QueueFeatures view of them.
+    """
+
+    FIELDS = ('release', 'job_ready', 'total_work', 'remaining_work', 'remaining_ops',
+              'next_operation', 'next_processing_time', 'next_machine', 'following_machine')
+
+    def __init__(self, capacity: int = 64):
+        for field in self.FIELDS:
+            setattr(self, field, np.zeros(capacity, dtype=np.int64))
+        self.routes: List[Optional[Tuple[List[int], List[int]]]] = [None] * capacity
+        self.free = list(range(capacity - 1, -1, -1))
+        self.size = 0
+        self.peak = 0
+
+    def _grow(self) -> None:
+        capacity = len(self.routes)
+        for field in self.FIELDS:
+            setattr(self, field, np.concatenate((getattr(self, field), np.zeros(capacity, dtype=np.int64))))
+        self.routes.extend([None] * capacity)
+        self.free.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+    def add(self, release: int, machine_ids: List[int], processing_times: List[int]) -> int:
+        if not self.free:
+            self._grow()
+        slot = self.free.pop()
+        self.routes[slot] = (machine_ids, processing_times)
+        self.release[slot] = release
+        self.job_ready[slot] = release
+        self.total_work[slot] = self.remaining_work[slot] = sum(processing_times)
+        self.remaining_ops[slot] = len(machine_ids)
+        self.next_operation[slot] = 0
+        self.next_processing_time[slot] = processing_times[0]
+        self.next_machine[slot] = machine_ids[0]
+        self.following_machine[slot] = machine_ids[1] if len(machine_ids) > 1 else -1
+        self.size += 1
+        self.peak = max(self.peak, self.size)
+        return slot
+
+    def advance(self, slot: int, start_time: int) -> Tuple[int, int, int]:
+        """
+        Start the next operation of a job at start_time and move its features to the operation
+        after it. Returns the end time and the machine and processing time of the operation after
+        it (-1 and 0 if the job is finished).
+        """
+        machine_ids, processing_times = self.routes[slot]
+        op = int(self.next_operation[slot]) + 1
+        processing_time = processing_times[op - 1]
+        end_time = start_time + processing_time
+        self.job_ready[slot] = end_time
+        self.remaining_work[slot] -= processing_time
+        self.remaining_ops[slot] -= 1
+        self.next_operation[slot] = op
+        if op < len(machine_ids):
+            next_machine, next_processing_time = machine_ids[op], processing_times[op]
+            self.following_machine[slot] = machine_ids[op + 1] if op + 1 < len(machine_ids) else -1
+        else:
+            next_machine, next_processing_time = -1, 0
+        self.next_machine[slot] = next_machine
+        self.next_processing_time[slot] = next_processing_time
+        return end_time, next_machine, next_processing_time
+
+    def remove(self, slot: int) -> None:
+        self.routes[slot] = None
+        self.free.append(slot)
+        self.size -= 1
+
+
+class QueueFeatures:
+    """The JobFeatures attributes the rules use, for the jobs waiting in front of one machine."""
+
+    def __init__(self, jobs: ActiveJobs, slots: np.ndarray, machine_ready: np.ndarray,
+                 machine_queue_load: np.ndarray):
+        self.job_ready = jobs.job_ready[slots]
+        self.total_work = jobs.total_work[slots]
+        self.remaining_work = jobs.remaining_work[slots]
+        self.remaining_ops = jobs.remaining_ops[slots]
+        self.next_processing_time = jobs.next_processing_time[slots]
+        self.next_machine = jobs.next_machine[slots]
+        self.following_machine = jobs.following_machine[slots]
+        self.machine_ready = machine_ready
+        self.machine_queue_load = machine_queue_load
+
+
+class OnlineReport:
+    """KPIs of an online run: makespan, flow times, decision latencies and throughput."""
+
+    def __init__(self, rule: str, nr_of_jobs: int, nr_of_operations: int, makespan: int, total_flow_time: int,
+                 max_flow_time: int, total_waiting_time: int, peak_active_jobs: int, latencies: LatencyHistogram,
+                 seconds: float):
+        self.rule = rule
+        self.nr_of_jobs = nr_of_jobs
+        self.nr_of_operations = nr_of_operations
+        self.makespan = makespan
+        self.total_flow_time = total_flow_time
+        self.max_flow_time = max_flow_time
+        self.total_waiting_time = total_waiting_time
+        self.peak_active_jobs = peak_active_jobs
+        self.latencies = latencies
+        self.seconds = seconds
+
+    @property
+    def mean_flow_time(self) -> float:
+        return self.total_flow_time / self.nr_of_jobs if self.nr_of_jobs else 0.0
+
+    @property
+    def mean_waiting_time(self) -> float:
+        return self.total_waiting_time / self.nr_of_jobs if self.nr_of_jobs else 0.0
+
+    @property
+    def operations_per_second(self) -> float:
+        return self.nr_of_operations / self.seconds if self.seconds > 0 else float('inf')
+
+    def __str__(self):
+        percentiles = ", ".join(f"p{q:g} {value / 1000:.1f}us" for q, value in self.latencies.percentiles().items())
+        return (f"{self.rule.upper()} online: {self.nr_of_jobs:,} jobs, {self.nr_of_operations:,} operations, "
+                f"makespan {self.makespan}, mean flow time {self.mean_flow_time:.1f} "
+                f"(waiting {self.mean_waiting_time:.1f}, max {self.max_flow_time}), "
+                f"peak {self.peak_active_jobs:,} jobs in the shop\n"
+                f"decision latency {percentiles}, max {self.latencies.max / 1000:.1f}us; "
+                f"{self.operations_per_second:,.0f} operations/s")
+
+
+class OnlineDispatcher:
+    """
+    Event-driven simulation of a shop where jobs arrive over time and nothing is known about a
+    job before its release. Arrivals are read lazily from any iterable of (release time, job)
+    pairs ordered by release time, one arrival ahead of the simulated time.
+
+    At every event time (a release or the end of an operation) each idle machine with waiting
+    jobs starts one of them, chosen by a dispatching rule from src.common.rules or at random,
+    so the schedule is non-delay. Machines decide in the order of their longest waiting job,
+    which makes a run with all releases at 0 identical to ArrayDispatcher in non-delay mode.
+    Only the jobs in the shop are kept in memory (ActiveJobs); a finished job is reported and
+    dropped, and on_operation(arrival, operation, machine_id, start, end) can stream the
+    schedule out. Every decision (scoring the queue and picking a job) is timed.
+    """
+
+    def __init__(self, nr_of_machines: int, rule: str = "fifo", seed: Optional[int] = None,
+                 on_operation: Optional[Callable[[int, int, int, int, int], None]] = None):
+        self.nr_of_machines = nr_of_machines
+        self.rule_name = rule
+        self.rule = get_rule(rule) if rule != "random" else None
+        self.rng = np.random.default_rng(seed)
+        self.on_operation = on_operation
+        self.report = None
+
+    def run(self, arrivals: Iterable[Arrival]) -> OnlineReport:
+        nr_of_machines = self.nr_of_machines
+        jobs = ActiveJobs()
+        queues: List[List[Tuple[int, int]]] = [[] for _ in range(nr_of_machines)] # (arrival, slot), oldest first
+        machine_ready = np.zeros(nr_of_machines, dtype=np.int64)
+        machine_queue_load = np.zeros(nr_of_machines, dtype=np.int64)
+        idle = [True] * nr_of_machines
+        completions = [] # heap of (end time, arrival, slot, machine_id, machine_id of the job's next operation)
+        latencies = LatencyHistogram()
+        clock = time.perf_counter_ns
+
+        arrivals = iter(arrivals)
+        next_arrival = next(arrivals, None)
+        nr_of_jobs, nr_of_operations, makespan = 0, 0, 0
+        total_flow_time, max_flow_time, total_waiting_time = 0, 0, 0
+        last_release = None
+        start = time.perf_counter()
+
+        while next_arrival is not None or completions:
+            if completions and (next_arrival is None or completions[0][0] <= next_arrival[0]):
+                now = completions[0][0]
+            else:
+                now = next_arrival[0]
+            deciding = set()
+
+            while completions and completions[0][0] == now:
+                _, arrival, slot, machine_id, next_machine = heapq.heappop(completions)
+                idle[machine_id] = True
+                if queues[machine_id]:
+                    deciding.add(machine_id)
+                if next_machine >= 0:
+                    insort(queues[next_machine], (arrival, slot))
+                    if idle[next_machine]:
+                        deciding.add(next_machine)
+                else:
+                    flow_time = now - int(jobs.release[slot])
+                    total_flow_time += flow_time
+                    max_flow_time = max(max_flow_time, flow_time)
+                    total_waiting_time += flow_time - int(jobs.total_work[slot])
+                    jobs.remove(slot)
+
+            while next_arrival is not None and next_arrival[0] <= now:
+                release, operations = next_arrival
+                if last_release is not None and release < last_release:
+                    raise ValueError(f"Arrivals must be ordered by release time: job {nr_of_jobs} is released at "
+                                     f"{release}, before the previous job at {last_release}.")
+                last_release = release
+                if operations:
+                    machine_ids = [int(machine_id) for machine_id, _ in operations]
+                    processing_times = [int(processing_time) for _, processing_time in operations]
+                    slot = jobs.add(release, machine_ids, processing_times)
+                    machine_queue_load[machine_ids[0]] += processing_times[0]
+                    insort(queues[machine_ids[0]], (nr_of_jobs, slot))
+                    if idle[machine_ids[0]]:
+                        deciding.add(machine_ids[0])
+                nr_of_jobs += 1
+                next_arrival = next(arrivals, None)
+
+            while deciding:
+                machine_id = min(deciding, key=lambda m: queues[m][0][0])
+                deciding.remove(machine_id)
+                queue = queues[machine_id]
+
+                decision_start = clock()
+                if len(queue) == 1:
+                    index = 0
+                else:
+                    slots = np.fromiter((slot for _, slot in queue), dtype=np.int64, count=len(queue))
+                    if self.rule is not None:
+                        scores = self.rule(QueueFeatures(jobs, slots, machine_ready, machine_queue_load))
+                    else:
+                        scores = self.rng.random(len(queue))
+                    index = int(np.argmin(scores))
+                arrival, slot = queue.pop(index)
+                latencies.record(clock() - decision_start)
+
+                end_time, next_machine, next_processing_time = jobs.advance(slot, now)
+                machine_ready[machine_id] = end_time
+                machine_queue_load[machine_id] -= end_time - now
+                if next_machine >= 0:
+                    machine_queue_load[next_machine] += next_processing_time
+                idle[machine_id] = False
+                heapq.heappush(completions, (end_time, arrival, slot, machine_id, next_machine))
+                makespan = max(makespan, end_time)
+                nr_of_operations += 1
+                if self.on_operation is not None:
+                    self.on_operation(arrival, int(jobs.next_operation[slot]) - 1, machine_id, now, end_time)
+
+        self.report = OnlineReport(self.rule_name, nr_of_jobs, nr_of_operations, makespan, total_flow_time,
+                                   max_flow_time, total_waiting_time, jobs.peak, latencies,
+                                   time.perf_counter() - start)
+        return self.report
+
+
+def instance_arrivals(instance: ArrayJobShop, release_times: Optional[Sequence[int]] = None) -> Iterator[Arrival]:
+    """The jobs of an instance as arrivals, all at time 0 or at the given (non-decreasing) release times."""
+    for job_id, job in enumerate(instance.to_job_list()):
+        yield (0 if release_times is None else int(release_times[job_id])), job
+
+
+def poisson_arrivals(jobs: Iterable[Sequence[Tuple[int, int]]], mean_interarrival_time: float,
+                     seed: Optional[int] = None) -> Iterator[Arrival]:
+    """
+    Release the jobs of any job list or generator (e.g. JobShopGenerator output) one by one with
+    exponentially distributed gaps, rounded to integer times.
+    """
+    rng = np.random.default_rng(seed)
+    release = 0.0
+    for job in jobs:
+        yield int(release), job
+        release += rng.exponential(mean_interarrival_time)
+
+
+def taillard_arrivals(time_seed: int, machine_seed: int, nr_of_jobs: int, nr_of_machines: int,
+                      mean_interarrival_time: float, seed: Optional[int] = None,
+                      block_jobs: int = 1000) -> Iterator[Arrival]:
+    """Jobs of Taillard's generator (src.taillard), generated block by block while they are released."""
+    from src.taillard import iter_job_blocks
+
+    def jobs():
+        for machine_ids, processing_times in iter_job_blocks(time_seed, machine_seed, nr_of_jobs, nr_of_machines,
+                                                             block_jobs):
+            for machines, times in zip(machine_ids.tolist(), processing_times.tolist()):
+                yield list(zip(machines, times))
+
+    return poisson_arrivals(jobs(), mean_interarrival_time, seed=seed)
@@ -0,0 +1,327 @@
+import heapq
+import time
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Sequence, Tuple, Union
+import numpy as np
+from src.common.array_shop import ArrayJobShop
+from src.common.schedule_state import ScheduleState
+
+
+class MachineBreakdown:
+    """Machine machine_id cannot start or process operations in [start, end)."""
+
+    def __init__(self, machine_id: int, start: int, end: int):
+        if end <= start:
+            raise ValueError(f"A breakdown has to end after it starts, got [{start}, {end}).")
+        self.machine_id = machine_id
+        self.start = start
+        self.end = end
+
+    def __str__(self):
+        return f"Breakdown of machine {self.machine_id} in [{self.start}, {self.end})"
+
+
+class ProcessingTimeChange:
+    """The processing time of an operation changes. operation_id is the flat index, i.e. Operation.id."""
+
+    def __init__(self, operation_id: int, processing_time: int):
+        if processing_time < 0:
+            raise ValueError(f"Processing times cannot be negative, got {processing_time}.")
+        self.operation_id = operation_id
+        self.processing_time = processing_time
+
+    def __str__(self):
+        return f"Processing time of operation {self.operation_id} changes to {self.processing_time}"
+
+
+class JobInsertion:
+    """
+    A new job, given as list of (machine_id, processing_time) tuples in routing order, is released
+    at release_time. By default its operations go into the first idle gaps where they fit, so no
+    other operation moves; a rush job starts as early as possible on every machine and the
+    operations behind it are shifted right.
+    """
+
+    def __init__(self, operations: Sequence[Tuple[int, int]], release_time: int = 0, rush: bool = False):
+        if not operations:
+            raise ValueError("An inserted job needs at least one operation.")
+        self.operations = [(int(machine_id), int(processing_time)) for machine_id, processing_time in operations]
+        self.release_time = release_time
+        self.rush = rush
+
+    def __str__(self):
+        kind = "Rush job" if self.rush else "Job"
+        return f"{kind} with {len(self.operations)} operations released at {self.release_time}"
+
+
+Disruption = Union[MachineBreakdown, ProcessingTimeChange, JobInsertion]
+
+
+class RepairResult:
+    """The operations a repair moved (with their previous and new start times) and the inserted ones."""
+
+    def __init__(self, disruption: Disruption, freeze_time: int, moved: Dict[int, int], start_times: List[int],
+                 inserted: List[int], makespan_before: int, makespan: int, visited: int, seconds: float):
+        self.disruption = disruption
+        self.freeze_time = freeze_time
+        self.moved_operations = np.array(sorted(moved), dtype=np.int64)
+        self.previous_start_times = np.array([moved[op] for op in self.moved_operations.tolist()], dtype=np.int64)
+        self.start_times = np.array([start_times[op] for op in self.moved_operations.tolist()], dtype=np.int64)
+        self.inserted_operations = np.array(inserted, dtype=np.int64)
+        self.makespan_before = makespan_before
+        self.makespan = makespan
+        self.visited = visited
+        self.seconds = seconds
+
+    @property
+    def nr_of_moved(self) -> int:
+        return len(self.moved_operations)
+
+    def __str__(self):
+        inserted = f", {len(self.inserted_operations)} inserted" if len(self.inserted_operations) else ""
+        return (f"{self.disruption} (frozen before {self.freeze_time}): {self.nr_of_moved} operations moved{inserted}, "
+                f"{self.visited} visited, makespan {self.makespan_before} -> {self.makespan} "
+                f"in {self.seconds * 1000:.2f}ms")
+
+
+class ScheduleRepair:
+    """
+    Incremental repair of a schedule after disruptions, instead of dispatching again from time 0.
+
+    The order of the operations on every machine is kept (right-shift repair). A disruption
+    only seeds the operations it touches directly; they are recomputed as early as their job
+    and machine predecessors, the freeze time and the breakdowns of their machine allow, and an
+    operation whose times change passes the change on to its job and machine successors. The
+    operations are processed in order of their start times before the repair (a topological
+    order of the schedule), so every operation is visited once when all processing times are
+    positive and the work is proportional to the affected suffix, not to the instance.
+
+    Operations that start before the freeze time are never moved; a processing time change of
+    such an (already running) operation only changes its end. Breakdowns are kept, so later
+    repairs respect them too. The flat start times, machine sequences and links are kept as lists
+    so a repair costs no conversions; array_shop and state() convert back on demand.
+    """
+
+    def __init__(self, instance: ArrayJobShop, state: ScheduleState):
+        if (state.start_times < 0).any():
+            raise ValueError("Only complete schedules can be repaired.")
+        self.instance = instance
+        self.nr_of_machines = instance.nr_of_machines
+        self.machine_ids: List[int] = instance.machine_ids.tolist()
+        self.processing_times: List[int] = instance.processing_times.tolist()
+        self.job_offsets: List[int] = instance.job_offsets.tolist()
+        self.start_times: List[int] = state.start_times.tolist()
+        self.end_times: List[int] = state.end_times.tolist()
+
+        # Machine sequences in order of the schedule and the machine predecessor and successor of every operation
+        order = np.lexsort((state.end_times, state.start_times, instance.machine_ids))
+        counts = np.bincount(instance.machine_ids, minlength=self.nr_of_machines)
+        self.sequences: List[List[int]] = [sequence.tolist() for sequence in np.split(order, np.cumsum(counts)[:-1])]
+        same_machine = instance.machine_ids[order[1:]] == instance.machine_ids[order[:-1]]
+        predecessors = np.full(instance.nr_of_operations, -1, dtype=np.int64)
+        successors = np.full(instance.nr_of_operations, -1, dtype=np.int64)
+        predecessors[order[1:][same_machine]] = order[:-1][same_machine]
+        successors[order[:-1][same_machine]] = order[1:][same_machine]
+        self.machine_predecessors: List[int] = predecessors.tolist()
+        self.machine_successors: List[int] = successors.tolist()
+        # Last operation of every job, so the job successor of op is op + 1 unless op is the last one
+        self.job_ends: List[int] = np.repeat(instance.job_offsets[1:], np.diff(instance.job_offsets)).tolist()
+
+        # Release times of inserted jobs by their first operation, the jobs of the instance are released at 0
+        self.release_times: Dict[int, int] = {}
+        self.breakdown_starts: List[List[int]] = [[] for _ in range(self.nr_of_machines)]
+        self.breakdown_ends: List[List[int]] = [[] for _ in range(self.nr_of_machines)]
+        self._array_shop = instance
+
+    @classmethod
+    def from_job_shop(cls, job_shop) -> "ScheduleRepair":
+        instance = ArrayJobShop.from_job_shop(job_shop)
+        return cls(instance, ScheduleState.from_job_shop(instance, job_shop))
+
+    @property
+    def nr_of_operations(self) -> int:
+        return len(self.start_times)
+
+    @property
+    def makespan(self) -> int:
+        return max((self.end_times[sequence[-1]] for sequence in self.sequences if sequence), default=0)
+
+    @property
+    def array_shop(self) -> ArrayJobShop:
+        """The instance with the current processing times and inserted jobs."""
+        if self._array_shop is None:
+            instance = self.instance
+            self._array_shop = ArrayJobShop(self.machine_ids, self.processing_times, self.job_offsets,
+                                            self.nr_of_machines, name=instance.name, optimum=instance.optimum,
+                                            info=instance.info, author=instance.author,
+                                            upper_bound=instance.upper_bound, lower_bound=instance.lower_bound,
+                                            file_path=instance.file_path)
+        return self._array_shop
+
+    def state(self) -> ScheduleState:
+        return ScheduleState.from_start_times(self.array_shop, self.start_times)
+
+    def repair(self, disruption: Disruption, freeze_time: int = 0) -> RepairResult:
+        """Apply a disruption; operations that start before freeze_time stay where they are."""
+        start = time.perf_counter()
+        makespan_before = self.makespan
+        moved: Dict[int, int] = {}
+        inserted: List[int] = []
+        visited = 0
+
+        if isinstance(disruption, MachineBreakdown):
+            self._check_machine(disruption.machine_id)
+            visited = self._propagate(self._add_breakdown(disruption, freeze_time), freeze_time, moved)
+        elif isinstance(disruption, ProcessingTimeChange):
+            op = disruption.operation_id
+            if not 0 <= op < self.nr_of_operations:
+                raise ValueError(f"Unknown operation {op}, the schedule has {self.nr_of_operations} operations.")
+            if self.end_times[op] <= freeze_time:
+                raise ValueError(f"Operation {op} finished at {self.end_times[op]}, before the freeze time {freeze_time}.")
+            self.processing_times[op] = disruption.processing_time
+            self._array_shop = None
+            visited = self._propagate([op], freeze_time, moved)
+        elif isinstance(disruption, JobInsertion):
+            for machine_id, _ in disruption.operations:
+                self._check_machine(machine_id)
+            visited = self._insert_job(disruption, freeze_time, moved, inserted)
+        else:
+            raise TypeError(f"Unknown disruption: {disruption!r}")
+
+        for op in [op for op, previous in moved.items() if previous == self.start_times[op]]:
+            del moved[op] # only the end changed (processing time change)
+        return RepairResult(disruption, freeze_time, moved, self.start_times, inserted, makespan_before,
+                            self.makespan, visited, time.perf_counter() - start)
+
+    def _check_machine(self, machine_id: int) -> None:
+        if not 0 <= machine_id < self.nr_of_machines:
+            raise ValueError(f"Unknown machine {machine_id}, the schedule has {self.nr_of_machines} machines.")
+
+    def _earliest_start(self, machine_id: int, ready_time: int, processing_time: int) -> int:
+        """First start at or after ready_time where the operation does not overlap a breakdown of the machine."""
+        starts, ends = self.breakdown_starts[machine_id], self.breakdown_ends[machine_id]
+        start_time = ready_time
+        index = bisect_right(ends, start_time)
+        while index < len(starts) and starts[index] < start_time + processing_time:
+            start_time = max(start_time, ends[index])
+            index += 1
+        return start_time
+
+    def _add_breakdown(self, breakdown: MachineBreakdown, freeze_time: int) -> List[int]:
+        """Merge the breakdown into the breakdowns of its machine. Returns the operations it hits."""
+        starts, ends = self.breakdown_starts[breakdown.machine_id], self.breakdown_ends[breakdown.machine_id]
+        first = bisect_left(ends, breakdown.start) # first breakdown that ends at or after the start
+        last = bisect_right(starts, breakdown.end) # breakdowns from first to last - 1 overlap or touch it
+        merged_start = min([breakdown.start] + starts[first:last])
+        merged_end = max([breakdown.end] + ends[first:last])
+        starts[first:last] = [merged_start]
+        ends[first:last] = [merged_end]
+
+        end_times = self.end_times
+        sequence = self.sequences[breakdown.machine_id]
+        index = bisect_right(sequence, breakdown.start, key=end_times.__getitem__)
+        hit = []
+        while index < len(sequence) and self.start_times[sequence[index]] < breakdown.end:
+            if self.start_times[sequence[index]] >= freeze_time:
+                hit.append(sequence[index])
+            index += 1
+        return hit
+
+    def _propagate(self, seeds: List[int], freeze_time: int, moved: Dict[int, int]) -> int:
+        """Recompute the seeds and, as long as times change, their successors. Returns the number of visits."""
+        start_times, end_times, processing_times = self.start_times, self.end_times, self.processing_times
+        machine_ids, job_ends = self.machine_ids, self.job_ends
+        machine_predecessors, machine_successors = self.machine_predecessors, self.machine_successors
+        breakdown_starts, release_times = self.breakdown_starts, self.release_times
+        heap = [(start_times[op], end_times[op], op) for op in seeds]
+        heapq.heapify(heap)
+        queued = set(seeds)
+        visited = 0
+        while heap:
+            _, _, op = heapq.heappop(heap)
+            queued.discard(op)
+            visited += 1
+            previous_start = start_times[op]
+            if previous_start < freeze_time:
+                start_time = previous_start # already started
+            else:
+                start_time = freeze_time
+                machine_predecessor = machine_predecessors[op]
+                if machine_predecessor >= 0 and end_times[machine_predecessor] > start_time:
+                    start_time = end_times[machine_predecessor]
+                if op > 0 and job_ends[op - 1] == job_ends[op]:
+                    if end_times[op - 1] > start_time:
+                        start_time = end_times[op - 1]
+                elif op in release_times:
+                    start_time = max(start_time, release_times[op])
+                if breakdown_starts[machine_ids[op]]:
+                    start_time = self._earliest_start(machine_ids[op], start_time, processing_times[op])
+            end_time = start_time + processing_times[op]
+            if start_time == previous_start and end_time == end_times[op]:
+                continue
+            moved.setdefault(op, previous_start)
+            start_times[op] = start_time
+            end_times[op] = end_time
+            # A successor that was visited already is queued again, so zero processing times (ties) are handled too
+            job_successor = op + 1 if op + 1 < job_ends[op] else -1
+            for successor in (job_successor, machine_successors[op]):
+                if successor >= 0 and successor not in queued:
+                    heapq.heappush(heap, (start_times[successor], end_times[successor], successor))
+                    queued.add(successor)
+        return visited
+
+    def _link(self, op: int, index: int) -> None:
+        """Insert op at position index of its machine sequence."""
+        sequence = self.sequences[self.machine_ids[op]]
+        predecessor = sequence[index - 1] if index > 0 else -1
+        successor = sequence[index] if index < len(sequence) else -1
+        sequence.insert(index, op)
+        self.machine_predecessors.append(predecessor)
+        self.machine_successors.append(successor)
+        if predecessor >= 0:
+            self.machine_successors[predecessor] = op
+        if successor >= 0:
+            self.machine_predecessors[successor] = op
+
+    def _insert_job(self, insertion: JobInsertion, freeze_time: int, moved: Dict[int, int],
+                    inserted: List[int]) -> int:
+        first = self.nr_of_operations
+        last = first + len(insertion.operations)
+        self.job_offsets.append(last)
+        self.release_times[first] = insertion.release_time
+        self._array_shop = None
+        ready_time = max(insertion.release_time, freeze_time)
+
+        for op, (machine_id, processing_time) in enumerate(insertion.operations, start=first):
+            self.machine_ids.append(machine_id)
+            self.processing_times.append(processing_time)
+            self.job_ends.append(last)
+            sequence = self.sequences[machine_id]
+            if insertion.rush:
+                # Before the first operation that starts at or after the ready time; it and its successors shift right
+                index = bisect_left(sequence, ready_time, key=self.start_times.__getitem__)
+                if index > 0:
+                    ready_time = max(ready_time, self.end_times[sequence[index - 1]])
+                start_time = self._earliest_start(machine_id, ready_time, processing_time)
+            else:
+                # First idle gap at or after the ready time where the operation fits
+                index = bisect_right(sequence, ready_time, key=self.end_times.__getitem__)
+                start_time = self._earliest_start(machine_id, ready_time, processing_time)
+                while index < len(sequence) and start_time + processing_time > self.start_times[sequence[index]]:
+                    start_time = self._earliest_start(machine_id, max(ready_time, self.end_times[sequence[index]]),
+                                                      processing_time)
+                    index += 1
+            self.start_times.append(start_time)
+            self.end_times.append(start_time + processing_time)
+            self._link(op, index)
+            inserted.append(op)
+            ready_time = self.end_times[op]
+        if not insertion.rush:
+            return 0
+        # One pass shifts everything behind the inserted operations; those are in the heap too, in case
+        # a shifted operation on one machine delays an inserted operation on another one
+        seeds = inserted + [self.machine_successors[op] for op in inserted if self.machine_successors[op] >= 0]
+        visited = self._propagate(seeds, freeze_time, moved)
+        for op in inserted:
+            moved.pop(op, None)
+        return visited
@@ -0,0 +1,101 @@
+import time
+from typing import Optional
+import numpy as np
+from src.common.array_shop import ArrayJobShop
+from src.common.schedule_state import ScheduleState
+
+
+class RolloutResult:
+    """Makespans of all random rollouts and the best schedule found."""
+
+    def __init__(self, makespans: np.ndarray, best_state: ScheduleState, seed: Optional[int], seconds: float):
+        self.makespans = makespans
+        self.best_state = best_state
+        self.seed = seed
+        self.seconds = seconds
+
+    @property
+    def best_makespan(self) -> int:
+        return int(self.makespans.min())
+
+    @property
+    def nr_of_rollouts(self) -> int:
+        return len(self.makespans)
+
+    @property
+    def rollouts_per_second(self) -> float:
+        return self.nr_of_rollouts / self.seconds if self.seconds > 0 else float('inf')
+
+    def percentiles(self, q=(0, 5, 25, 50, 75, 95, 100)) -> dict:
+        return dict(zip(q, np.percentile(self.makespans, q).tolist()))
+
+    def __str__(self):
+        return (f"{self.nr_of_rollouts} random rollouts: best {self.best_makespan}, "
+                f"mean {self.makespans.mean():.1f}, std {self.makespans.std():.1f}, "
+                f"{self.rollouts_per_second:,.0f} rollouts/s")
+
+
+def simulate_random_batch(instance: ArrayJobShop, batch_size: int, rng: np.random.Generator):
+    """
+    Simulate batch_size independent random dispatching runs at once. In every step each
+    run picks one of its unfinished jobs uniformly at random (like Dispatcher.random) and
+    schedules the next operation of that job as early as possible.
+    Returns (start_times of shape batch x operations, makespans).
+    """
+    machine_ids = instance.machine_ids.astype(np.int64)
+    processing_times = instance.processing_times.astype(np.int64)
+    rows = np.arange(batch_size)
+
+    next_operation = np.tile(instance.job_offsets[:-1].astype(np.int64), (batch_size, 1))
+    remaining_ops = np.tile(np.diff(instance.job_offsets).astype(np.int64), (batch_size, 1))
+    job_ready = np.zeros((batch_size, instance.nr_of_jobs), dtype=np.int64)
+    machine_ready = np.zeros((batch_size, instance.nr_of_machines), dtype=np.int64)
+    start_times = np.full((batch_size, instance.nr_of_operations), -1, dtype=np.int32)
+
+    for _ in range(instance.nr_of_operations):
+        # Uniform choice among the unfinished jobs: finished jobs can never have the largest key
+        keys = rng.random((batch_size, instance.nr_of_jobs))
+        keys[remaining_ops == 0] = -1.0
+        jobs = keys.argmax(axis=1)
+
+        operations = next_operation[rows, jobs]
+        machines = machine_ids[operations]
+        starts = np.maximum(job_ready[rows, jobs], machine_ready[rows, machines])
+        ends = starts + processing_times[operations]
+
+        start_times[rows, operations] = starts
+        job_ready[rows, jobs] = ends
+        machine_ready[rows, machines] = ends
+        next_operation[rows, jobs] += 1
+        remaining_ops[rows, jobs] -= 1
+
+    return start_times, job_ready.max(axis=1, initial=0)
+
+
+def random_rollouts(instance: ArrayJobShop, nr_of_rollouts: int, seed: Optional[int] = None,
+                    batch_size: int = 256) -> RolloutResult:
+    """
+    Run nr_of_rollouts random dispatching rollouts in batches of batch_size and keep the
+    best schedule. Results are reproducible for the same seed and batch_size.
+    """
+    if nr_of_rollouts < 1:
+        raise ValueError("nr_of_rollouts must be at least 1.")
+
+    rng = np.random.default_rng(seed)
+    makespans = np.empty(nr_of_rollouts, dtype=np.int64)
+    best_state = instance.new_state()
+    best_makespan = None
+
+    start = time.perf_counter()
+    for offset in range(0, nr_of_rollouts, batch_size):
+        size = min(batch_size, nr_of_rollouts - offset)
+        start_times, batch_makespans = simulate_random_batch(instance, size, rng)
+        makespans[offset:offset + size] = batch_makespans
+
+        best_index = int(batch_makespans.argmin())
+        if best_makespan is None or batch_makespans[best_index] < best_makespan:
+            best_makespan = int(batch_makespans[best_index])
+            best_state.set_start_times(start_times[best_index])
+    seconds = time.perf_counter() - start
+
+    return RolloutResult(makespans, best_state, seed, seconds)
@@ -0,0 +1,197 @@
+from typing import Callable, Dict, List
+import numpy as np
+
+
+class JobFeatures:
+    """
+    Per-job and per-machine dispatching features of an ArrayJobShop.
+
+    Prefix sums over the processing times are computed once per instance, so the
+    remaining work of a job is a single subtraction. After an operation has been
+    scheduled, advance() updates the features of that job and the two machines
+    involved in O(1); the arrays can then be scored for all jobs at once.
+    """
+
+    def __init__(self, instance):
+        self.instance = instance
+        self.processing_times = instance.processing_times.astype(np.int64)
+        self.machine_ids = instance.machine_ids.astype(np.int64)
+        self.job_offsets = instance.job_offsets.astype(np.int64)
+        self.prefix_work = np.concatenate(([0], np.cumsum(self.processing_times)))
+        self.total_work = self.prefix_work[self.job_offsets[1:]] - self.prefix_work[self.job_offsets[:-1]]
+        self.total_ops = np.diff(self.job_offsets)
+        self.reset()
+
+    def reset(self) -> None:
+        nr_of_jobs = self.instance.nr_of_jobs
+        self.next_operation = self.job_offsets[:-1].copy()
+        self.remaining_ops = self.total_ops.copy()
+        self.remaining_work = self.total_work.copy()
+        self.unfinished = self.remaining_ops > 0
+        next_index = np.minimum(self.next_operation, max(self.instance.nr_of_operations - 1, 0))
+        self.next_processing_time = np.where(self.unfinished, self.processing_times[next_index], 0)
+        self.next_machine = np.where(self.unfinished, self.machine_ids[next_index], -1)
+        self.job_ready = np.zeros(nr_of_jobs, dtype=np.int64)
+        self.machine_ready = np.zeros(self.instance.nr_of_machines, dtype=np.int64)
+        self.machine_queue_load = np.bincount(self.next_machine[self.unfinished],
+                                              weights=self.next_processing_time[self.unfinished],
+                                              minlength=self.instance.nr_of_machines).astype(np.int64)
+
+    def earliest_start_time(self, job_id: int) -> int:
+        """Return the earliest start time of the next operation of a job."""
+        return max(int(self.job_ready[job_id]), int(self.machine_ready[self.next_machine[job_id]]))
+
+    def advance(self, job_id: int, start_time: int) -> int:
+        """Schedule the next operation of a job at start_time and update its features. Returns the end time."""
+        op = self.next_operation[job_id]
+        machine_id = self.next_machine[job_id]
+        processing_time = self.next_processing_time[job_id]
+        end_time = start_time + processing_time
+
+        self.job_ready[job_id] = end_time
+        # An operation inserted into an idle gap (active mode) does not move the machine's horizon
+        self.machine_ready[machine_id] = max(self.machine_ready[machine_id], end_time)
+        self.machine_queue_load[machine_id] -= processing_time
+        self.remaining_work[job_id] -= processing_time
+        self.remaining_ops[job_id] -= 1
+        self.next_operation[job_id] = op + 1
+
+        if self.remaining_ops[job_id] > 0:
+            next_machine = self.machine_ids[op + 1]
+            self.next_machine[job_id] = next_machine
+            self.next_processing_time[job_id] = self.processing_times[op + 1]
+            self.machine_queue_load[next_machine] += self.processing_times[op + 1]
+        else:
+            self.next_machine[job_id] = -1
+            self.next_processing_time[job_id] = 0
+            self.unfinished[job_id] = False
+        return int(end_time)
+
+    @property
+    def following_machine(self) -> np.ndarray:
+        """Machine of the operation after the next one per job, -1 if there is none."""
+        has_following = self.remaining_ops > 1
+        index = np.minimum(self.next_operation + 1, max(self.instance.nr_of_operations - 1, 0))
+        return np.where(has_following, self.machine_ids[index], -1)
+
+
+class PriorityRule:
+    """
+    A dispatching rule that scores all jobs at once from their JobFeatures.
+    The unfinished job with the lowest score is dispatched next, ties go to the lowest job id.
+    """
+
+    def __init__(self, name: str, score: Callable[[JobFeatures], np.ndarray], description: str = ""):
+        self.name = name
+        self.score = score
+        self.description = description
+
+    def __call__(self, features: JobFeatures) -> np.ndarray:
+        return self.score(features)
+
+    def __repr__(self):
+        return f"PriorityRule({self.name})"
+
+
+PRIORITY_RULES: Dict[str, PriorityRule] = {}
+
+
+def register_rule(name: str, description: str = ""):
+    """Decorator to register a score function as PriorityRule under the given name."""
+    def decorator(score: Callable[[JobFeatures], np.ndarray]) -> Callable[[JobFeatures], np.ndarray]:
+        PRIORITY_RULES[name] = PriorityRule(name, score, description)
+        return score
+    return decorator
+
+
+def get_rule(name: str) -> PriorityRule:
+    if name not in PRIORITY_RULES:
+        raise ValueError(f"Unknown dispatching rule: {name}. Available rules: {', '.join(available_rules())}")
+    return PRIORITY_RULES[name]
+
+
+def available_rules() -> List[str]:
+    return list(PRIORITY_RULES)
+
+
+def normalized_remaining_work(features: JobFeatures) -> np.ndarray:
+    """Remaining work as fraction of the total work of each job, like Dispatcher.normalized_remaining_processing_time."""
+    return np.divide(features.remaining_work, features.total_work,
+                     out=np.zeros(len(features.total_work)), where=features.total_work > 0)
+
+
+@register_rule("fifo", "First in first out: job that became available first")
+def fifo(features: JobFeatures) -> np.ndarray:
+    return features.job_ready
+
+
+@register_rule("lifo", "Last in first out: job that became available last")
+def lifo(features: JobFeatures) -> np.ndarray:
+    return -features.job_ready
+
+
+@register_rule("mwkr", "Most (normalized) work remaining")
+def mwkr(features: JobFeatures) -> np.ndarray:
+    return -normalized_remaining_work(features)
+
+
+@register_rule("lwkr", "Least (normalized) work remaining")
+def lwkr(features: JobFeatures) -> np.ndarray:
+    return normalized_remaining_work(features)
+
+
+@register_rule("spt", "Shortest processing time of the next operation")
+def spt(features: JobFeatures) -> np.ndarray:
+    return features.next_processing_time
+
+
+@register_rule("lpt", "Longest processing time of the next operation")
+def lpt(features: JobFeatures) -> np.ndarray:
+    return -features.next_processing_time
+
+
+@register_rule("mopnr", "Most operations remaining")
+def mopnr(features: JobFeatures) -> np.ndarray:
+    return -features.remaining_ops
+
+
+@register_rule("lor", "Least operations remaining")
+def lor(features: JobFeatures) -> np.ndarray:
+    return features.remaining_ops
+
+
+@register_rule("mwr", "Most absolute work remaining")
+def mwr(features: JobFeatures) -> np.ndarray:
+    return -features.remaining_work
+
+
+@register_rule("lwr", "Least absolute work remaining")
+def lwr(features: JobFeatures) -> np.ndarray:
+    return features.remaining_work
+
+
+@register_rule("lrm", "Longest remaining work excluding the next operation")
+def lrm(features: JobFeatures) -> np.ndarray:
+    return -(features.remaining_work - features.next_processing_time)
+
+
+@register_rule("spt_twkr", "Smallest ratio of next processing time to total work remaining")
+def spt_twkr(features: JobFeatures) -> np.ndarray:
+    return np.divide(features.next_processing_time, features.remaining_work,
+                     out=np.zeros(len(features.remaining_work)), where=features.remaining_work > 0)
+
+
+@register_rule("est", "Earliest start time of the next operation")
+def est(features: JobFeatures) -> np.ndarray:
+    return np.maximum(features.job_ready, features.machine_ready[features.next_machine])
+
+
+@register_rule("ect", "Earliest completion time of the next operation")
+def ect(features: JobFeatures) -> np.ndarray:
+    return est(features) + features.next_processing_time
+
+
+@register_rule("winq", "Least work in the queue of the machine of the following operation")
+def winq(features: JobFeatures) -> np.ndarray:
+    following_machine = features.following_machine
+    return np.where(following_machine >= 0, features.machine_queue_load[following_machine], 0)
@@ -0,0 +1,74 @@
+import numpy as np
+
+
+class ScheduleState:
+    """
+    Per-run schedule of an ArrayJobShop: the start and end time of every operation.
+
+    The instance data itself is immutable and shared, so creating or resetting a
+    state only touches two int32 arrays. Several dispatchers or algorithms can work
+    on the same instance at the same time, each with its own ScheduleState.
+    Unscheduled operations have a start_time and end_time of -1.
+    """
+
+    def __init__(self, instance):
+        self.instance = instance
+        self.start_times = np.full(instance.nr_of_operations, -1, dtype=np.int32)
+        self.end_times = np.full(instance.nr_of_operations, -1, dtype=np.int32)
+
+    @classmethod
+    def from_start_times(cls, instance, start_times) -> "ScheduleState":
+        """Create a state from start times (-1 for unscheduled operations); end times are derived."""
+        state = cls(instance)
+        state.set_start_times(start_times)
+        return state
+
+    @classmethod
+    def from_job_shop(cls, instance, job_shop) -> "ScheduleState":
+        """Copy the schedule of the already scheduled operations of a JobShop."""
+        state = cls(instance)
+        operations = [operation for job in job_shop.jobs for operation in job.operations]
+        for index, operation in enumerate(operations):
+            if operation.was_scheduled:
+                state.start_times[index] = operation.start_time
+                state.end_times[index] = operation.end_time
+        return state
+
+    def set_start_times(self, start_times) -> None:
+        self.start_times[:] = start_times
+        np.add(self.start_times, self.instance.processing_times, out=self.end_times)
+        self.end_times[self.start_times < 0] = -1
+
+    def apply_to(self, job_shop) -> None:
+        """
+        Schedule the operations of a (reset) JobShop at the start times of this state.
+        Operations are placed in order of their start (and end) time, so machine schedules stay sorted.
+        """
+        operations = [operation for job in job_shop.jobs for operation in job.operations]
+        scheduled = np.flatnonzero(self.start_times >= 0)
+        order = scheduled[np.lexsort((self.end_times[scheduled], self.start_times[scheduled]))]
+
+        for index, start_time in zip(order.tolist(), self.start_times[order].tolist()):
+            operation = operations[index]
+            job = job_shop.jobs[operation.job_id]
+            job_shop.machines[operation.machine_id].schedule_operation(operation, start_time)
+            job_shop.current_time[job.id] = operation.end_time
+            job.complete_current_operation()
+
+    def copy(self) -> "ScheduleState":
+        state = ScheduleState(self.instance)
+        state.start_times[:] = self.start_times
+        state.end_times[:] = self.end_times
+        return state
+
+    def reset(self) -> None:
+        self.start_times.fill(-1)
+        self.end_times.fill(-1)
+
+    @property
+    def makespan(self) -> int:
+        return int(self.end_times.max(initial=0))
+
+    @property
+    def nbytes(self) -> int:
+        return self.start_times.nbytes + self.end_times.nbytes
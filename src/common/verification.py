@@ -0,0 +1,120 @@
+from typing import List, Optional
+import numpy as np
+
+VIOLATION_KINDS = ("unscheduled", "duration", "precedence", "overlap")
+
+
+class Violation:
+    """
+    One violated constraint of a schedule. operations are flat operation indices (job by job,
+    in routing order); an overlap or precedence violation names the two operations involved.
+    """
+
+    def __init__(self, kind: str, operations: List[int], job_id: Optional[int] = None,
+                 machine_id: Optional[int] = None):
+        self.kind = kind
+        self.operations = operations
+        self.job_id = job_id
+        self.machine_id = machine_id
+
+    def __str__(self):
+        match self.kind:
+            case "unscheduled":
+                return f"Operation {self.operations[0]} of job {self.job_id} was not scheduled"
+            case "duration":
+                return f"Operation {self.operations[0]} of job {self.job_id} does not match its processing time"
+            case "precedence":
+                return f"Order violation for job {self.job_id} between operation {self.operations[0]} and {self.operations[1]}"
+            case _:
+                return f"Overlap on machine {self.machine_id} between operation {self.operations[0]} and {self.operations[1]}"
+
+    def __repr__(self):
+        return f"Violation({self.kind!r}, {self.operations}, job_id={self.job_id}, machine_id={self.machine_id})"
+
+
+class ScheduleReport:
+    """
+    Result of verify_schedule: all violations and the KPIs of the scheduled operations.
+    Utilization and idle time are per machine, relative to the makespan; the flow time of
+    a job is the end of its last operation (all jobs are released at time 0).
+    """
+
+    def __init__(self, violations: List[Violation], makespan: int, machine_utilization: np.ndarray,
+                 machine_idle_time: np.ndarray, total_flow_time: int):
+        self.violations = violations
+        self.makespan = makespan
+        self.machine_utilization = machine_utilization
+        self.machine_idle_time = machine_idle_time
+        self.total_flow_time = total_flow_time
+
+    @property
+    def valid(self) -> bool:
+        return not self.violations
+
+    @property
+    def mean_utilization(self) -> float:
+        return float(self.machine_utilization.mean()) if len(self.machine_utilization) else 0.0
+
+    @property
+    def idle_time(self) -> int:
+        return int(self.machine_idle_time.sum())
+
+    def count(self, kind: str) -> int:
+        return sum(violation.kind == kind for violation in self.violations)
+
+    def __str__(self):
+        status = "valid" if self.valid else ", ".join(f"{self.count(kind)} {kind}" for kind in VIOLATION_KINDS
+                                                     if self.count(kind))
+        return (f"Schedule {status}: makespan {self.makespan}, mean utilization {100 * self.mean_utilization:.1f}%, "
+                f"idle time {self.idle_time}, total flow time {self.total_flow_time}")
+
+
+def verify_schedule(job_ids, machine_ids, processing_times, start_times, end_times, nr_of_machines: int) -> ScheduleReport:
+    """
+    Verify a schedule given as flat arrays with one entry per operation, job by job in routing
+    order. Unscheduled operations have a negative start time. All checks run vectorized in one
+    pass: completeness and durations elementwise, precedence on neighbours of the same job and
+    machine capacity on neighbours after one lexsort by (machine, start, end), so O(N log N).
+    Violations are collected, not printed.
+    """
+    job_ids = np.asarray(job_ids, dtype=np.int64)
+    machine_ids = np.asarray(machine_ids, dtype=np.int64)
+    processing_times = np.asarray(processing_times, dtype=np.int64)
+    start_times = np.asarray(start_times, dtype=np.int64)
+    end_times = np.asarray(end_times, dtype=np.int64)
+    scheduled = start_times >= 0
+    violations = []
+
+    for op in np.flatnonzero(~scheduled).tolist():
+        violations.append(Violation("unscheduled", [op], job_id=int(job_ids[op]), machine_id=int(machine_ids[op])))
+    for op in np.flatnonzero(scheduled & (end_times - start_times != processing_times)).tolist():
+        violations.append(Violation("duration", [op], job_id=int(job_ids[op]), machine_id=int(machine_ids[op])))
+
+    # Precedence: an operation must not start before its (scheduled) job predecessor has ended
+    both = (job_ids[1:] == job_ids[:-1]) & scheduled[1:] & scheduled[:-1]
+    for op in (np.flatnonzero(both & (start_times[1:] < end_times[:-1])) + 1).tolist():
+        violations.append(Violation("precedence", [op - 1, op], job_id=int(job_ids[op])))
+
+    # Capacity: sort by (machine, start, end) and compare every operation with the latest end
+    # of the operations before it on the same machine; the end time puts an operation without
+    # processing time before one starting with it. The running maximum is taken over keys that
+    # encode (machine, end, position), so it never crosses into the next machine.
+    order = np.flatnonzero(scheduled)
+    order = order[np.lexsort((end_times[order], start_times[order], machine_ids[order]))]
+    if len(order) > 1:
+        sorted_machines, sorted_ends = machine_ids[order], end_times[order]
+        positions = np.arange(len(order), dtype=np.int64)
+        keys = (sorted_machines * (int(sorted_ends.max()) + 1) + sorted_ends) * len(order) + positions
+        latest = np.maximum.accumulate(keys)[:-1] % len(order)
+        same_machine = sorted_machines[1:] == sorted_machines[latest]
+        for index in np.flatnonzero(same_machine & (start_times[order][1:] < sorted_ends[latest])).tolist():
+            first, second = int(order[latest[index]]), int(order[index + 1])
+            violations.append(Violation("overlap", [first, second], machine_id=int(machine_ids[second])))
+
+    makespan = int(end_times[scheduled].max(initial=0))
+    busy = np.bincount(machine_ids[scheduled], weights=(end_times - start_times)[scheduled],
+                       minlength=nr_of_machines).astype(np.int64)
+    utilization = busy / makespan if makespan > 0 else np.zeros(nr_of_machines)
+    completion = np.zeros(int(job_ids.max(initial=-1)) + 1, dtype=np.int64)
+    np.maximum.at(completion, job_ids[scheduled], end_times[scheduled])
+    return ScheduleReport(violations, makespan, utilization, makespan - busy, int(completion.sum()))
@@ -1,5 +1,6 @@
 import random
 import matplotlib.pyplot as plt
+from src.taillard import MAX_TIME, MIN_TIME, generate_arrays, lcg_states, uniform_draws
 
 class JobShopGenerator:
     @staticmethod
@@ -11,13 +12,10 @@ class JobShopGenerator:
         return random.randint(a, b)
 
     @staticmethod
-    def generate_processing_times_taillard(seed_time, n_jobs, n_machines, min_time=1, max_time=99):
-        JobShopGenerator.initialize_seed(seed_time)
-        processing_times = [
-            [JobShopGenerator.uniform_random(min_time, max_time) for _ in range(n_jobs)]
-            for _ in range(n_machines)
-        ]
-        return processing_times
+    def generate_processing_times_taillard(seed_time, n_jobs, n_machines, min_time=MIN_TIME, max_time=MAX_TIME):
+        # Taillard's generator draws the times job by job: processing_times[i][j] is the time of operation i of job j
+        draws = uniform_draws(lcg_states(seed_time, 0, n_jobs * n_machines), min_time, max_time)
+        return draws.reshape(n_jobs, n_machines).T.tolist()
 
     @staticmethod
     def generate_processing_times_demirkol(n_jobs, n_machines, min_time=1, max_time=200):
@@ -29,19 +27,8 @@ class JobShopGenerator:
 
     @staticmethod
     def generate_machine_assignments(seed_machine, n_jobs, n_machines):
-        machine_assignments = [
-            [i for i in range(n_machines)]
-            for _ in range(n_jobs)
-        ]
-        JobShopGenerator.initialize_seed(seed_machine)
-        for j in range(n_jobs):
-            for i in range(n_machines):
-                k = JobShopGenerator.uniform_random(i, n_machines - 1)
-                machine_assignments[j][i], machine_assignments[j][k] = (
-                    machine_assignments[j][k],
-                    machine_assignments[j][i],
-                )
-        return machine_assignments
+        machine_assignments, _ = generate_arrays(0, seed_machine, n_jobs, n_machines)
+        return machine_assignments.tolist()
 
     @staticmethod
     def generate_job_routings(n_jobs, n_machines, job_type='classic'):
@@ -67,7 +54,7 @@ class JobShopGenerator:
             job = []
             for i in range(n_machines):
                 machine = machine_assignments[j][i]
-                processing_time = processing_times[machine][j]
+                processing_time = processing_times[i][j]
                 job.append((machine, processing_time))
             formatted_instance.append(job)
         return formatted_instance
@@ -97,10 +84,9 @@ class JobShopGenerator:
 
     @staticmethod
     def generate_taillard(seed_time, seed_machine, n_jobs, n_machines):
-        processing_times = JobShopGenerator.generate_processing_times_taillard(seed_time, n_jobs, n_machines)
-        machine_assignments = JobShopGenerator.generate_machine_assignments(seed_machine, n_jobs, n_machines)
-        formatted_instance = JobShopGenerator.format_instance(processing_times, machine_assignments)
-        return formatted_instance
+        # Taillard's own random number generator (src/taillard.py), so the seeds of ta01-ta80 reproduce them exactly
+        machine_ids, processing_times = generate_arrays(seed_time, seed_machine, n_jobs, n_machines)
+        return [list(zip(machines, times)) for machines, times in zip(machine_ids.tolist(), processing_times.tolist())]
 
     @staticmethod
     def generate_demirkol(n_jobs, n_machines, min_time=1, max_time=200, job_type='classic'):
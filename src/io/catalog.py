@@ -0,0 +1,48 @@
+import os
+from src.common.job_shop import JobShop
+
+INSTANCES_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'instances.json')
+
+
+def get_nested(data, keys):
+    """
+    Retrieve value from nested dictionary.
+    
+    Parameters:
+    - data: The dictionary to search.
+    - keys: A list of keys representing the path in the nested dictionary.
+    
+    Returns:
+    - The value at the specified path or None if any key in the path does not exist.
+    """
+    for key in keys:
+        try:
+            data = data[key]
+        except (KeyError, TypeError):
+            return None
+    return data
+
+def get_all_instances():
+    """Return all entries of instances.json. The file is only read again when it changed."""
+    return get_default_registry().entries
+
+def get_all_instances_as_dict():
+     json_instances = get_all_instances()
+     # Preprocess data into a dictionary for efficient lookup
+     benchmark_dict = {entry['name']: entry for entry in json_instances}
+     return benchmark_dict
+
+def get_jobshop_instance(instance_name: str, use_cache: bool = True) -> JobShop:
+    """
+    Return the JobShop of a benchmark instance from the process-wide InstanceRegistry.
+    Cached instances are shared and reset on access; use_cache=False parses a new one.
+    """
+    registry = get_default_registry()
+    if use_cache:
+        return registry.get(instance_name)
+    return registry.load(instance_name)
+
+
+def get_default_registry():
+    from src.io.registry import get_default_registry
+    return get_default_registry()
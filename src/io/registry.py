@@ -0,0 +1,178 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from src.common.array_shop import ArrayJobShop
+from src.common.bounds import lower_bound as lower_bound_of
+from src.common.job_shop import JobShop
+from src.io.catalog import INSTANCES_FILE, get_nested
+
+# Rough size of one parsed Operation (object, attributes, list slots) used for the memory cap
+BYTES_PER_OPERATION = 300
+
+
+class InstanceRegistry:
+    """
+    In-process registry of the benchmark instances in instances.json.
+
+    The catalog is read once and re-read only when the mtime of instances.json changes.
+    JobShop objects are parsed lazily on first access and kept in an LRU cache that is
+    limited by number of instances (max_size) and/or estimated memory (max_bytes).
+    A cached instance is dropped when the mtime of its instance file changes.
+    """
+
+    def __init__(self, instances_file: str = INSTANCES_FILE, max_size: Optional[int] = 32,
+                 max_bytes: Optional[int] = None):
+        self.instances_file = instances_file
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._catalog_mtime = None
+        self._by_name: Dict[str, Dict] = {}
+        self._by_author: Dict[str, List[Dict]] = {}
+        self._by_size: Dict[tuple, List[Dict]] = {}
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict() # name -> (job_shop, file mtime, estimated bytes)
+        self._cached_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _refresh_catalog(self) -> None:
+        mtime = os.path.getmtime(self.instances_file)
+        if mtime == self._catalog_mtime:
+            return
+
+        with open(self.instances_file, "r") as instance_file:
+            json_instances = json.load(instance_file)
+
+        self._by_name = {entry['name']: entry for entry in json_instances}
+        self._by_author = {}
+        self._by_size = {}
+        for entry in json_instances:
+            self._by_author.setdefault(entry['author'].lower(), []).append(entry)
+            self._by_size.setdefault((entry['jobs'], entry['machines']), []).append(entry)
+        self._catalog_mtime = mtime
+        self.clear()
+
+    @property
+    def entries(self) -> List[Dict]:
+        """Return all catalog entries in the order of instances.json."""
+        with self._lock:
+            self._refresh_catalog()
+            return list(self._by_name.values())
+
+    def get_entry(self, instance_name: str) -> Dict:
+        with self._lock:
+            self._refresh_catalog()
+            if instance_name not in self._by_name:
+                raise KeyError(f"Instance '{instance_name}' not found in benchmark data.")
+            return self._by_name[instance_name]
+
+    def __contains__(self, instance_name: str) -> bool:
+        with self._lock:
+            self._refresh_catalog()
+            return instance_name in self._by_name
+
+    def find(self, author: Optional[str] = None, jobs: Optional[int] = None,
+             machines: Optional[int] = None) -> List[Dict]:
+        """Return the catalog entries matching an author (case-insensitive) and/or a size."""
+        with self._lock:
+            self._refresh_catalog()
+            if jobs is not None and machines is not None:
+                candidates = self._by_size.get((jobs, machines), [])
+            elif author is not None:
+                candidates = self._by_author.get(author.lower(), [])
+            else:
+                candidates = list(self._by_name.values())
+
+            return [entry for entry in candidates
+                    if (author is None or entry['author'].lower() == author.lower())
+                    and (jobs is None or entry['jobs'] == jobs)
+                    and (machines is None or entry['machines'] == machines)]
+
+    def load(self, instance_name: str) -> JobShop:
+        """
+        Parse a new JobShop of an instance, bypassing the cache. The bounds come from the
+        "bounds" entry of the catalog, a known optimum is used as both bounds. Without
+        either, the lower bound is computed with src.common.bounds.
+        """
+        with self._lock:
+            entry = self.get_entry(instance_name)
+        optimum = entry.get("optimum", None)
+        upper_bound = get_nested(entry, ["bounds", "upper"])
+        lower_bound = get_nested(entry, ["bounds", "lower"])
+        job_shop = JobShop(file_path=entry.get("path", None),
+                           name=entry.get("name", None),
+                           optimum=optimum,
+                           info=entry.get("info", None),
+                           author=entry.get("author", None),
+                           upper_bound=upper_bound if upper_bound is not None else optimum,
+                           lower_bound=lower_bound if lower_bound is not None else optimum)
+        if job_shop.lower_bound is None:
+            job_shop.lower_bound = lower_bound_of(ArrayJobShop.from_job_shop(job_shop))
+        return job_shop
+
+    def get(self, instance_name: str) -> JobShop:
+        """
+        Return the parsed JobShop of an instance. Cached instances are shared, so the
+        JobShop is reset before it is returned; callers must not keep two schedules of
+        the same instance from one registry at the same time.
+        """
+        with self._lock:
+            entry = self.get_entry(instance_name)
+            file_mtime = os.path.getmtime(entry["path"])
+
+            cached = self._cache.get(instance_name)
+            if cached is not None and cached[1] == file_mtime:
+                self._cache.move_to_end(instance_name)
+                self.hits += 1
+                job_shop = cached[0]
+                job_shop.reset()
+                return job_shop
+            if cached is not None:
+                self._evict(instance_name)
+
+            self.misses += 1
+            job_shop = self.load(instance_name)
+            nr_of_bytes = sum(job.nr_of_operations for job in job_shop.jobs) * BYTES_PER_OPERATION
+            self._cache[instance_name] = (job_shop, file_mtime, nr_of_bytes)
+            self._cached_bytes += nr_of_bytes
+            self._enforce_limits()
+            return job_shop
+
+    def _evict(self, instance_name: str) -> None:
+        _, _, nr_of_bytes = self._cache.pop(instance_name)
+        self._cached_bytes -= nr_of_bytes
+
+    def _enforce_limits(self) -> None:
+        # The most recently used instance is always kept, even if it alone exceeds max_bytes
+        while len(self._cache) > 1 and (
+                (self.max_size is not None and len(self._cache) > self.max_size)
+                or (self.max_bytes is not None and self._cached_bytes > self.max_bytes)):
+            self._evict(next(iter(self._cache)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._cached_bytes = 0
+
+    @property
+    def cached_names(self) -> List[str]:
+        """Names of the cached instances, least recently used first."""
+        with self._lock:
+            return list(self._cache)
+
+    @property
+    def cached_bytes(self) -> int:
+        return self._cached_bytes
+
+
+_default_registry: Optional[InstanceRegistry] = None
+
+
+def get_default_registry() -> InstanceRegistry:
+    """Return the process-wide registry used by src.io.catalog.get_jobshop_instance."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = InstanceRegistry()
+    return _default_registry
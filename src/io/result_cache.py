@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+import numpy as np
+from src.common.array_shop import ArrayJobShop
+
+# Bump when a cached algorithm can produce a different schedule for the same input,
+# so that entries of older code are never returned
+CACHE_VERSION = 1
+DEFAULT_CACHE_FOLDER = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'cache')
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def instance_digest(instance: ArrayJobShop) -> str:
+    """sha1 of the instance contents (machine ids, processing times, job offsets), independent of file and name."""
+    digest = hashlib.sha1(np.int64(instance.nr_of_machines).tobytes())
+    for array in (instance.machine_ids, instance.processing_times, instance.job_offsets):
+        digest.update(np.ascontiguousarray(array, dtype='<i4').tobytes())
+    return digest.hexdigest()
+
+
+def dispatch_parameters(rule: str, mode: str = "semi-active", seed: Optional[int] = None,
+                        rollouts: int = 1) -> Optional[Dict]:
+    """Cache parameters of a dispatching rule run, or None if the run is not deterministic (random without seed)."""
+    if rule != "random":
+        return {'mode': mode}
+    if seed is None:
+        return None
+    if mode != "semi-active":
+        return {'mode': mode, 'seed': seed} # the other modes dispatch once, rollouts are not used
+    return {'mode': mode, 'seed': seed, 'rollouts': rollouts}
+
+
+class ResultCache:
+    """
+    On-disk cache of deterministic schedules, content addressed: the key is a hash of the
+    instance contents, the algorithm, its parameters and CACHE_VERSION. Every entry is one .npz
+    file with the start times, the makespan and the wall time of the run. Display names are not
+    stored; they follow from the algorithm and its parameters.
+
+    get() touches the entry, so eviction removes the least recently used entries once the
+    folder grows beyond max_bytes. Unreadable entries are treated as misses and removed.
+    """
+
+    def __init__(self, folder: str = DEFAULT_CACHE_FOLDER, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(folder, exist_ok=True)
+
+    def key(self, instance: ArrayJobShop, algorithm: str, parameters: Optional[Dict] = None) -> str:
+        description = json.dumps({'instance': instance_digest(instance),
+                                   'algorithm': algorithm,
+                                   'parameters': parameters or {},
+                                   'version': CACHE_VERSION}, sort_keys=True)
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.folder, f"{key}.npz")
+
+    def get(self, instance: ArrayJobShop, algorithm: str, parameters: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Return the cached entry of a schedule or None: start_times, makespan and seconds
+        (the wall time of the original run).
+        """
+        path = self.path(self.key(instance, algorithm, parameters))
+        try:
+            with np.load(path) as data:
+                entry = {'start_times': data["start_times"],
+                         'makespan': int(data["makespan"]),
+                         'seconds': float(data["seconds"])}
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            self._remove(path)
+            return None
+        if len(entry['start_times']) != instance.nr_of_operations:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, instance: ArrayJobShop, algorithm: str, parameters: Optional[Dict],
+            start_times, makespan: int, seconds: float = 0.0) -> None:
+        path = self.path(self.key(instance, algorithm, parameters))
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, 'wb') as f:
+            np.savez(f, start_times=np.asarray(start_times, dtype=np.int32), makespan=makespan, seconds=seconds)
+        os.replace(temporary_path, path) # atomic, so readers never see a partial entry
+        self.evict()
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        # Another process may have evicted the entry already
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def evict(self) -> int:
+        """Remove the least recently used entries until the cache fits into max_bytes. Returns the removed count."""
+        entries = []
+        for name in os.listdir(self.folder):
+            if name.endswith(".npz"):
+                try:
+                    stat = os.stat(os.path.join(self.folder, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(os.path.join(self.folder, name))
+            total -= size
+            removed += 1
+        return removed
+
+    @property
+    def nbytes(self) -> int:
+        return sum(os.path.getsize(os.path.join(self.folder, name))
+                   for name in os.listdir(self.folder) if name.endswith(".npz"))
+
+    def clear(self) -> None:
+        for name in os.listdir(self.folder):
+            if name.endswith(".npz"):
+                self._remove(os.path.join(self.folder, name))
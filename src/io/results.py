@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+RESULT_FORMATS = ("csv", "jsonl")
+KEY_FIELDS = ('Instance', 'Algorithm', 'Mode', 'Seed')
+
+
+def result_key(row: Dict) -> Tuple[str, ...]:
+    """Identify a result by (instance, algorithm, mode, seed); values are compared as strings, None as ''."""
+    return tuple("" if row.get(field) is None else str(row.get(field)) for field in KEY_FIELDS)
+
+
+class ResultsWriter:
+    """
+    Append result rows to a .csv or .jsonl file one line at a time, so a crash or Ctrl-C only
+    loses the rows that were not finished yet.
+
+    Every row is flushed to the OS by default; with fsync it is also forced to disk. Without
+    resume an existing file is replaced. With resume the rows already in the file are read
+    first: completed() answers whether a (instance, algorithm, mode, seed) key was done, and
+    a last line cut off by a crash is dropped before new rows are appended. A csv file must
+    have the same columns as the writer.
+    """
+
+    def __init__(self, file_path: str, fields: List[str], resume: bool = False, flush: bool = True,
+                 fsync: bool = False):
+        self.file_path = file_path
+        self.fields = list(fields)
+        self.flush = flush
+        self.fsync = fsync
+        self.format = os.path.splitext(file_path)[1].lower().lstrip(".")
+        if self.format not in RESULT_FORMATS:
+            raise ValueError(f"Unknown results format: {self.format}. Available formats: {', '.join(RESULT_FORMATS)}")
+
+        self.rows: List[Dict] = self.read_rows() if resume else []
+        self.keys: Set[Tuple[str, ...]] = {result_key(row) for row in self.rows}
+        folder = os.path.dirname(file_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.file = open(file_path, mode='a' if resume else 'w', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=self.fields) if self.format == "csv" else None
+        if self.writer is not None and self.file.tell() == 0:
+            self.writer.writeheader()
+            self._sync()
+
+    def read_rows(self) -> List[Dict]:
+        """Read the complete rows of an existing file and cut off a partially written last line."""
+        if not os.path.exists(self.file_path):
+            return []
+        with open(self.file_path, newline='') as file:
+            text = file.read()
+        complete = text[:text.rfind("\n") + 1]
+        if len(complete) < len(text):
+            with open(self.file_path, 'r+') as file:
+                file.truncate(len(complete.encode()))
+        if not complete:
+            return []
+
+        if self.format == "jsonl":
+            return [json.loads(line) for line in complete.splitlines() if line.strip()]
+        reader = csv.DictReader(io.StringIO(complete, newline=''))
+        if reader.fieldnames != self.fields:
+            raise ValueError(f"{self.file_path} has the columns {reader.fieldnames}, expected {self.fields}. "
+                             f"Write to a new file to change the columns.")
+        return list(reader)
+
+    def completed(self, row: Dict) -> bool:
+        return result_key(row) in self.keys
+
+    def write(self, row: Dict) -> None:
+        if self.writer is not None:
+            self.writer.writerow(row)
+        else:
+            self.file.write(json.dumps({field: row.get(field) for field in self.fields}) + "\n")
+        self._sync()
+        self.rows.append(row)
+        self.keys.add(result_key(row))
+
+    def write_all(self, rows: Iterable[Dict]) -> None:
+        for row in rows:
+            self.write(row)
+
+    def _sync(self) -> None:
+        if self.flush or self.fsync:
+            self.file.flush()
+        if self.fsync:
+            os.fsync(self.file.fileno())
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,59 @@
+import csv
+import json
+import os
+from typing import Dict, List, Optional
+import numpy as np
+
+EXPORT_FORMATS = ("json", "csv")
+SCHEDULE_FIELDS = ['Job', 'Operation', 'Machine', 'Start', 'End']
+
+
+def schedule_rows(job_ids, machine_ids, start_times, end_times) -> List[Dict]:
+    """
+    One row per scheduled operation from flat per-operation sequences (job by job, in routing
+    order), sorted by machine and start time. Operation is the index within its job.
+    """
+    job_ids = np.asarray(job_ids, dtype=np.int64)
+    machine_ids = np.asarray(machine_ids, dtype=np.int64)
+    start_times = np.asarray(start_times, dtype=np.int64)
+    end_times = np.asarray(end_times, dtype=np.int64)
+    if len(job_ids) == 0:
+        return []
+    positions = np.arange(len(job_ids))
+    new_job = np.r_[True, job_ids[1:] != job_ids[:-1]]
+    operation_index = positions - np.maximum.accumulate(np.where(new_job, positions, 0))
+
+    scheduled = np.flatnonzero(start_times >= 0)
+    order = scheduled[np.lexsort((end_times[scheduled], start_times[scheduled], machine_ids[scheduled]))]
+    return [dict(zip(SCHEDULE_FIELDS, values)) for values in zip(job_ids[order].tolist(),
+                                                                 operation_index[order].tolist(),
+                                                                 machine_ids[order].tolist(),
+                                                                 start_times[order].tolist(),
+                                                                 end_times[order].tolist())]
+
+
+def export_schedule(file_path: str, job_ids, machine_ids, start_times, end_times,
+                    instance_name: Optional[str] = None, algorithm: Optional[str] = None) -> None:
+    """
+    Write a schedule for external viewers without matplotlib. The format follows the extension:
+    .json holds the instance name, algorithm, makespan and a list of operations, .csv one row per
+    operation with the columns of SCHEDULE_FIELDS.
+    """
+    rows = schedule_rows(job_ids, machine_ids, start_times, end_times)
+    extension = os.path.splitext(file_path)[1].lower().lstrip(".")
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown schedule format: {extension}. Available formats: {', '.join(EXPORT_FORMATS)}")
+
+    folder = os.path.dirname(file_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(file_path, mode='w', newline='') as file:
+        if extension == "json":
+            json.dump({'instance': instance_name,
+                       'algorithm': algorithm,
+                       'makespan': max((row['End'] for row in rows), default=0),
+                       'operations': rows}, file)
+        else:
+            writer = csv.DictWriter(file, fieldnames=SCHEDULE_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
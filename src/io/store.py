@@ -0,0 +1,198 @@
+import argparse
+import hashlib
+import json
+import os
+import struct
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+from src.common.array_shop import ArrayJobShop
+
+STORE_MAGIC = b"JSSPSTR1"
+STORE_VERSION = 1
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'instances.store')
+
+# Layout of a store file (all integers little endian):
+#
+#     8 bytes   magic "JSSPSTR1"
+#     8 bytes   uint64 length of the JSON header in bytes
+#     n bytes   JSON header, padded with spaces to a multiple of 8 bytes
+#     int32[nr_of_operations]    machine ids of all instances
+#     int32[nr_of_operations]    processing times of all instances
+#     int32[nr_of_job_offsets]   job offsets of all instances (relative to the instance)
+#
+# The header maps every instance name to its entry from instances.json plus the
+# position of its slices in the flat arrays and the mtime/sha1 of its source file.
+
+
+def file_sha1(file_path: str) -> str:
+    with open(file_path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def compile_store(json_instances: List[Dict], store_path: str = DEFAULT_STORE_PATH) -> None:
+    """Parse every instance once and pack them into a single binary store file."""
+    write_store([(instance["name"],
+                  {"entry": instance, "mtime": os.path.getmtime(instance["path"]), "sha1": file_sha1(instance["path"])},
+                  ArrayJobShop.from_file(instance["path"]))
+                 for instance in json_instances], store_path)
+
+
+def write_store(instances: Iterable[Tuple[str, Dict, ArrayJobShop]], store_path: str) -> None:
+    """
+    Pack (name, header fields, ArrayJobShop) triples into a store file. The header fields hold the
+    catalog entry ("entry") and, for instances compiled from files, the mtime and sha1 of the source.
+    Instances that do not come from instances.json (e.g. generated ones) can be written directly.
+    """
+    header = {"version": STORE_VERSION, "instances": {}}
+    machine_ids, processing_times, job_offsets = [], [], []
+    operation_offset, job_offset_offset = 0, 0
+
+    for name, fields, array_shop in instances:
+        header["instances"][name] = dict(fields,
+                                         nr_of_machines=array_shop.nr_of_machines,
+                                         operation_offset=operation_offset,
+                                         nr_of_operations=array_shop.nr_of_operations,
+                                         job_offset_offset=job_offset_offset,
+                                         nr_of_job_offsets=len(array_shop.job_offsets))
+        machine_ids.append(array_shop.machine_ids)
+        processing_times.append(array_shop.processing_times)
+        job_offsets.append(array_shop.job_offsets)
+        operation_offset += array_shop.nr_of_operations
+        job_offset_offset += len(array_shop.job_offsets)
+
+    header["nr_of_operations"] = operation_offset
+    header["nr_of_job_offsets"] = job_offset_offset
+    header_bytes = json.dumps(header).encode('utf-8')
+    header_bytes += b" " * (-len(header_bytes) % 8)
+
+    # Write to a temporary file first so readers never see a half written store
+    tmp_path = f"{store_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(STORE_MAGIC)
+        f.write(struct.pack('<Q', len(header_bytes)))
+        f.write(header_bytes)
+        for arrays in (machine_ids, processing_times, job_offsets):
+            if arrays:
+                f.write(np.concatenate(arrays).astype('<i4').tobytes())
+    os.replace(tmp_path, store_path)
+
+
+class InstanceStore:
+    """
+    Read-only, memory-mapped view of a compiled instance store. Opening an instance
+    returns an ArrayJobShop whose machine id, processing time and job offset arrays are
+    read-only views into the mapped file, so no instance data is parsed or copied
+    (ArrayJobShop only copies arrays the caller can still write to).
+    """
+
+    def __init__(self, store_path: str = DEFAULT_STORE_PATH):
+        self.store_path = store_path
+        with open(store_path, 'rb') as f:
+            if f.read(8) != STORE_MAGIC:
+                raise ValueError(f"{store_path} is not an instance store.")
+            header_length = struct.unpack('<Q', f.read(8))[0]
+            self.header = json.loads(f.read(header_length))
+
+        if self.header["version"] != STORE_VERSION:
+            raise ValueError(f"{store_path} has version {self.header['version']}, expected {STORE_VERSION}.")
+
+        data_offset = 16 + header_length
+        nr_of_operations = self.header["nr_of_operations"]
+        nr_of_job_offsets = self.header["nr_of_job_offsets"]
+        if nr_of_operations + nr_of_job_offsets > 0:
+            data = np.memmap(store_path, dtype='<i4', mode='r', offset=data_offset,
+                             shape=(2 * nr_of_operations + nr_of_job_offsets,))
+        else:
+            data = np.zeros(0, dtype='<i4')
+        self.machine_ids = data[:nr_of_operations]
+        self.processing_times = data[nr_of_operations:2 * nr_of_operations]
+        self.job_offsets = data[2 * nr_of_operations:]
+
+    @classmethod
+    def open_store(cls, json_instances: List[Dict], store_path: str = DEFAULT_STORE_PATH) -> "InstanceStore":
+        """Open the store, (re)compiling it first if it is missing or out of date."""
+        if not os.path.isfile(store_path):
+            compile_store(json_instances, store_path)
+            return cls(store_path)
+
+        store = cls(store_path)
+        if store.is_stale(json_instances):
+            compile_store(json_instances, store_path)
+            store = cls(store_path)
+        return store
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.header["instances"])
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.header["instances"]
+
+    def is_stale(self, json_instances: List[Dict]) -> bool:
+        """
+        A store is stale if the set of instances or their catalog entries changed, or if
+        a source file changed. Files with a new mtime are hashed, so touching a file
+        without changing it does not trigger a rebuild.
+        """
+        stored = self.header["instances"]
+        if set(stored) != {instance["name"] for instance in json_instances}:
+            return True
+
+        for instance in json_instances:
+            stored_instance = stored[instance["name"]]
+            if stored_instance["entry"] != instance:
+                return True
+            if not os.path.isfile(instance["path"]):
+                return True
+            if os.path.getmtime(instance["path"]) != stored_instance["mtime"]:
+                if file_sha1(instance["path"]) != stored_instance["sha1"]:
+                    return True
+        return False
+
+    def get_entry(self, name: str) -> Dict:
+        """Return the instances.json entry of an instance."""
+        return self.header["instances"][name]["entry"]
+
+    def open(self, name: str) -> ArrayJobShop:
+        if name not in self.header["instances"]:
+            raise KeyError(f"Instance '{name}' not found in {self.store_path}.")
+
+        stored = self.header["instances"][name]
+        operations = slice(stored["operation_offset"], stored["operation_offset"] + stored["nr_of_operations"])
+        job_offsets = slice(stored["job_offset_offset"], stored["job_offset_offset"] + stored["nr_of_job_offsets"])
+        entry = stored["entry"]
+        bounds = entry.get("bounds") or {}
+        return ArrayJobShop(self.machine_ids[operations],
+                            self.processing_times[operations],
+                            self.job_offsets[job_offsets],
+                            stored["nr_of_machines"],
+                            name=name,
+                            optimum=entry.get("optimum"),
+                            info=entry.get("info"),
+                            author=entry.get("author"),
+                            upper_bound=bounds.get("upper"),
+                            lower_bound=bounds.get("lower"),
+                            file_path=entry.get("path"))
+
+
+if __name__ == "__main__":
+    from src.io.catalog import get_all_instances
+
+    parser = argparse.ArgumentParser(description='Compile all instances of instances.json into a binary store')
+    parser.add_argument('--store', '-s', type=str, default=DEFAULT_STORE_PATH, help='Path of the store file')
+    parser.add_argument('--force', '-f', action='store_true', default=False, help='Rebuild even if up to date')
+    args = parser.parse_args()
+
+    json_instances = get_all_instances()
+    if args.force:
+        compile_store(json_instances, args.store)
+    store = InstanceStore.open_store(json_instances, args.store)
+    print(f"Store {os.path.normpath(args.store)}: {len(store.names)} instances, "
+          f"{store.header['nr_of_operations']} operations, {os.path.getsize(args.store) / 1024:.1f} KiB")
+    # Opening must not copy: the arrays of every instance are views into the mapped file
+    for name in store.names:
+        instance = store.open(name)
+        assert np.shares_memory(instance.machine_ids, store.machine_ids), f"{name}: machine ids were copied"
+        assert np.shares_memory(instance.processing_times, store.processing_times), f"{name}: processing times were copied"
+        assert np.shares_memory(instance.job_offsets, store.job_offsets), f"{name}: job offsets were copied"
+    print(f"Opened all {len(store.names)} instances as views into the mapped file")
@@ -0,0 +1,78 @@
+import argparse
+import time
+import tracemalloc
+from src.io.catalog import get_all_instances, get_jobshop_instance
+from src.common.array_shop import ArrayJobShop
+from src.common.array_dispatcher import ArrayDispatcher
+from src.common.event_dispatcher import EventDispatcher
+
+
+def get_largest_instance_per_author(authors):
+    """Return the name of the largest instance (jobs * machines) of each author."""
+    json_instances = get_all_instances()
+    names = []
+    for author in authors:
+        candidates = [inst for inst in json_instances if inst["author"] == author]
+        names.append(max(candidates, key=lambda inst: inst["jobs"] * inst["machines"])["name"])
+    return names
+
+
+def measure_memory(factory):
+    """Return (object, peak bytes allocated while building it)."""
+    tracemalloc.start()
+    obj = factory()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, peak
+
+
+def best_time(function, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def compare(instance_name: str, repeats: int = 3) -> None:
+    job_shop = get_jobshop_instance(instance_name, use_cache=False)
+    file_path = job_shop.file_path
+
+    job_shop, object_bytes = measure_memory(lambda: get_jobshop_instance(instance_name, use_cache=False))
+    array_shop, array_bytes = measure_memory(lambda: ArrayJobShop.from_file(file_path, name=instance_name))
+
+    object_load = best_time(lambda: get_jobshop_instance(instance_name, use_cache=False), repeats)
+    array_load = best_time(lambda: ArrayJobShop.from_file(file_path, name=instance_name), repeats)
+
+    def object_dispatch():
+        job_shop.reset()
+        EventDispatcher(job_shop).mwkr()
+
+    array_dispatcher = ArrayDispatcher(array_shop)
+    object_dispatch_time = best_time(object_dispatch, repeats)
+    array_dispatch_time = best_time(array_dispatcher.mwkr, repeats)
+    object_verify = best_time(job_shop.verify_schedule, repeats)
+    array_verify = best_time(lambda: array_shop.verify_schedule(array_dispatcher.state), repeats)
+
+    print(f"Instance {instance_name} ({array_shop.nr_of_jobs}x{array_shop.nr_of_machines}, "
+          f"{array_shop.nr_of_operations} operations)")
+    print(f"  {'':<22}{'Objects':>12}{'Arrays':>12}{'Ratio':>8}")
+    for label, object_value, array_value in [
+            ("Peak memory (KiB)", object_bytes / 1024, array_bytes / 1024),
+            ("Load (ms)", object_load * 1e3, array_load * 1e3),
+            ("MWKR dispatch (ms)", object_dispatch_time * 1e3, array_dispatch_time * 1e3),
+            ("Verify (ms)", object_verify * 1e3, array_verify * 1e3)]:
+        print(f"  {label:<22}{object_value:>12.2f}{array_value:>12.2f}{object_value / array_value:>7.1f}x")
+    print(f"  Operation arrays use {array_shop.nbytes / 1024:.2f} KiB, a schedule state {array_dispatcher.state.nbytes / 1024:.2f} KiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Memory and speed of the object model vs. the array model')
+    parser.add_argument('--instances', '-i', nargs='*', default=None,
+                        help='Instance names. Default is the largest Taillard and Demirkol instance.')
+    parser.add_argument('--repeats', '-r', type=int, default=3, help='Repetitions, the fastest one is reported')
+    args = parser.parse_args()
+
+    for name in args.instances or get_largest_instance_per_author(["Taillard", "Demirkol"]):
+        compare(name, repeats=args.repeats)
@@ -0,0 +1,46 @@
+import argparse
+import time
+from src.common.bounds import BOUND_NAMES, compute_bounds
+from src.io.catalog import get_all_instances, get_nested
+from src.io.store import InstanceStore
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Compute lower bounds of all instances and cross-check them with instances.json')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Print the bounds of every instance')
+    args = parser.parse_args()
+
+    json_instances = get_all_instances()
+    store = InstanceStore.open_store(json_instances)
+    instances = [store.open(entry['name']) for entry in json_instances]
+
+    start = time.perf_counter()
+    bounds = compute_bounds(instances)
+    seconds = time.perf_counter() - start
+    print(f"Bounds of {len(instances)} instances in {seconds:.2f}s")
+
+    invalid, tight, at_catalog, without_reference = [], 0, 0, 0
+    if args.verbose:
+        print(f"{'Instance':<10}" + "".join(f"{name:>12}" for name in BOUND_NAMES) + f"{'Lower':>8}{'Catalog':>9}{'Optimum':>9}")
+    for entry, row in zip(json_instances, bounds):
+        optimum = entry.get("optimum")
+        catalog_lower = get_nested(entry, ["bounds", "lower"])
+        catalog_upper = get_nested(entry, ["bounds", "upper"])
+        best_known = optimum if optimum is not None else catalog_upper
+        if best_known is not None and row["lower"] > best_known:
+            invalid.append(entry['name'])
+        if optimum is not None and row["lower"] == optimum:
+            tight += 1
+        if catalog_lower is not None and row["lower"] >= catalog_lower:
+            at_catalog += 1
+        if optimum is None and catalog_lower is None:
+            without_reference += 1
+        if args.verbose:
+            print(f"{entry['name']:<10}" + "".join(f"{row[name]:>12}" for name in BOUND_NAMES)
+                  + f"{row['lower']:>8}{str(catalog_lower):>9}{str(optimum):>9}")
+
+    print(f"Bounds above the optimum or catalog upper bound: {invalid or 'none'}")
+    print(f"Computed bound equals the optimum: {tight} of {sum(entry.get('optimum') is not None for entry in json_instances)}")
+    print(f"Computed bound reaches the catalog lower bound: {at_catalog} of "
+          f"{sum(get_nested(entry, ['bounds', 'lower']) is not None for entry in json_instances)}")
+    print(f"Instances whose only reference is the computed bound: {without_reference}")
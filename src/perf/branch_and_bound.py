@@ -0,0 +1,26 @@
+import argparse
+from src.common.array_shop import ArrayJobShop
+from src.io.catalog import get_jobshop_instance
+from src.solvers.branch_and_bound import BranchAndBound
+
+SMALL_INSTANCES = (["ft06"] + [f"la{i:02d}" for i in range(1, 21)] + ["abz05", "abz06"]
+                   + [f"orb{i:02d}" for i in range(1, 11)])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Branch and bound on the small instances')
+    parser.add_argument('--instances', '-i', nargs='*', default=SMALL_INSTANCES, help='Instance names')
+    parser.add_argument('--time_limit', '-t', type=float, default=5.0, help='Time limit per instance in seconds')
+    args = parser.parse_args()
+
+    print(f"{'Instance':<10}{'Optimum':>8}{'Initial':>8}{'Best':>8}{'LB':>8}{'Proven':>8}{'Nodes':>10}{'Nodes/s':>10}{'Seconds':>9}")
+    proven = 0
+    for name in args.instances:
+        array_shop = ArrayJobShop.from_job_shop(get_jobshop_instance(name))
+        result = BranchAndBound(array_shop).solve(time_limit=args.time_limit)
+        assert array_shop.verify_schedule(result.best_state) and result.best_state.makespan == result.best_makespan
+        proven += result.optimal
+        print(f"{name:<10}{str(array_shop.optimum):>8}{result.initial_upper_bound:>8}{result.best_makespan:>8}"
+              f"{result.lower_bound:>8}{str(result.optimal):>8}{result.nodes:>10}{result.nodes_per_second:>10,.0f}"
+              f"{result.seconds:>9.2f}")
+    print(f"Proven optimal: {proven} of {len(args.instances)}")
@@ -0,0 +1,62 @@
+import argparse
+import time
+import numpy as np
+from src.common.array_shop import ArrayJobShop
+from src.common.decoder import decode, random_sequences, sequence_from_state
+from src.common.dispatcher import Dispatcher
+from src.common.schedule_state import ScheduleState
+from src.io.catalog import get_all_instances, get_jobshop_instance
+
+
+def validate(instance_name: str, batch_size: int, checked_rows: int, seed: int) -> bool:
+    """
+    Decode a batch of random sequences in both modes and check the schedules with
+    JobShop.verify_schedule (a few rows) and ArrayJobShop.verify_schedule (all rows).
+    Also check that decoding the sequence of a mwkr schedule reproduces its makespan.
+    """
+    job_shop = get_jobshop_instance(instance_name)
+    mwkr_makespan = Dispatcher(job_shop).mwkr()
+    mwkr_state = ScheduleState.from_job_shop(ArrayJobShop.from_job_shop(job_shop), job_shop)
+    array_shop = mwkr_state.instance
+
+    sequences = random_sequences(array_shop, batch_size, np.random.default_rng(seed))
+    valid = True
+    for mode in ("semi-active", "active"):
+        start_times, makespans = decode(array_shop, sequences, mode)
+        for row in range(batch_size):
+            state = ScheduleState.from_start_times(array_shop, start_times[row])
+            valid &= state.makespan == makespans[row] and array_shop.verify_schedule(state)
+            if row < checked_rows:
+                valid &= array_shop.to_job_shop(state).verify_schedule()
+
+    _, makespans = decode(array_shop, sequence_from_state(array_shop, mwkr_state)[None, :], "semi-active")
+    valid &= int(makespans[0]) == mwkr_makespan
+    return bool(valid)
+
+
+def benchmark(instance_name: str, batch_size: int, seed: int) -> None:
+    array_shop = ArrayJobShop.from_job_shop(get_jobshop_instance(instance_name))
+    sequences = random_sequences(array_shop, batch_size, np.random.default_rng(seed))
+    print(f"Instance {instance_name} ({array_shop.nr_of_jobs}x{array_shop.nr_of_machines}), batch of {batch_size}")
+    for mode in ("semi-active", "active"):
+        start = time.perf_counter()
+        _, makespans = decode(array_shop, sequences, mode)
+        seconds = time.perf_counter() - start
+        print(f"  {mode:<12} {batch_size / seconds:>10,.0f} schedules/s, best {makespans.min()}, mean {makespans.mean():.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Validate and time the batched schedule decoders')
+    parser.add_argument('--instances', '-i', nargs='*', default=["ft06", "ta01", "ta41", "ta71"], help='Instances to time')
+    parser.add_argument('--validate', '-v', action='store_true', help='Validate the decoders on all instances')
+    parser.add_argument('--batch_size', '-b', type=int, default=256, help='Sequences decoded at once')
+    parser.add_argument('--seed', '-s', type=int, default=0, help='Seed')
+    args = parser.parse_args()
+
+    if args.validate:
+        failed = [entry['name'] for entry in get_all_instances()
+                  if not validate(entry['name'], batch_size=8, checked_rows=2, seed=args.seed)]
+        print(f"Decoded schedules of {len(get_all_instances())} instances verified, failed: {failed or 'none'}")
+
+    for name in args.instances:
+        benchmark(name, args.batch_size, args.seed)
@@ -0,0 +1,53 @@
+import argparse
+import time
+from src.io.catalog import get_all_instances, get_jobshop_instance
+from src.common.dispatcher import Dispatcher
+from src.common.event_dispatcher import EventDispatcher
+
+RULES = ["fifo", "lifo", "mwkr", "lwkr"]
+
+
+def get_largest_instances(count: int):
+    """Return the names of the `count` largest instances (jobs * machines) in instances.json."""
+    json_instances = get_all_instances()
+    json_instances.sort(key=lambda inst: inst["jobs"] * inst["machines"], reverse=True)
+    return [inst["name"] for inst in json_instances[:count]]
+
+
+def run_rule(dispatcher_class, job_shop, rule: str):
+    """Dispatch `rule` on a fresh copy of the instance. Returns (makespan, seconds, start_times)."""
+    job_shop.reset()
+    dispatcher = dispatcher_class(job_shop)
+    start = time.perf_counter()
+    makespan = getattr(dispatcher, rule)()
+    elapsed = time.perf_counter() - start
+    start_times = [op.start_time for job in job_shop.jobs for op in job.operations]
+    return makespan, elapsed, start_times
+
+
+def compare(instance_names, rules=RULES, repeats=3):
+    print(f"{'Instance':<10}{'Rule':<6}{'Ops':>7}{'Scan ops/s':>14}{'Event ops/s':>14}{'Speedup':>9}  Same schedule")
+    for name in instance_names:
+        job_shop = get_jobshop_instance(name)
+        nr_of_operations = sum(job.nr_of_operations for job in job_shop.jobs)
+        for rule in rules:
+            scan_times, event_times = [], []
+            for _ in range(repeats):
+                scan_makespan, scan_time, scan_starts = run_rule(Dispatcher, job_shop, rule)
+                event_makespan, event_time, event_starts = run_rule(EventDispatcher, job_shop, rule)
+                scan_times.append(scan_time)
+                event_times.append(event_time)
+            same = scan_makespan == event_makespan and scan_starts == event_starts
+            scan_time, event_time = min(scan_times), min(event_times)
+            print(f"{name:<10}{rule:<6}{nr_of_operations:>7}"
+                  f"{nr_of_operations / scan_time:>14,.0f}{nr_of_operations / event_time:>14,.0f}"
+                  f"{scan_time / event_time:>8.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Throughput of the scan dispatcher vs. the event-driven dispatcher')
+    parser.add_argument('--count', '-c', type=int, default=5, help='Number of largest instances to compare')
+    parser.add_argument('--repeats', '-r', type=int, default=3, help='Repetitions per rule, the fastest one is reported')
+    args = parser.parse_args()
+
+    compare(get_largest_instances(args.count), repeats=args.repeats)
@@ -0,0 +1,75 @@
+import argparse
+import time
+import numpy as np
+from src.common.array_dispatcher import ArrayDispatcher
+from src.common.environment import JOB_FEATURES, VectorJobShopEnv
+from src.io.catalog import get_all_instances
+from src.io.store import InstanceStore
+
+NEXT_PROCESSING_TIME = JOB_FEATURES.index("next_processing_time")
+
+
+def spt_policy(observation) -> np.ndarray:
+    """Shortest next processing time, ties to the lowest job index like ArrayDispatcher."""
+    scores = np.where(observation["action_mask"], observation["jobs"][:, :, NEXT_PROCESSING_TIME], np.inf)
+    return scores.argmin(axis=1)
+
+
+def random_policy(observation, rng) -> np.ndarray:
+    keys = rng.random(observation["action_mask"].shape)
+    keys[~observation["action_mask"]] = -1
+    return keys.argmax(axis=1)
+
+
+def check_spt(instances) -> bool:
+    """One SPT episode per instance has to end with the semi-active SPT makespan of ArrayDispatcher."""
+    same_count = 0
+    for instance in instances:
+        env = VectorJobShopEnv([instance], nr_of_envs=1, seed=0, normalize=False)
+        observation, _ = env.reset()
+        total_reward = 0.0
+        for _ in range(instance.nr_of_operations - 1):
+            observation, reward, _, _, _ = env.step(spt_policy(observation))
+            total_reward += reward[0]
+        # Before the last step only the last operation is still unscheduled
+        start_times = env.schedule_state(0).start_times
+        _, reward, terminated, _, info = env.step(spt_policy(observation))
+        total_reward += reward[0]
+        dispatcher = ArrayDispatcher(instance)
+        makespan = dispatcher.dispatch("spt")
+        scheduled = start_times >= 0
+        same_count += (bool(terminated[0]) and info["final_makespan"][0] == makespan == -total_reward
+                       and np.array_equal(start_times[scheduled], dispatcher.state.start_times[scheduled]))
+    print(f"SPT episodes equal to ArrayDispatcher SPT: {same_count}/{len(instances)}")
+    return same_count == len(instances)
+
+
+def benchmark(instances, batch_sizes, nr_of_steps: int, seed: int = 0):
+    print(f"\n{len(instances)} instances, up to {max(i.nr_of_jobs for i in instances)} jobs x "
+          f"{max(i.nr_of_machines for i in instances)} machines, random policy")
+    print(f"{'Envs':>6}{'Steps/s':>14}{'Episodes':>10}{'Step (ms)':>11}")
+    rng = np.random.default_rng(seed)
+    for nr_of_envs in batch_sizes:
+        env = VectorJobShopEnv(instances, nr_of_envs, seed=seed)
+        observation, _ = env.reset()
+        start = time.perf_counter()
+        for _ in range(nr_of_steps):
+            observation, _, _, _, _ = env.step(random_policy(observation, rng))
+        seconds = time.perf_counter() - start
+        print(f"{nr_of_envs:>6}{nr_of_envs * nr_of_steps / seconds:>14,.0f}{env.episodes:>10,}"
+              f"{seconds / nr_of_steps * 1000:>11.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Steps per second of the vectorized job shop environment')
+    parser.add_argument('--prefix', '-p', type=str, default='ta', help='Instances whose name starts with the prefix')
+    parser.add_argument('--count', '-c', type=int, default=10, help='Number of instances')
+    parser.add_argument('--envs', '-e', type=int, nargs='+', default=[1, 16, 64, 256, 1024], help='Batch sizes')
+    parser.add_argument('--steps', '-s', type=int, default=2000, help='Steps per batch size')
+    args = parser.parse_args()
+
+    store = InstanceStore.open_store(get_all_instances())
+    names = [name for name in store.names if name.startswith(args.prefix)][:args.count]
+    instances = [store.open(name) for name in names]
+    check_spt(instances)
+    benchmark(instances, args.envs, args.steps)
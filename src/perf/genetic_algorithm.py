@@ -0,0 +1,31 @@
+import argparse
+import os
+from src.common.array_shop import ArrayJobShop
+from src.io.catalog import get_jobshop_instance
+from src.solvers.genetic_algorithm import GeneticAlgorithm
+
+
+def compare(instance_name: str, population_sizes, processes: int, generations: int, seed: int) -> None:
+    array_shop = ArrayJobShop.from_job_shop(get_jobshop_instance(instance_name))
+    print(f"Instance {array_shop.name} ({array_shop.nr_of_jobs}x{array_shop.nr_of_machines}), {generations} generations")
+    for population_size in population_sizes:
+        for nr_of_processes in (1, processes):
+            result = GeneticAlgorithm(array_shop, population_size=population_size,
+                                      processes=nr_of_processes, seed=seed).solve(max_generations=generations)
+            print(f"  population {population_size:>5}, {nr_of_processes:>2} processes: "
+                  f"{result.generations_per_second:>7,.1f} generations/s, "
+                  f"{result.evaluations / result.seconds:>9,.0f} evaluations/s, best {result.best_makespan}")
+        print(f"  best over time: {', '.join(f'{seconds:.2f}s: {makespan}' for seconds, _, makespan in result.trace)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generations per second of the genetic algorithm with and without a process pool')
+    parser.add_argument('--instances', '-i', nargs='*', default=["ta01", "ta41"], help='Instance names')
+    parser.add_argument('--populations', nargs='*', type=int, default=[100, 1000], help='Population sizes')
+    parser.add_argument('--processes', '-p', type=int, default=os.cpu_count(), help='Worker processes')
+    parser.add_argument('--generations', '-g', type=int, default=20, help='Generations per run')
+    parser.add_argument('--seed', '-s', type=int, default=0, help='Seed')
+    args = parser.parse_args()
+
+    for name in args.instances:
+        compare(name, args.populations, args.processes, args.generations, args.seed)
@@ -0,0 +1,63 @@
+import argparse
+import tracemalloc
+import numpy as np
+from src.common.array_dispatcher import ArrayDispatcher
+from src.common.online_dispatcher import OnlineDispatcher, instance_arrivals, taillard_arrivals
+from src.common.rules import available_rules
+from src.io.catalog import get_all_instances
+from src.io.store import InstanceStore
+
+RULES = ["fifo", "spt", "mwkr", "winq", "random"]
+
+
+def check_offline(instance_names, rules=None) -> bool:
+    """With all jobs released at 0 the online schedule has to be the non-delay schedule of ArrayDispatcher."""
+    store = InstanceStore.open_store(get_all_instances())
+    same_count, total = 0, 0
+    for name in instance_names:
+        instance = store.open(name)
+        for rule in rules or available_rules():
+            dispatcher = ArrayDispatcher(instance)
+            dispatcher.dispatch(rule, mode="non-delay")
+            start_times = np.full(instance.nr_of_operations, -1)
+
+            def record(arrival, operation, machine_id, start, end):
+                start_times[instance.job_offsets[arrival] + operation] = start
+
+            OnlineDispatcher(instance.nr_of_machines, rule, on_operation=record).run(instance_arrivals(instance))
+            same_count += np.array_equal(start_times, dispatcher.state.start_times)
+            total += 1
+    print(f"Online schedule equals the offline non-delay schedule: {same_count}/{total}")
+    return same_count == total
+
+
+def simulate(nr_of_jobs: int, nr_of_machines: int, utilization: float, rules=RULES, seed: int = 0,
+             trace_memory: bool = False):
+    # Taillard's processing times are uniform in [1, 99]: every job brings 50 time units per machine
+    mean_interarrival_time = 50 / utilization
+    print(f"\n{nr_of_jobs:,} jobs x {nr_of_machines} machines, Poisson arrivals every {mean_interarrival_time:.1f} "
+          f"time units on average ({100 * utilization:.0f}% utilization)")
+    for rule in rules:
+        # tracemalloc slows the simulation down several times, so the latencies are only meaningful without it
+        if trace_memory:
+            tracemalloc.start()
+        report = OnlineDispatcher(nr_of_machines, rule, seed=seed).run(
+            taillard_arrivals(840612802, 398197754, nr_of_jobs, nr_of_machines, mean_interarrival_time, seed=seed))
+        print(report)
+        if trace_memory:
+            print(f"peak memory {tracemalloc.get_traced_memory()[1] / 1e6:.1f} MB")
+            tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Online dispatching with streaming job arrivals')
+    parser.add_argument('--jobs', '-j', type=int, default=50000, help='Number of arriving jobs')
+    parser.add_argument('--machines', '-m', type=int, default=20, help='Number of machines')
+    parser.add_argument('--utilization', '-u', type=float, default=0.9, help='Expected machine utilization (load)')
+    parser.add_argument('--rules', '-r', nargs='+', default=RULES, help='Dispatching rules to simulate')
+    parser.add_argument('--trace_memory', action='store_true', help='Report the peak memory (slows the simulation down)')
+    parser.add_argument('--count', '-c', type=int, default=20, help='Number of instances for the offline check')
+    args = parser.parse_args()
+
+    check_offline([instance["name"] for instance in get_all_instances()[:args.count]])
+    simulate(args.jobs, args.machines, args.utilization, rules=args.rules, trace_memory=args.trace_memory)
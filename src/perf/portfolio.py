@@ -0,0 +1,42 @@
+import argparse
+from src.io.catalog import get_all_instances
+from src.io.store import InstanceStore
+from src.solvers.portfolio import PORTFOLIO_METHODS, PortfolioSolver
+
+
+def target_of(entry) -> int:
+    """The optimum of a catalog entry, otherwise its lower bound (None if neither is known)."""
+    if entry.get("optimum") is not None:
+        return entry["optimum"]
+    return (entry.get("bounds") or {}).get("lower")
+
+
+def run(names, time_limit: float, methods=PORTFOLIO_METHODS, solo: bool = False, seed: int = 0):
+    store = InstanceStore.open_store(get_all_instances())
+    entries = {entry["name"]: entry for entry in get_all_instances()}
+    for name in names:
+        instance = store.open(name)
+        target = target_of(entries[name])
+        result = PortfolioSolver(instance, methods=methods, target_makespan=target, seed=seed).solve(time_limit)
+        print(f"\n{name} ({instance.nr_of_jobs}x{instance.nr_of_machines}): {result}")
+        print(f"{'Seconds':>9}  {'Method':<8}{'Makespan':>9}")
+        for seconds, method, makespan in result.trace:
+            print(f"{seconds:>9.2f}  {method:<8}{makespan:>9}")
+        report = instance.check_schedule(result.best_state)
+        print(f"Verification: {report.valid}")
+        if solo:
+            # Every method alone with the whole budget, for comparison
+            for method in methods:
+                alone = PortfolioSolver(instance, methods=[method], target_makespan=target, seed=seed).solve(time_limit)
+                print(f"  {method:<8}{alone.best_makespan:>9} in {alone.seconds:.2f}s ({alone.stop_reason})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Portfolio of solvers sharing the best schedule')
+    parser.add_argument('--names', '-n', nargs='+', default=["ft06", "ft10", "la16", "ta01"], help='Instances')
+    parser.add_argument('--time_limit', '-t', type=float, default=10.0, help='Wall-clock budget per instance')
+    parser.add_argument('--methods', '-m', nargs='+', default=list(PORTFOLIO_METHODS), help='Methods of the portfolio')
+    parser.add_argument('--solo', action='store_true', help='Also run every method alone with the same budget')
+    args = parser.parse_args()
+
+    run(args.names, args.time_limit, methods=args.methods, solo=args.solo)
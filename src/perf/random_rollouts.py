@@ -0,0 +1,44 @@
+import argparse
+import random
+import time
+from src.common.array_shop import ArrayJobShop
+from src.common.dispatcher import Dispatcher
+from src.common.rollouts import random_rollouts
+from src.io.catalog import get_jobshop_instance
+
+
+def compare(instance_name: str, loop_rollouts: int, batched_rollouts: int, batch_size: int, seed: int) -> None:
+    job_shop = get_jobshop_instance(instance_name)
+    array_shop = ArrayJobShop.from_job_shop(job_shop)
+
+    random.seed(seed)
+    loop_makespans = []
+    start = time.perf_counter()
+    for _ in range(loop_rollouts):
+        job_shop.reset()
+        loop_makespans.append(Dispatcher(job_shop).random())
+    loop_seconds = time.perf_counter() - start
+
+    result = random_rollouts(array_shop, batched_rollouts, seed=seed, batch_size=batch_size)
+    loop_rate = loop_rollouts / loop_seconds
+
+    print(f"Instance {instance_name} ({array_shop.nr_of_jobs}x{array_shop.nr_of_machines})")
+    print(f"  Dispatcher.random loop: {loop_rollouts} rollouts, {loop_rate:,.0f} rollouts/s, "
+          f"best {min(loop_makespans)}, mean {sum(loop_makespans) / len(loop_makespans):.1f}")
+    print(f"  Batched rollouts:       {result.nr_of_rollouts} rollouts, {result.rollouts_per_second:,.0f} rollouts/s, "
+          f"best {result.best_makespan}, mean {result.makespans.mean():.1f}")
+    print(f"  Speedup: {result.rollouts_per_second / loop_rate:.0f}x, "
+          f"best schedule verified: {array_shop.verify_schedule(result.best_state)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Dispatcher.random loop vs. batched numpy random rollouts')
+    parser.add_argument('--instances', '-i', nargs='*', default=["ft06", "ta01", "ta41", "ta71"], help='Instance names')
+    parser.add_argument('--loop_rollouts', type=int, default=20, help='Rollouts for the Dispatcher.random loop')
+    parser.add_argument('--rollouts', '-r', type=int, default=1024, help='Batched rollouts')
+    parser.add_argument('--batch_size', '-b', type=int, default=256, help='Rollouts simulated at once')
+    parser.add_argument('--seed', '-s', type=int, default=0, help='Seed')
+    args = parser.parse_args()
+
+    for name in args.instances:
+        compare(name, args.loop_rollouts, args.rollouts, args.batch_size, args.seed)
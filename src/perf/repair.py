@@ -0,0 +1,82 @@
+import argparse
+import time
+from src.common.array_dispatcher import ArrayDispatcher
+from src.common.dispatcher import Dispatcher
+from src.common.repair import JobInsertion, MachineBreakdown, ProcessingTimeChange, ScheduleRepair
+from src.taillard import generate_instance
+
+
+def disruptions(repair: ScheduleRepair, freeze_time: int, duration: int):
+    """One disruption of every kind at the freeze time."""
+    nr_of_machines = repair.nr_of_machines
+    unfinished = next(op for op, end_time in enumerate(repair.end_times) if end_time > freeze_time)
+    rush_job = [(machine_id, 50) for machine_id in range(nr_of_machines)]
+    return [MachineBreakdown(0, freeze_time, freeze_time + duration),
+            ProcessingTimeChange(unfinished, repair.processing_times[unfinished] + duration),
+            JobInsertion(rush_job, release_time=freeze_time),
+            JobInsertion(rush_job, release_time=freeze_time, rush=True)]
+
+
+def compare(nr_of_jobs: int, nr_of_machines: int, rule: str, duration: int, freeze_fractions=(0.5, 0.9, 0.99)):
+    instance = generate_instance(840612802, 398197754, nr_of_jobs, nr_of_machines,
+                                 name=f"taillard_{nr_of_jobs}x{nr_of_machines}")
+    start = time.perf_counter()
+    dispatcher = ArrayDispatcher(instance)
+    makespan = dispatcher.dispatch(rule)
+    dispatch_time = time.perf_counter() - start
+    start = time.perf_counter()
+    repair = ScheduleRepair(instance, dispatcher.state)
+    setup_time = time.perf_counter() - start
+    print(f"{instance.name}: {instance.nr_of_operations:,} operations, {rule.upper()} makespan {makespan}")
+    print(f"Full dispatch {dispatch_time * 1000:.0f}ms, ScheduleRepair setup {setup_time * 1000:.0f}ms\n")
+
+    print(f"{'Freeze':>8}  {'Disruption':<52}{'Moved':>9}{'Visited':>9}{'Makespan':>10}{'Time (ms)':>11}")
+    for fraction in freeze_fractions:
+        freeze_time = int(fraction * repair.makespan)
+        for disruption in disruptions(repair, freeze_time, duration):
+            frozen = {op: start_time for op, start_time in enumerate(repair.start_times) if start_time < freeze_time}
+            result = repair.repair(disruption, freeze_time)
+            assert all(repair.start_times[op] == start_time for op, start_time in frozen.items())
+            print(f"{fraction:>8.0%}  {str(disruption):<52}{result.nr_of_moved:>9,}{result.visited:>9,}"
+                  f"{result.makespan:>10}{result.seconds * 1000:>11.2f}")
+
+    report = repair.array_shop.check_schedule(repair.state())
+    print(f"\nAfter {4 * len(freeze_fractions)} repairs: {report}")
+
+
+def check_repeated_repairs(machine_id: int = 0, duration: int = 40) -> None:
+    """
+    Dispatcher.repair keeps its ScheduleRepair: after a breakdown, a later processing time change
+    must not move operations back into the breakdown.
+    """
+    instance = generate_instance(840612802, 398197754, 15, 5, name="taillard_15x5")
+    dispatcher = Dispatcher(instance.to_job_shop())
+    dispatcher.fifo()
+    freeze_time = dispatcher.makespan // 3
+    breakdown = MachineBreakdown(machine_id, freeze_time, freeze_time + duration)
+    dispatcher.repair(breakdown, freeze_time)
+    operations = [operation for job in dispatcher.job_shop.jobs for operation in job.operations]
+    delayed = min((operation for operation in operations
+                   if operation.machine_id == machine_id and operation.start_time >= freeze_time),
+                  key=lambda operation: operation.start_time)
+    dispatcher.repair(ProcessingTimeChange(delayed.id, delayed.processing_time + 1), freeze_time)
+
+    operations = [operation for job in dispatcher.job_shop.jobs for operation in job.operations]
+    overlapping = [operation.id for operation in operations
+                   if operation.machine_id == machine_id and operation.start_time >= freeze_time
+                   and operation.start_time < breakdown.end and operation.end_time > breakdown.start]
+    assert not overlapping, f"Operations {overlapping} overlap the earlier {breakdown}"
+    assert dispatcher.job_shop.check_schedule().valid
+    print(f"Repeated Dispatcher.repair: no operation overlaps the earlier {breakdown}\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Incremental schedule repair vs. dispatching again')
+    parser.add_argument('--jobs', '-j', type=int, default=5000, help='Number of jobs of the generated instance')
+    parser.add_argument('--machines', '-m', type=int, default=100, help='Number of machines')
+    parser.add_argument('--rule', '-r', type=str, default='fifo', help='Rule of the initial schedule')
+    parser.add_argument('--duration', '-d', type=int, default=200, help='Length of the breakdown and of the delay')
+    args = parser.parse_args()
+
+    check_repeated_repairs()
+    compare(args.jobs, args.machines, args.rule, args.duration)
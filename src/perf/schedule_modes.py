@@ -0,0 +1,81 @@
+import argparse
+import fnmatch
+import time
+import numpy as np
+from src.common.array_dispatcher import SCHEDULE_MODES, ArrayDispatcher
+from src.common.array_shop import ArrayJobShop
+from src.common.rules import available_rules
+from src.common.schedule_state import ScheduleState
+from src.io.catalog import get_all_instances
+from src.io.store import InstanceStore
+
+
+def can_left_shift(instance: ArrayJobShop, state: ScheduleState) -> bool:
+    """
+    Check by a linear scan over every machine whether some operation fits into an idle gap
+    in front of it after its job predecessor has finished, i.e. whether the schedule is not active.
+    """
+    start_times = state.start_times.astype(np.int64)
+    processing_times = instance.processing_times.astype(np.int64)
+    end_times = start_times + processing_times
+    offsets = instance.job_offsets
+    job_ready = np.zeros_like(start_times)
+    first_operation = np.zeros(instance.nr_of_operations, dtype=bool)
+    first_operation[offsets[:-1][offsets[:-1] < offsets[1:]]] = True
+    job_ready[~first_operation] = end_times[np.flatnonzero(~first_operation) - 1]
+
+    machine_ids = instance.machine_ids
+    order = np.lexsort((end_times, start_times, machine_ids))
+    gaps = []
+    previous_machine, previous_end = -1, 0
+    for op in order.tolist():
+        if machine_ids[op] != previous_machine:
+            gaps, previous_machine, previous_end = [], machine_ids[op], 0
+        for gap_start, gap_end in gaps:
+            if max(gap_start, job_ready[op]) + processing_times[op] <= gap_end and processing_times[op] > 0:
+                return True
+        if start_times[op] > previous_end:
+            gaps.append((previous_end, int(start_times[op])))
+        previous_end = max(previous_end, int(end_times[op]))
+    return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Compare the semi-active, active and non-delay schedule modes of all rules')
+    parser.add_argument('--names', '-n', nargs='*', default=["ta*"], help='Glob patterns of the instances to compare')
+    parser.add_argument('--validate', '-v', action='store_true',
+                        help='Verify every schedule and check that active and non-delay schedules cannot be left-shifted')
+    parser.add_argument('--seed', '-s', type=int, default=0, help='Seed of the random rule')
+    args = parser.parse_args()
+
+    json_instances = [entry for entry in get_all_instances()
+                      if any(fnmatch.fnmatch(entry['name'], pattern) for pattern in args.names)]
+    store = InstanceStore.open_store(get_all_instances())
+    instances = [store.open(entry['name']) for entry in json_instances]
+    rules = available_rules() + ["random"]
+    print(f"{len(instances)} instances, {len(rules)} rules")
+    print(f"{'Rule':<10}" + "".join(f"{mode + ' mean':>18}{'us/op':>8}" for mode in SCHEDULE_MODES))
+
+    totals = {mode: 0 for mode in SCHEDULE_MODES}
+    invalid = []
+    for rule in rules:
+        line = f"{rule:<10}"
+        for mode in SCHEDULE_MODES:
+            makespans, seconds, operations = [], 0.0, 0
+            for instance in instances:
+                dispatcher = ArrayDispatcher(instance)
+                start = time.perf_counter()
+                makespans.append(dispatcher.dispatch(rule, seed=args.seed, mode=mode))
+                seconds += time.perf_counter() - start
+                operations += instance.nr_of_operations
+                if args.validate:
+                    if not instance.verify_schedule(dispatcher.state) or (
+                            mode != "semi-active" and can_left_shift(instance, dispatcher.state)):
+                        invalid.append((instance.name, rule, mode))
+            totals[mode] += sum(makespans)
+            line += f"{np.mean(makespans):>18.1f}{seconds / operations * 1e6:>8.2f}"
+        print(line)
+
+    print("Total makespan: " + ", ".join(f"{mode} {total}" for mode, total in totals.items()))
+    if args.validate:
+        print(f"Invalid or not active schedules: {invalid or 'none'}")
@@ -0,0 +1,39 @@
+import argparse
+import time
+from src.common.array_shop import ArrayJobShop
+from src.common.dispatcher import Dispatcher
+from src.io.catalog import get_jobshop_instance
+from src.solvers.shifting_bottleneck import ShiftingBottleneck
+from src.sweep import gap_percent
+
+
+def compare(instance_name: str, time_limit: float) -> None:
+    job_shop = get_jobshop_instance(instance_name)
+    reference = job_shop.optimum if job_shop.optimum is not None else job_shop.lower_bound
+
+    start = time.perf_counter()
+    mwkr_makespan = Dispatcher(job_shop).mwkr()
+    mwkr_seconds = time.perf_counter() - start
+
+    array_shop = ArrayJobShop.from_job_shop(job_shop)
+    result = ShiftingBottleneck(array_shop).solve(time_limit=time_limit)
+    assert array_shop.verify_schedule(result.best_state)
+
+    mwkr_gap = gap_percent(mwkr_makespan, reference)
+    sb_gap = gap_percent(result.best_makespan, reference)
+    extra_seconds = max(result.seconds - mwkr_seconds, 1e-9)
+    print(f"{instance_name:<8}{reference:>8}{mwkr_makespan:>8}{mwkr_gap:>8.2f}{mwkr_seconds:>9.3f}"
+          f"{result.best_makespan:>8}{sb_gap:>8.2f}{result.seconds:>9.3f}{(mwkr_gap - sb_gap) / extra_seconds:>12.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Shifting bottleneck vs. Dispatcher.mwkr: makespan, gap and time')
+    parser.add_argument('--instances', '-i', nargs='*',
+                        default=[f"ta{i}" for i in range(31, 41)] + [f"ta{i}" for i in range(71, 81)],
+                        help='Instance names (default: the 50x15 and 100x20 Taillard instances)')
+    parser.add_argument('--time_limit', '-t', type=float, default=30.0, help='Time limit of the shifting bottleneck')
+    args = parser.parse_args()
+
+    print(f"{'Instance':<8}{'Ref':>8}{'MWKR':>8}{'Gap %':>8}{'Time s':>9}{'SB':>8}{'Gap %':>8}{'Time s':>9}{'Gap pts/s':>12}")
+    for name in args.instances:
+        compare(name, args.time_limit)
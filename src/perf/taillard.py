@@ -0,0 +1,71 @@
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+from src.common.array_shop import ArrayJobShop
+from src.io.store import InstanceStore
+from src.taillard import (TAILLARD_SEEDS, generate_arrays, generate_job_list, taillard_instance,
+                          write_instance_file, write_instances_store)
+
+TAILLARD_FOLDER = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'taillard')
+
+
+def verify_benchmarks() -> bool:
+    """Regenerate ta01-ta80 with the scalar and the vectorized generator and compare them to data/taillard."""
+    print(f"{'Instance':<10}{'Size':>9}{'Scalar':>8}{'Vector':>8}")
+    all_equal = True
+    for name, (nr_of_jobs, nr_of_machines, time_seed, machine_seed) in TAILLARD_SEEDS.items():
+        reference = ArrayJobShop.from_file(os.path.join(TAILLARD_FOLDER, f"{name}.txt"))
+        scalar = generate_job_list(time_seed, machine_seed, nr_of_jobs, nr_of_machines) == reference.to_job_list()
+        instance = taillard_instance(name)
+        vector = (np.array_equal(instance.machine_ids, reference.machine_ids)
+                  and np.array_equal(instance.processing_times, reference.processing_times))
+        all_equal &= scalar and vector
+        print(f"{name:<10}{f'{nr_of_jobs}x{nr_of_machines}':>9}{str(scalar):>8}{str(vector):>8}")
+    return all_equal
+
+
+def benchmark(nr_of_jobs: int, nr_of_machines: int, time_seed: int = 840612802, machine_seed: int = 398197754):
+    operations = nr_of_jobs * nr_of_machines
+    sample = min(nr_of_jobs, 200)
+    start = time.perf_counter()
+    generate_job_list(time_seed, machine_seed, sample, nr_of_machines)
+    scalar_time = (time.perf_counter() - start) * nr_of_jobs / sample
+
+    start = time.perf_counter()
+    generate_arrays(time_seed, machine_seed, nr_of_jobs, nr_of_machines)
+    vector_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as folder:
+        text_path = os.path.join(folder, "instance.txt")
+        start = time.perf_counter()
+        write_instance_file(text_path, time_seed, machine_seed, nr_of_jobs, nr_of_machines)
+        text_time = time.perf_counter() - start
+        text_bytes = os.path.getsize(text_path)
+
+        store_path = os.path.join(folder, "instance.store")
+        start = time.perf_counter()
+        write_instances_store(store_path, [("instance", time_seed, machine_seed, nr_of_jobs, nr_of_machines)])
+        store_time = time.perf_counter() - start
+        start = time.perf_counter()
+        stored = InstanceStore(store_path).open("instance")
+        load_time = time.perf_counter() - start
+        same = stored.nr_of_operations == operations and np.array_equal(ArrayJobShop.from_file(text_path).machine_ids,
+                                                                         stored.machine_ids)
+
+    print(f"\n{nr_of_jobs}x{nr_of_machines} ({operations:,} operations)")
+    print(f"  scalar generator (estimated) {scalar_time:8.2f}s")
+    print(f"  vectorized generator         {vector_time:8.2f}s  {scalar_time / vector_time:.0f}x")
+    print(f"  streamed to text             {text_time:8.2f}s  {text_bytes / 1e6:.1f} MB")
+    print(f"  written to store             {store_time:8.2f}s  loaded in {load_time * 1000:.1f}ms, same: {same}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify Taillard's generator against ta01-ta80 and time large instances")
+    parser.add_argument('--jobs', '-j', type=int, default=5000, help='Number of jobs of the timed instance')
+    parser.add_argument('--machines', '-m', type=int, default=100, help='Number of machines of the timed instance')
+    args = parser.parse_args()
+
+    print(f"All benchmarks reproduced: {verify_benchmarks()}")
+    benchmark(args.jobs, args.machines)
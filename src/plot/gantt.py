@@ -0,0 +1,83 @@
+from typing import Optional, Sequence
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.patches as mpatches
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba_array
+
+DEFAULT_DPI = 150
+PLOT_FORMATS = ("png", "svg")
+MAX_LABELS = 400 # Job labels drawn at most, on the widest bars
+MAX_LEGEND_JOBS = 30 # Larger instances get no legend
+
+
+def plot_gantt_chart(job_ids: Sequence[int],
+                     machine_ids: Sequence[int],
+                     start_times: Sequence[int],
+                     end_times: Sequence[int],
+                     nr_of_machines: int,
+                     nr_of_jobs: int,
+                     title: str,
+                     file_path: Optional[str] = None,
+                     dpi: int = DEFAULT_DPI,
+                     max_labels: int = MAX_LABELS) -> None:
+    """
+    Plot a Gantt chart from flat per-operation sequences (lists or numpy arrays).
+    Operations with a negative or None start time are treated as unscheduled and skipped.
+
+    All bars are drawn as one PolyCollection. Job labels are only drawn on the max_labels
+    widest bars that are wide enough to hold them, and the legend is left out for more than
+    MAX_LEGEND_JOBS jobs. The plot is saved to file_path if given (the format follows the
+    extension, e.g. .png or .svg, at the given dpi), otherwise it is shown.
+    """
+    start_times = np.array([-1 if time is None else time for time in start_times], dtype=np.int64)
+    end_times = np.array([-1 if time is None else time for time in end_times], dtype=np.int64)
+    scheduled = start_times >= 0
+    job_ids = np.asarray(job_ids, dtype=np.int64)[scheduled]
+    machine_ids = np.asarray(machine_ids, dtype=np.int64)[scheduled]
+    start_times, end_times = start_times[scheduled], end_times[scheduled]
+
+    height = min(12, max(4, 0.35 * nr_of_machines + 2))
+    fig, gnt = plt.subplots(figsize=(12, height))
+
+    # Setting the labels for x-axis and y-axis
+    gnt.set_xlabel('Time')
+    gnt.set_ylabel('Machines')
+
+    # Setting the y-ticks to the number of machines
+    gnt.set_yticks([i + 1 for i in range(nr_of_machines)])
+    gnt.set_yticklabels([f'Machine {i}' for i in range(nr_of_machines)])
+    gnt.set_ylim(0, nr_of_machines + 1)
+
+    # One rectangle per operation, all in one collection
+    bottom, top = machine_ids + 0.5, machine_ids + 1.5
+    vertices = np.stack([np.column_stack((start_times, bottom)), np.column_stack((start_times, top)),
+                         np.column_stack((end_times, top)), np.column_stack((end_times, bottom))], axis=1)
+    colors = to_rgba_array([f'C{i}' for i in range(10)])[job_ids % 10]
+    gnt.add_collection(PolyCollection(vertices, facecolors=colors, edgecolors='black',
+                                      linewidths=0.5 if len(job_ids) > 500 else 1.0))
+    makespan = int(end_times.max(initial=0))
+    gnt.set_xlim(0, max(makespan, 1) * 1.01)
+
+    # Labels only fit on bars that are wide enough compared to the makespan
+    widths = end_times - start_times
+    label_width = makespan * 0.012 * len(str(max(nr_of_jobs - 1, 0)))
+    labeled = np.flatnonzero(widths >= label_width)
+    labeled = labeled[np.argsort(-widths[labeled], kind="stable")[:max_labels]]
+    for index in labeled.tolist():
+        gnt.text((start_times[index] + end_times[index]) / 2, machine_ids[index] + 1,
+                 f"{job_ids[index]}", ha='center', va='center', color='white', fontweight='bold')
+
+    # Adding legend
+    if nr_of_jobs <= MAX_LEGEND_JOBS:
+        handles = [mpatches.Patch(color=f'C{i % 10}', label=f'Job {i}') for i in range(nr_of_jobs)]
+        plt.legend(handles=handles, bbox_to_anchor=(1.01, 1.015), loc='upper left')
+    plt.title(title)
+    plt.grid(True)
+    plt.tight_layout(rect=[0, 0, 0.99, 1])  # Adjust layout to make room for the legend
+
+    if file_path is not None:
+        plt.savefig(file_path, dpi=dpi)
+        plt.close(fig)
+    else:
+        plt.show()
@@ -0,0 +1,87 @@
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import List, Optional
+import numpy as np
+
+
+def _render(job_ids: np.ndarray, machine_ids: np.ndarray, start_times: np.ndarray, end_times: np.ndarray,
+            nr_of_machines: int, nr_of_jobs: int, title: str, file_path: str, dpi: Optional[int]) -> str:
+    """Render one Gantt chart in a worker process. matplotlib is only imported there."""
+    from src.plot.gantt import DEFAULT_DPI, plot_gantt_chart
+    plot_gantt_chart(job_ids=job_ids,
+                     machine_ids=machine_ids,
+                     start_times=start_times,
+                     end_times=end_times,
+                     nr_of_machines=nr_of_machines,
+                     nr_of_jobs=nr_of_jobs,
+                     title=title,
+                     file_path=file_path,
+                     dpi=dpi or DEFAULT_DPI)
+    return file_path
+
+
+class PlotPipeline:
+    """
+    Renders Gantt charts on a background process pool so dispatching never waits for matplotlib.
+
+    submit() serializes a schedule into compact int32 arrays and returns immediately unless
+    max_pending renders are already queued; then it blocks until one of them is done, so the
+    memory held by queued schedules stays bounded. Charts are written by the workers as soon as
+    they are rendered. close(wait=True) blocks until every chart is written and collects failed
+    renders in failed; with wait=False the main process goes on, the pool finishes the queued
+    charts before the interpreter exits and failed renders are printed to stderr.
+    """
+
+    def __init__(self, processes: int = 1, max_pending: int = 8):
+        self.executor = ProcessPoolExecutor(max_workers=processes)
+        self.max_pending = max(1, max_pending)
+        self.pending = deque()
+        self.written: List[str] = []
+        self.failed: List[str] = []
+        self.submitted = 0
+
+    def submit(self, job_ids, machine_ids, start_times, end_times, nr_of_machines: int, nr_of_jobs: int,
+               title: str, file_path: str, dpi: Optional[int] = None) -> None:
+        while len(self.pending) >= self.max_pending:
+            done, _ = wait(self.pending, return_when=FIRST_COMPLETED)
+            self._collect(done)
+        arrays = [np.array([-1 if value is None else value for value in values], dtype=np.int32)
+                  for values in (job_ids, machine_ids, start_times, end_times)]
+        future = self.executor.submit(_render, *arrays, nr_of_machines, nr_of_jobs, title, file_path, dpi)
+        future.file_path = file_path
+        self.pending.append(future)
+        self.submitted += 1
+
+    def _collect(self, done) -> None:
+        for future in done:
+            self.pending.remove(future)
+            if future.exception() is not None:
+                self.failed.append(f"{future.file_path}: {future.exception()}")
+            else:
+                self.written.append(future.result())
+
+    def close(self, wait_for_renders: bool = True) -> float:
+        """Shut the pool down. Returns the seconds spent waiting for the remaining renders."""
+        start = time.perf_counter()
+        if wait_for_renders:
+            done, _ = wait(self.pending)
+            self._collect(done)
+        else:
+            for failure in self.failed:
+                self._print_failure(failure)
+            for future in self.pending:
+                future.add_done_callback(self._report_failure)
+        self.executor.shutdown(wait=wait_for_renders)
+        return time.perf_counter() - start
+
+    def _report_failure(self, future) -> None:
+        if future.exception() is not None:
+            failure = f"{future.file_path}: {future.exception()}"
+            self.failed.append(failure)
+            self._print_failure(failure)
+
+    @staticmethod
+    def _print_failure(failure: str) -> None:
+        print(f"Gantt chart failed: {failure}", file=sys.stderr)
@@ -0,0 +1,262 @@
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+from src.common.array_dispatcher import ArrayDispatcher
+from src.common.array_shop import ArrayJobShop
+from src.common.bounds import jackson_preemptive_bound
+from src.common.schedule_state import ScheduleState
+
+INITIAL_RULES = ("fifo", "lifo", "mwkr", "lwkr", "spt", "lpt", "mopnr", "lrm", "est", "ect")
+
+
+class _SearchStopped(Exception):
+    pass
+
+
+class BranchAndBoundResult:
+    def __init__(self, best_state: ScheduleState, best_makespan: int, initial_upper_bound: int,
+                 lower_bound: int, nodes: int, pruned: int, seconds: float,
+                 trace: List[Tuple[float, int, int]], optimal: bool, stop_reason: str):
+        self.best_state = best_state
+        self.best_makespan = best_makespan
+        self.initial_upper_bound = initial_upper_bound
+        self.lower_bound = lower_bound # bound of the root node, proves the gap if the search stopped early
+        self.nodes = nodes
+        self.pruned = pruned
+        self.seconds = seconds
+        self.trace = trace # (seconds, nodes, makespan) whenever a better schedule was found
+        self.optimal = optimal
+        self.stop_reason = stop_reason
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds > 0 else float('inf')
+
+    @property
+    def gap_percent(self) -> float:
+        return 100.0 * (self.best_makespan - self.lower_bound) / self.lower_bound if self.lower_bound > 0 else 0.0
+
+    def __str__(self):
+        status = "optimal" if self.optimal else f"gap to lower bound {self.lower_bound}: {self.gap_percent:.2f}%"
+        return (f"Branch and bound: {self.initial_upper_bound} -> {self.best_makespan} ({status}), "
+                f"{self.nodes} nodes, {self.pruned} pruned, {self.seconds:.2f}s, "
+                f"{self.nodes_per_second:,.0f} nodes/s ({self.stop_reason})")
+
+
+class BranchAndBound:
+    """
+    Depth-first branch and bound over active schedules.
+
+    Every node is a partial schedule built by Giffler-Thompson: the unscheduled operation
+    with the earliest completion time fixes a machine, and the node branches on which of
+    the operations on that machine that can start before this completion time goes first.
+    All active schedules, and therefore an optimal one, are reachable this way.
+
+    A node is pruned if its lower bound reaches the best makespan found so far. The bound
+    is the maximum of the remaining work of every job and of Jackson's preemptive schedule
+    on every machine, with heads from the partial schedule and tails from the job routings.
+    The initial upper bound is the best schedule of a set of dispatching rules.
+    """
+
+    def __init__(self, instance: ArrayJobShop, initial_rules: Sequence[str] = INITIAL_RULES):
+        self.instance = instance
+        self.initial_rules = initial_rules
+        self.machine_ids = instance.machine_ids.tolist()
+        self.processing_times = instance.processing_times.tolist()
+        self.job_ends = instance.job_offsets[1:].tolist()
+        # tails[op] is the processing time of the operations after op in its job
+        self.tails = [0] * instance.nr_of_operations
+        for job_id in range(instance.nr_of_jobs):
+            total = 0
+            for op in range(self.job_ends[job_id] - 1, instance.job_offsets[job_id] - 1, -1):
+                self.tails[op] = total
+                total += self.processing_times[op]
+
+    def initial_solution(self) -> ScheduleState:
+        """Return the best schedule of the initial dispatching rules."""
+        best_state = None
+        for rule in self.initial_rules:
+            dispatcher = ArrayDispatcher(self.instance)
+            dispatcher.dispatch(rule)
+            if best_state is None or dispatcher.state.makespan < best_state.makespan:
+                best_state = dispatcher.state.copy()
+        return best_state
+
+    def lower_bound(self, next_operation: List[int], job_ready: List[int], machine_ready: List[int]) -> int:
+        p, machine_ids, tails = self.processing_times, self.machine_ids, self.tails
+        heads_by_machine = [[] for _ in machine_ready]
+        times_by_machine = [[] for _ in machine_ready]
+        tails_by_machine = [[] for _ in machine_ready]
+        bound = max(machine_ready, default=0)
+        for job_id, first in enumerate(next_operation):
+            ready = job_ready[job_id]
+            for op in range(first, self.job_ends[job_id]):
+                machine_id = machine_ids[op]
+                head = ready if ready > machine_ready[machine_id] else machine_ready[machine_id]
+                heads_by_machine[machine_id].append(head)
+                times_by_machine[machine_id].append(p[op])
+                tails_by_machine[machine_id].append(tails[op])
+                ready = head + p[op]
+            bound = max(bound, ready)
+        for machine_id in range(len(machine_ready)):
+            if heads_by_machine[machine_id]:
+                bound = max(bound, jackson_preemptive_bound(heads_by_machine[machine_id],
+                                                            times_by_machine[machine_id],
+                                                            tails_by_machine[machine_id]))
+        return bound
+
+    def solve(self, time_limit: Optional[float] = None, max_nodes: Optional[int] = None,
+              initial_state: Optional[ScheduleState] = None,
+              shared_upper_bound: Optional[Callable[[], int]] = None,
+              on_improvement: Optional[Callable[[ScheduleState], None]] = None) -> BranchAndBoundResult:
+        """
+        Search for an optimal schedule. If time_limit seconds or max_nodes nodes are exceeded
+        the best schedule found so far is returned together with the root lower bound.
+        shared_upper_bound is polled during the search for the makespan of a schedule found
+        elsewhere (e.g. by other solvers of a portfolio) and prunes with it. If the search then
+        completes without beating it, that makespan is optimal and returned as lower_bound.
+        on_improvement is called with every new best schedule.
+        """
+        start = time.perf_counter()
+        instance = self.instance
+        best_state = initial_state.copy() if initial_state is not None else self.initial_solution()
+        initial_upper_bound = best_state.makespan
+
+        next_operation = instance.job_offsets[:-1].tolist()
+        job_ready = [0] * instance.nr_of_jobs
+        machine_ready = [0] * instance.nr_of_machines
+        start_times = [-1] * instance.nr_of_operations
+        root_bound = self.lower_bound(next_operation, job_ready, machine_ready)
+
+        self._best_makespan = initial_upper_bound
+        self._upper_bound = initial_upper_bound
+        self._shared_upper_bound = shared_upper_bound
+        self._on_improvement = on_improvement
+        if shared_upper_bound is not None:
+            self._upper_bound = min(self._upper_bound, shared_upper_bound())
+        self._best_start_times = None
+        self._nodes = 0
+        self._pruned = 0
+        self._trace = [(0.0, 0, initial_upper_bound)]
+        self._start = start
+        self._deadline = start + time_limit if time_limit is not None else None
+        self._max_nodes = max_nodes
+        self._root_bound = root_bound
+
+        stop_reason = "search complete"
+        if initial_upper_bound <= root_bound:
+            stop_reason = "initial schedule reaches the lower bound"
+        else:
+            try:
+                self._search(next_operation, job_ready, machine_ready, start_times)
+            except _SearchStopped as stopped:
+                stop_reason = str(stopped)
+
+        if self._best_start_times is not None:
+            best_state = ScheduleState.from_start_times(instance, self._best_start_times)
+        complete = stop_reason in ("search complete", "lower bound reached",
+                                   "initial schedule reaches the lower bound")
+        optimal = complete and self._best_makespan <= self._upper_bound
+        return BranchAndBoundResult(best_state, self._best_makespan, initial_upper_bound,
+                                    self._upper_bound if complete else root_bound,
+                                    self._nodes, self._pruned, time.perf_counter() - start,
+                                    self._trace, optimal, stop_reason)
+
+    def _search(self, next_operation: List[int], job_ready: List[int], machine_ready: List[int],
+                start_times: List[int]) -> None:
+        """
+        Depth-first search with an explicit stack instead of recursion: the depth equals the
+        number of operations, which exceeds Python's recursion limit on large instances.
+        A frame is [children, next child index, critical machine, its ready time, applied child].
+        """
+        p = self.processing_times
+        stack = []
+        frame = self._visit(next_operation, job_ready, machine_ready, start_times, 0)
+        if frame is not None:
+            stack.append(frame)
+        while stack:
+            frame = stack[-1]
+            children, _, critical_machine, machine_time, applied = frame
+            if applied is not None:
+                # Back from the subtree of the previous child: undo it
+                job_id, op, job_time = applied
+                next_operation[job_id] -= 1
+                machine_ready[critical_machine] = machine_time
+                job_ready[job_id] = job_time
+                start_times[op] = -1
+                frame[4] = None
+
+            index = frame[1]
+            while index < len(children) and children[index][0] >= self._upper_bound:
+                self._pruned += 1
+                index += 1
+            if index == len(children):
+                stack.pop()
+                continue
+            frame[1] = index + 1
+
+            _, earliest_start, _, job_id, op = children[index]
+            frame[4] = (job_id, op, job_ready[job_id])
+            start_times[op] = earliest_start
+            job_ready[job_id] = earliest_start + p[op]
+            machine_ready[critical_machine] = earliest_start + p[op]
+            next_operation[job_id] += 1
+
+            child = self._visit(next_operation, job_ready, machine_ready, start_times, len(stack))
+            if child is not None:
+                stack.append(child)
+
+    def _visit(self, next_operation: List[int], job_ready: List[int], machine_ready: List[int],
+               start_times: List[int], depth: int) -> Optional[list]:
+        """Count a node and check the limits; return its search frame, or None for a complete schedule."""
+        self._nodes += 1
+        # Bounding the children of a node of a large instance takes milliseconds, so check every node
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise _SearchStopped("time limit")
+        if self._nodes & 255 == 0 and self._shared_upper_bound is not None:
+            self._upper_bound = min(self._upper_bound, self._shared_upper_bound())
+        if self._max_nodes is not None and self._nodes >= self._max_nodes:
+            raise _SearchStopped("node limit")
+
+        if depth == len(start_times):
+            makespan = max(job_ready)
+            if makespan < self._best_makespan:
+                self._best_makespan = makespan
+                self._upper_bound = min(self._upper_bound, makespan)
+                self._best_start_times = list(start_times)
+                self._trace.append((time.perf_counter() - self._start, self._nodes, makespan))
+                if self._on_improvement is not None:
+                    self._on_improvement(ScheduleState.from_start_times(self.instance, start_times))
+                if makespan <= self._root_bound:
+                    raise _SearchStopped("lower bound reached")
+            return None
+
+        p, machine_ids, tails = self.processing_times, self.machine_ids, self.tails
+        # Giffler-Thompson: the earliest completion time fixes the machine to branch on
+        critical_end, critical_machine = None, None
+        for job_id, op in enumerate(next_operation):
+            if op < self.job_ends[job_id]:
+                machine_id = machine_ids[op]
+                end = max(job_ready[job_id], machine_ready[machine_id]) + p[op]
+                if critical_end is None or end < critical_end:
+                    critical_end, critical_machine = end, machine_id
+
+        # Bound every child first and visit the most promising ones first
+        machine_time = machine_ready[critical_machine]
+        children = []
+        for job_id, op in enumerate(next_operation):
+            if op < self.job_ends[job_id] and machine_ids[op] == critical_machine:
+                earliest_start = max(job_ready[job_id], machine_time)
+                # The second condition keeps the critical operation if it has no processing time
+                if earliest_start < critical_end or earliest_start + p[op] == critical_end:
+                    end = earliest_start + p[op]
+                    job_time = job_ready[job_id]
+                    job_ready[job_id] = end
+                    machine_ready[critical_machine] = end
+                    next_operation[job_id] += 1
+                    bound = self.lower_bound(next_operation, job_ready, machine_ready)
+                    next_operation[job_id] -= 1
+                    machine_ready[critical_machine] = machine_time
+                    job_ready[job_id] = job_time
+                    children.append((bound, earliest_start, -tails[op], job_id, op))
+        children.sort()
+        return [children, 0, critical_machine, machine_time, None]
@@ -0,0 +1,167 @@
+from typing import List, Optional
+import numpy as np
+from src.common.array_shop import ArrayJobShop
+from src.common.schedule_state import ScheduleState
+
+
+class DisjunctiveGraph:
+    """
+    A solution of an ArrayJobShop in the disjunctive graph model: the processing order
+    of the operations on every machine. Job arcs come from the routing of the instance,
+    machine arcs from machine_sequences.
+
+    compute_heads_tails() derives for every operation its head (earliest start time) and
+    its tail (length of the longest path after it until the end of the schedule). An
+    operation is critical if head + processing time + tail equals the makespan.
+    """
+
+    def __init__(self, instance: ArrayJobShop, machine_sequences: List[List[int]]):
+        self.instance = instance
+        self.processing_times = instance.processing_times.tolist()
+        self.machine_ids = instance.machine_ids.tolist()
+        nr_of_operations = instance.nr_of_operations
+
+        offsets = instance.job_offsets.tolist()
+        self.job_pred = [-1] * nr_of_operations
+        self.job_succ = [-1] * nr_of_operations
+        for job_id in range(instance.nr_of_jobs):
+            for op in range(offsets[job_id], offsets[job_id + 1] - 1):
+                self.job_succ[op] = op + 1
+                self.job_pred[op + 1] = op
+
+        self.machine_sequences = [list(sequence) for sequence in machine_sequences]
+        self.machine_pred = [-1] * nr_of_operations
+        self.machine_succ = [-1] * nr_of_operations
+        self.position = [0] * nr_of_operations
+        for machine_id in range(len(self.machine_sequences)):
+            self.update_machine(machine_id)
+
+        self.heads = [0] * nr_of_operations
+        self.tails = [0] * nr_of_operations
+        self.makespan = 0
+
+    @classmethod
+    def from_state(cls, instance: ArrayJobShop, state: ScheduleState) -> "DisjunctiveGraph":
+        """Derive the machine orders from the start times of a (complete) schedule."""
+        order = np.lexsort((np.arange(instance.nr_of_operations), state.start_times, instance.machine_ids))
+        machine_sequences = [[] for _ in range(instance.nr_of_machines)]
+        for op, machine_id in zip(order.tolist(), instance.machine_ids[order].tolist()):
+            machine_sequences[machine_id].append(op)
+        return cls(instance, machine_sequences)
+
+    def copy(self) -> "DisjunctiveGraph":
+        graph = DisjunctiveGraph.__new__(DisjunctiveGraph)
+        graph.__dict__.update(self.__dict__)
+        graph.machine_sequences = [list(sequence) for sequence in self.machine_sequences]
+        graph.machine_pred = list(self.machine_pred)
+        graph.machine_succ = list(self.machine_succ)
+        graph.position = list(self.position)
+        graph.heads = list(self.heads)
+        graph.tails = list(self.tails)
+        return graph
+
+    def update_machine(self, machine_id: int) -> None:
+        """Rebuild the machine arcs of one machine after its sequence changed."""
+        sequence = self.machine_sequences[machine_id]
+        previous = -1
+        for index, op in enumerate(sequence):
+            self.position[op] = index
+            self.machine_pred[op] = previous
+            if previous != -1:
+                self.machine_succ[previous] = op
+            previous = op
+        if previous != -1:
+            self.machine_succ[previous] = -1
+
+    def set_machine_sequence(self, machine_id: int, sequence: List[int]) -> None:
+        """Replace the sequence of one machine; an empty sequence removes its arcs (partial selection)."""
+        for op in self.machine_sequences[machine_id]:
+            self.machine_pred[op] = -1
+            self.machine_succ[op] = -1
+        self.machine_sequences[machine_id] = list(sequence)
+        self.update_machine(machine_id)
+
+    def topological_order(self) -> Optional[List[int]]:
+        """Return the operations in topological order or None if the selection contains a cycle."""
+        job_pred, machine_pred = self.job_pred, self.machine_pred
+        job_succ, machine_succ = self.job_succ, self.machine_succ
+        in_degree = [(job_pred[op] != -1) + (machine_pred[op] != -1) for op in range(len(job_pred))]
+        stack = [op for op, degree in enumerate(in_degree) if degree == 0]
+        order = []
+        while stack:
+            op = stack.pop()
+            order.append(op)
+            for successor in (job_succ[op], machine_succ[op]):
+                if successor != -1:
+                    in_degree[successor] -= 1
+                    if in_degree[successor] == 0:
+                        stack.append(successor)
+        return order if len(order) == len(job_pred) else None
+
+    def compute_heads_tails(self) -> bool:
+        """Compute heads, tails and makespan. Returns False if the selection contains a cycle."""
+        order = self.topological_order()
+        if order is None:
+            return False
+
+        p = self.processing_times
+        job_pred, machine_pred = self.job_pred, self.machine_pred
+        job_succ, machine_succ = self.job_succ, self.machine_succ
+        heads, tails = self.heads, self.tails
+
+        for op in order:
+            head = 0
+            pred = job_pred[op]
+            if pred != -1:
+                head = heads[pred] + p[pred]
+            pred = machine_pred[op]
+            if pred != -1 and heads[pred] + p[pred] > head:
+                head = heads[pred] + p[pred]
+            heads[op] = head
+
+        makespan = 0
+        for op in reversed(order):
+            tail = 0
+            succ = job_succ[op]
+            if succ != -1:
+                tail = tails[succ] + p[succ]
+            succ = machine_succ[op]
+            if succ != -1 and tails[succ] + p[succ] > tail:
+                tail = tails[succ] + p[succ]
+            tails[op] = tail
+            if heads[op] + p[op] + tail > makespan:
+                makespan = heads[op] + p[op] + tail
+        self.makespan = makespan
+        return True
+
+    def critical_path(self) -> List[int]:
+        """Return one critical path from a source to a sink operation."""
+        p, heads, tails = self.processing_times, self.heads, self.tails
+        op = next(op for op in range(len(p)) if heads[op] + p[op] == self.makespan and tails[op] == 0)
+        path = [op]
+        while True:
+            # Prefer machine predecessors, that keeps the critical blocks as long as possible
+            machine_pred, job_pred = self.machine_pred[op], self.job_pred[op]
+            if machine_pred != -1 and heads[machine_pred] + p[machine_pred] == heads[op]:
+                op = machine_pred
+            elif job_pred != -1 and heads[job_pred] + p[job_pred] == heads[op]:
+                op = job_pred
+            else:
+                break
+            path.append(op)
+        path.reverse()
+        return path
+
+    def critical_blocks(self) -> List[List[int]]:
+        """Split a critical path into blocks: maximal runs of consecutive operations on one machine."""
+        blocks = []
+        for op in self.critical_path():
+            if blocks and self.machine_succ[blocks[-1][-1]] == op:
+                blocks[-1].append(op)
+            else:
+                blocks.append([op])
+        return blocks
+
+    def to_state(self) -> ScheduleState:
+        """Return the semi-active schedule of this selection (every operation starts at its head)."""
+        return ScheduleState.from_start_times(self.instance, self.heads)
@@ -0,0 +1,226 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Sequence, Tuple
+import numpy as np
+from src.common.array_dispatcher import ArrayDispatcher
+from src.common.array_shop import ArrayJobShop
+from src.common.decoder import decode, random_sequences, sequence_from_state
+from src.common.schedule_state import ScheduleState
+
+SEED_RULES = ("fifo", "lifo", "mwkr", "lwkr")
+
+# Instance and decoding mode of a worker process, set once by _init_worker
+_worker_instance: Optional[ArrayJobShop] = None
+_worker_decoding: Optional[str] = None
+
+
+def _init_worker(instance: ArrayJobShop, decoding: str) -> None:
+    global _worker_instance, _worker_decoding
+    _worker_instance = instance
+    _worker_decoding = decoding
+
+
+def _evaluate_chunk(sequences: np.ndarray) -> np.ndarray:
+    _, makespans = decode(_worker_instance, sequences, _worker_decoding, validate=False)
+    return makespans
+
+
+class GeneticAlgorithmResult:
+    def __init__(self, best_state: ScheduleState, best_makespan: int, generations: int, evaluations: int,
+                 seconds: float, trace: List[Tuple[float, int, int]], stop_reason: str):
+        self.best_state = best_state
+        self.best_makespan = best_makespan
+        self.generations = generations
+        self.evaluations = evaluations
+        self.seconds = seconds
+        self.trace = trace # (seconds, generation, makespan) whenever the best makespan improved
+        self.stop_reason = stop_reason
+
+    @property
+    def generations_per_second(self) -> float:
+        return self.generations / self.seconds if self.seconds > 0 else float('inf')
+
+    def __str__(self):
+        return (f"Genetic algorithm: best {self.best_makespan} after {self.generations} generations "
+                f"({self.evaluations} evaluations), {self.seconds:.2f}s, "
+                f"{self.generations_per_second:,.1f} generations/s ({self.stop_reason})")
+
+
+class GeneticAlgorithm:
+    """
+    Genetic algorithm on operation-based chromosomes: repetition permutations of job ids
+    that are decoded into active (or semi-active) schedules by src.common.decoder.
+
+    Parents are chosen by tournament selection and recombined with POX (one child that keeps
+    the genes of a random job subset from the first parent at their positions and takes the
+    other genes in the order of the second parent) or JOX (the same job-based transfer, but
+    both complementary children are kept). Children are mutated by swapping two genes and
+    the elite_size best individuals survive unchanged.
+
+    With processes > 1 the fitness of a generation is evaluated in a process pool; every
+    worker receives the instance once through the pool initializer and then decodes whole
+    chunks of the population with the batched decoder.
+    """
+
+    def __init__(self, instance: ArrayJobShop, population_size: int = 100, crossover: str = "pox",
+                 crossover_rate: float = 0.9, mutation_rate: float = 0.2, elite_size: int = 2,
+                 tournament_size: int = 2, decoding: str = "active", processes: Optional[int] = None,
+                 seed: Optional[int] = None):
+        if crossover not in ("pox", "jox"):
+            raise ValueError(f"Unknown crossover: {crossover}")
+        if population_size < 2 or not 0 <= elite_size < population_size:
+            raise ValueError("population_size must be at least 2 and elite_size smaller than it.")
+        self.instance = instance
+        self.population_size = population_size
+        self.crossover = crossover
+        self.crossover_rate = crossover_rate
+        self.mutation_rate = mutation_rate
+        self.elite_size = elite_size
+        self.tournament_size = tournament_size
+        self.decoding = decoding
+        self.processes = processes
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
+    def seed_sequences(self, rules: Sequence[str] = SEED_RULES) -> np.ndarray:
+        """Return the sequences of the schedules of the given dispatching rules."""
+        sequences = []
+        for rule in rules:
+            dispatcher = ArrayDispatcher(self.instance)
+            dispatcher.dispatch(rule, seed=self.seed)
+            sequences.append(sequence_from_state(self.instance, dispatcher.state))
+        return np.array(sequences, dtype=np.int64).reshape(len(sequences), self.instance.nr_of_operations)
+
+    def initial_population(self, seed_rules: Sequence[str] = (),
+                           initial_states: Sequence[ScheduleState] = ()) -> np.ndarray:
+        population = random_sequences(self.instance, self.population_size, self.rng)
+        seeds = [sequence_from_state(self.instance, state) for state in initial_states]
+        if seed_rules:
+            seeds.extend(self.seed_sequences(seed_rules))
+        if seeds:
+            seeds = seeds[:self.population_size]
+            population[:len(seeds)] = seeds
+        return population
+
+    def select(self, fitness: np.ndarray, nr_of_parents: int) -> np.ndarray:
+        """Tournament selection: indices of the best of tournament_size random individuals."""
+        candidates = self.rng.integers(0, len(fitness), size=(nr_of_parents, self.tournament_size))
+        return candidates[np.arange(nr_of_parents), fitness[candidates].argmin(axis=1)]
+
+    def recombine(self, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        """
+        Job-based crossover of pairs of parents (rows of first and second). The genes of a random
+        subset of jobs stay at their positions in the first parent, the remaining positions are
+        filled with the other genes in the order of the second parent. JOX also returns the
+        complementary children (roles of the parents swapped).
+        """
+        nr_of_pairs = len(first)
+        rows = np.arange(nr_of_pairs)[:, None]
+        in_subset = self.rng.random((nr_of_pairs, self.instance.nr_of_jobs)) < 0.5
+        first_kept = in_subset[rows, first]
+        second_kept = in_subset[rows, second]
+
+        # Every row has the same number of genes to fill in both parents, so row-major
+        # boolean indexing moves the genes of each row into the same row of the child.
+        children = first.copy()
+        children[~first_kept] = second[~second_kept]
+        if self.crossover == "pox":
+            return children
+        complements = second.copy()
+        complements[second_kept] = first[first_kept]
+        return np.concatenate([children, complements])
+
+    def mutate(self, population: np.ndarray) -> None:
+        """Swap two random genes in a mutation_rate fraction of the rows (in place)."""
+        rows = np.flatnonzero(self.rng.random(len(population)) < self.mutation_rate)
+        positions = self.rng.integers(0, population.shape[1], size=(len(rows), 2))
+        first, second = population[rows, positions[:, 0]], population[rows, positions[:, 1]]
+        population[rows, positions[:, 0]] = second
+        population[rows, positions[:, 1]] = first
+
+    def next_generation(self, population: np.ndarray, fitness: np.ndarray) -> np.ndarray:
+        elite = population[np.argsort(fitness, kind='stable')[:self.elite_size]]
+        nr_of_children = self.population_size - self.elite_size
+        nr_of_pairs = nr_of_children if self.crossover == "pox" else (nr_of_children + 1) // 2
+
+        first = population[self.select(fitness, nr_of_pairs)]
+        second = population[self.select(fitness, nr_of_pairs)]
+        crossed = self.rng.random(nr_of_pairs) < self.crossover_rate
+        children = self.recombine(first[crossed], second[crossed])
+        children = np.concatenate([children, first[~crossed], second[~crossed]])[:nr_of_children]
+        self.mutate(children)
+        return np.concatenate([elite, children])
+
+    def decode_state(self, sequence: np.ndarray) -> ScheduleState:
+        start_times, _ = decode(self.instance, sequence[None, :], self.decoding, validate=False)
+        return ScheduleState.from_start_times(self.instance, start_times[0])
+
+    def evaluate(self, population: np.ndarray, executor: Optional[ProcessPoolExecutor] = None) -> np.ndarray:
+        """Return the makespans of the decoded population, in chunks on the pool if one is given."""
+        if executor is None:
+            _, makespans = decode(self.instance, population, self.decoding, validate=False)
+            return makespans
+        chunks = np.array_split(population, self.processes)
+        return np.concatenate(list(executor.map(_evaluate_chunk, chunks)))
+
+    def solve(self, max_generations: Optional[int] = 1000,
+              time_limit: Optional[float] = None,
+              max_no_improve: Optional[int] = None,
+              target_makespan: Optional[int] = None,
+              seed_rules: Sequence[str] = SEED_RULES,
+              initial_states: Sequence[ScheduleState] = (),
+              on_improvement: Optional[Callable[[ScheduleState], None]] = None) -> GeneticAlgorithmResult:
+        """
+        Evolve the population. The search stops after max_generations, time_limit seconds,
+        max_no_improve generations without a new best makespan or when target_makespan
+        (e.g. the optimum or a lower bound) is reached. The schedules of initial_states
+        (e.g. a known good schedule) are put into the first population. on_improvement is
+        called with the decoded schedule of every new best sequence.
+        """
+        start = time.perf_counter()
+        executor = None
+        if self.processes is not None and self.processes > 1:
+            executor = ProcessPoolExecutor(max_workers=self.processes,
+                                           initializer=_init_worker,
+                                           initargs=(self.instance, self.decoding))
+        try:
+            population = self.initial_population(seed_rules, initial_states)
+            fitness = self.evaluate(population, executor)
+            evaluations = len(population)
+            best_index = int(fitness.argmin())
+            best_sequence, best_makespan = population[best_index].copy(), int(fitness[best_index])
+            trace = [(time.perf_counter() - start, 0, best_makespan)]
+            generation = 0
+            last_improvement = 0
+            stop_reason = "generation limit"
+
+            while max_generations is None or generation < max_generations:
+                if target_makespan is not None and best_makespan <= target_makespan:
+                    stop_reason = "target reached"
+                    break
+                if time_limit is not None and time.perf_counter() - start >= time_limit:
+                    stop_reason = "time limit"
+                    break
+                if max_no_improve is not None and generation - last_improvement >= max_no_improve:
+                    stop_reason = "no improvement"
+                    break
+
+                population = self.next_generation(population, fitness)
+                fitness = self.evaluate(population, executor)
+                evaluations += len(population)
+                generation += 1
+
+                best_index = int(fitness.argmin())
+                if fitness[best_index] < best_makespan:
+                    best_sequence, best_makespan = population[best_index].copy(), int(fitness[best_index])
+                    last_improvement = generation
+                    trace.append((time.perf_counter() - start, generation, best_makespan))
+                    if on_improvement is not None:
+                        on_improvement(self.decode_state(best_sequence))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        best_state = self.decode_state(best_sequence)
+        seconds = time.perf_counter() - start
+        return GeneticAlgorithmResult(best_state, best_makespan, generation, evaluations, seconds, trace, stop_reason)
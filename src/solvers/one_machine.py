@@ -0,0 +1,125 @@
+import heapq
+from typing import List, Optional, Sequence, Tuple
+from src.common.bounds import jackson_preemptive_bound
+
+'''
+One-machine sequencing with heads and tails (1|r_j,q_j|C_max, equivalent to 1|r_j|L_max):
+every operation j is released at heads[j], takes processing_times[j] and is followed by
+tails[j] time units of work elsewhere. The value of a sequence is max(start + p + tail).
+'''
+
+
+def schrage(heads: Sequence[int], processing_times: Sequence[int], tails: Sequence[int]) -> Tuple[List[int], List[int], int]:
+    """
+    Schrage's list schedule: whenever the machine is free, start the released operation with the
+    largest tail. Returns (sequence, start times by operation, value).
+    """
+    n = len(heads)
+    order = sorted(range(n), key=heads.__getitem__)
+    available = []
+    sequence = []
+    starts = [0] * n
+    value = 0
+    time_now = 0
+    index = 0
+    while len(sequence) < n:
+        if not available and time_now < heads[order[index]]:
+            time_now = heads[order[index]]
+        while index < n and heads[order[index]] <= time_now:
+            heapq.heappush(available, (-tails[order[index]], order[index]))
+            index += 1
+        _, op = heapq.heappop(available)
+        sequence.append(op)
+        starts[op] = time_now
+        time_now += processing_times[op]
+        value = max(value, time_now + tails[op])
+    return sequence, starts, value
+
+
+def sequence_value(heads: Sequence[int], processing_times: Sequence[int], tails: Sequence[int],
+                   sequence: Sequence[int]) -> int:
+    """Value of a sequence when every operation starts as early as possible."""
+    time_now = 0
+    value = 0
+    for op in sequence:
+        time_now = max(time_now, heads[op]) + processing_times[op]
+        value = max(value, time_now + tails[op])
+    return value
+
+
+def carlier(heads: Sequence[int], processing_times: Sequence[int], tails: Sequence[int],
+            max_nodes: Optional[int] = 1000) -> Tuple[List[int], int, bool]:
+    """
+    Carlier's branch and bound for the one-machine problem. Every node is solved with Schrage;
+    the critical operation c of its critical block is either forced before or after the
+    operations of the block behind it by raising its head or its tail. Nodes are bounded by
+    Jackson's preemptive schedule. Returns (best sequence, value, proven optimal); the search
+    stops after max_nodes nodes with the best sequence found so far.
+    """
+    n = len(heads)
+    if n == 0:
+        return [], 0, True
+    best_sequence, _, best_value = schrage(heads, processing_times, tails)
+    lower = jackson_preemptive_bound(heads, processing_times, tails)
+    if best_value <= lower:
+        return best_sequence, best_value, True
+
+    stack = [(list(heads), list(tails))]
+    nodes = 0
+    while stack:
+        if max_nodes is not None and nodes >= max_nodes:
+            return best_sequence, best_value, False
+        node_heads, node_tails = stack.pop()
+        nodes += 1
+        sequence, starts, value = schrage(node_heads, processing_times, node_tails)
+        # Heads and tails only grow in the tree, so the sequence is at least as good for the original data
+        original_value = sequence_value(heads, processing_times, tails, sequence)
+        if original_value < best_value:
+            best_sequence, best_value = sequence, original_value
+            if best_value <= lower:
+                return best_sequence, best_value, True
+
+        # Critical block: the last operation b that defines the value and the first operation a
+        # of the block without idle time in front of b
+        positions = [index for index, op in enumerate(sequence)
+                     if starts[op] + processing_times[op] + node_tails[op] == value]
+        b_index = positions[-1]
+        b = sequence[b_index]
+        a_index = b_index
+        while a_index > 0:
+            previous = sequence[a_index - 1]
+            if starts[previous] + processing_times[previous] < starts[sequence[a_index]]:
+                break
+            a_index -= 1
+        # c: the last operation of the block in front of b with a smaller tail than b
+        c_index = None
+        for index in range(b_index - 1, a_index - 1, -1):
+            if node_tails[sequence[index]] < node_tails[b]:
+                c_index = index
+                break
+        if c_index is None:
+            continue # this node is solved optimally by Schrage
+
+        c = sequence[c_index]
+        block = sequence[c_index + 1:b_index + 1]
+        block_head = min(node_heads[op] for op in block)
+        block_time = sum(processing_times[op] for op in block)
+        block_tail = min(node_tails[op] for op in block)
+
+        # c after the block
+        after_heads = list(node_heads)
+        after_heads[c] = max(node_heads[c], block_head + block_time)
+        # c before the block
+        before_tails = list(node_tails)
+        before_tails[c] = max(node_tails[c], block_tail + block_time)
+
+        children = []
+        for child_heads, child_tails in ((after_heads, node_tails), (node_heads, before_tails)):
+            bound = max(jackson_preemptive_bound(child_heads, processing_times, child_tails),
+                        block_head + block_time + block_tail)
+            if bound < best_value:
+                children.append((bound, child_heads, child_tails))
+        # Visit the child with the smaller bound first
+        for _, child_heads, child_tails in sorted(children, key=lambda child: -child[0]):
+            stack.append((child_heads, child_tails))
+    return best_sequence, best_value, True
@@ -0,0 +1,303 @@
+import multiprocessing
+import time
+from multiprocessing.connection import wait
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from src.common.array_dispatcher import SCHEDULE_MODES, ArrayDispatcher
+from src.common.array_shop import ArrayJobShop
+from src.common.bounds import lower_bound
+from src.common.rollouts import random_rollouts
+from src.common.rules import available_rules
+from src.common.schedule_state import ScheduleState
+from src.solvers.branch_and_bound import BranchAndBound
+from src.solvers.genetic_algorithm import GeneticAlgorithm
+from src.solvers.shifting_bottleneck import ShiftingBottleneck
+from src.solvers.tabu_search import TabuSearch
+
+PORTFOLIO_METHODS = ("rules", "random", "tabu", "ga", "sb", "bnb")
+
+NO_MAKESPAN = np.iinfo(np.int64).max
+# Stop codes of the shared incumbent
+RUNNING, TARGET_REACHED, PROVEN_OPTIMAL, STOPPED = 0, 1, 2, 3
+STOP_REASONS = {RUNNING: "all methods finished", TARGET_REACHED: "target reached",
+                PROVEN_OPTIMAL: "proven optimal", STOPPED: "time limit"}
+
+
+class SharedIncumbent:
+    """
+    The best schedule of a portfolio, shared by all its processes.
+
+    Makespan, update count, stop code, start times and the anytime trace live in shared memory
+    (multiprocessing RawArrays) behind one lock, so every worker can read the best makespan
+    without locking and offer a schedule, which is only copied if it is better. The trace
+    holds (seconds, method, makespan) for every improvement, up to trace_capacity entries.
+    """
+
+    def __init__(self, instance: ArrayJobShop, methods: Sequence[str], target_makespan: Optional[int],
+                 context=None, trace_capacity: int = 65536):
+        context = context or multiprocessing.get_context()
+        self.methods = list(methods)
+        self.target_makespan = target_makespan
+        self.trace_capacity = trace_capacity
+        self.start = time.time()
+        self._lock = context.Lock()
+        # makespan, updates, stop code, trace length
+        self._header = context.RawArray('q', [NO_MAKESPAN, 0, RUNNING, 0])
+        self._start_times = context.RawArray('i', instance.nr_of_operations)
+        self._trace = context.RawArray('d', 3 * trace_capacity)
+
+    @property
+    def makespan(self) -> Optional[int]:
+        makespan = self._header[0]
+        return None if makespan == NO_MAKESPAN else makespan
+
+    @property
+    def updates(self) -> int:
+        return self._header[1]
+
+    @property
+    def stop_code(self) -> int:
+        return self._header[2]
+
+    @property
+    def stopped(self) -> bool:
+        return self._header[2] != RUNNING
+
+    def stop(self, code: int = STOPPED) -> None:
+        with self._lock:
+            if self._header[2] == RUNNING:
+                self._header[2] = code
+
+    def offer(self, state: ScheduleState, method: str) -> bool:
+        """Share the schedule if it is better than the incumbent; stops the portfolio at the target."""
+        makespan = state.makespan
+        if makespan >= self._header[0]:
+            return False
+        with self._lock:
+            if makespan >= self._header[0]:
+                return False
+            np.frombuffer(self._start_times, dtype=np.int32)[:] = state.start_times
+            self._header[0] = makespan
+            self._header[1] += 1
+            length = self._header[3]
+            if length < self.trace_capacity:
+                self._trace[3 * length:3 * length + 3] = [time.time() - self.start, self.methods.index(method), makespan]
+                self._header[3] = length + 1
+            if self.target_makespan is not None and makespan <= self.target_makespan and self._header[2] == RUNNING:
+                self._header[2] = TARGET_REACHED
+        return True
+
+    def best_state(self, instance: ArrayJobShop, lock: bool = True) -> Optional[ScheduleState]:
+        """
+        Copy of the incumbent schedule. Without lock it may only be read once all workers
+        have stopped (a terminated worker could still hold the lock).
+        """
+        if self.makespan is None:
+            return None
+        if not lock:
+            return ScheduleState.from_start_times(instance, np.frombuffer(self._start_times, dtype=np.int32))
+        with self._lock:
+            return ScheduleState.from_start_times(instance, np.frombuffer(self._start_times, dtype=np.int32))
+
+    def trace(self) -> List[Tuple[float, str, int]]:
+        values = np.frombuffer(self._trace)[:3 * self._header[3]].reshape(-1, 3)
+        return [(float(seconds), self.methods[int(method)], int(makespan)) for seconds, method, makespan in values]
+
+
+def _remaining(deadline: float) -> float:
+    return deadline - time.time()
+
+
+def _run_rules(instance: ArrayJobShop, incumbent: SharedIncumbent, deadline: float, seed: int) -> None:
+    for mode in SCHEDULE_MODES:
+        for rule in available_rules():
+            if incumbent.stopped or _remaining(deadline) <= 0:
+                return
+            dispatcher = ArrayDispatcher(instance)
+            dispatcher.dispatch(rule, seed=seed, mode=mode)
+            incumbent.offer(dispatcher.state, "rules")
+
+
+def _run_random(instance: ArrayJobShop, incumbent: SharedIncumbent, deadline: float, seed: int,
+                batch_size: int = 256) -> None:
+    rng = np.random.default_rng(seed)
+    while not incumbent.stopped and _remaining(deadline) > 0:
+        rollouts = random_rollouts(instance, batch_size, seed=int(rng.integers(2 ** 32)), batch_size=batch_size)
+        incumbent.offer(rollouts.best_state, "random")
+
+
+def _initial_state(instance: ArrayJobShop, incumbent: SharedIncumbent) -> ScheduleState:
+    state = incumbent.best_state(instance)
+    if state is None:
+        dispatcher = ArrayDispatcher(instance)
+        dispatcher.dispatch("mwkr")
+        state = dispatcher.state
+    return state
+
+
+def _run_tabu(instance: ArrayJobShop, incumbent: SharedIncumbent, deadline: float, seed: int,
+              restart_after: int) -> None:
+    # After restart_after iterations without improvement the search restarts from the incumbent,
+    # which may have been found by another method
+    rounds = 0
+    while not incumbent.stopped and _remaining(deadline) > 0:
+        result = TabuSearch(instance, seed=seed + rounds).solve(
+            _initial_state(instance, incumbent),
+            max_iterations=None,
+            time_limit=_remaining(deadline),
+            max_no_improve=restart_after,
+            target_makespan=incumbent.target_makespan,
+            on_improvement=lambda state: incumbent.offer(state, "tabu"))
+        incumbent.offer(result.best_state, "tabu")
+        if result.stop_reason == "optimal":
+            incumbent.stop(PROVEN_OPTIMAL)
+        rounds += 1
+
+
+def _run_ga(instance: ArrayJobShop, incumbent: SharedIncumbent, deadline: float, seed: int,
+            restart_after: int) -> None:
+    rounds = 0
+    while not incumbent.stopped and _remaining(deadline) > 0:
+        incumbent_state = incumbent.best_state(instance)
+        result = GeneticAlgorithm(instance, seed=seed + rounds).solve(
+            max_generations=None,
+            time_limit=_remaining(deadline),
+            max_no_improve=max(restart_after // 10, 1),
+            target_makespan=incumbent.target_makespan,
+            initial_states=[incumbent_state] if incumbent_state is not None else (),
+            on_improvement=lambda state: incumbent.offer(state, "ga"))
+        incumbent.offer(result.best_state, "ga")
+        rounds += 1
+
+
+def _run_shifting_bottleneck(instance: ArrayJobShop, incumbent: SharedIncumbent, deadline: float, seed: int) -> None:
+    result = ShiftingBottleneck(instance).solve(time_limit=_remaining(deadline))
+    incumbent.offer(result.best_state, "sb")
+
+
+def _run_branch_and_bound(instance: ArrayJobShop, incumbent: SharedIncumbent, deadline: float, seed: int) -> None:
+    solver = BranchAndBound(instance)
+    # Share the initial upper bound right away: a worker still busy after the grace period is terminated
+    initial_state = incumbent.best_state(instance) or solver.initial_solution()
+    incumbent.offer(initial_state, "bnb")
+    result = solver.solve(time_limit=_remaining(deadline),
+                          initial_state=initial_state,
+                          shared_upper_bound=lambda: incumbent.makespan or NO_MAKESPAN,
+                          on_improvement=lambda state: incumbent.offer(state, "bnb"))
+    incumbent.offer(result.best_state, "bnb")
+    if result.stop_reason != "time limit":
+        # The search is complete: nothing beats the incumbent
+        incumbent.stop(PROVEN_OPTIMAL)
+
+
+def _run_method(method: str, instance: ArrayJobShop, incumbent: SharedIncumbent, deadline: float, seed: int,
+                restart_after: int) -> None:
+    match method:
+        case "rules":
+            _run_rules(instance, incumbent, deadline, seed)
+        case "random":
+            _run_random(instance, incumbent, deadline, seed)
+        case "tabu":
+            _run_tabu(instance, incumbent, deadline, seed, restart_after)
+        case "ga":
+            _run_ga(instance, incumbent, deadline, seed, restart_after)
+        case "sb":
+            _run_shifting_bottleneck(instance, incumbent, deadline, seed)
+        case "bnb":
+            _run_branch_and_bound(instance, incumbent, deadline, seed)
+
+
+class PortfolioResult:
+    def __init__(self, best_state: ScheduleState, best_makespan: int, target_makespan: Optional[int],
+                 seconds: float, trace: List[Tuple[float, str, int]], stop_reason: str, exit_codes: dict):
+        self.best_state = best_state
+        self.best_makespan = best_makespan
+        self.target_makespan = target_makespan
+        self.seconds = seconds
+        self.trace = trace # (seconds, method, makespan) whenever the shared best makespan improved
+        self.stop_reason = stop_reason
+        self.exit_codes = exit_codes # method -> exit code of its process, None if it was terminated
+
+    @property
+    def winner(self) -> str:
+        return self.trace[-1][1]
+
+    @property
+    def failed(self) -> List[str]:
+        return [method for method, code in self.exit_codes.items() if code not in (0, None)]
+
+    def __str__(self):
+        target = f", target {self.target_makespan}" if self.target_makespan is not None else ""
+        failed = f", failed: {', '.join(self.failed)}" if self.failed else ""
+        return (f"Portfolio: best {self.best_makespan} by {self.winner.upper()}{target}, "
+                f"{len(self.trace)} improvements, {self.seconds:.2f}s ({self.stop_reason}{failed})")
+
+
+class PortfolioSolver:
+    """
+    Runs several methods concurrently, each in its own process, under one wall-clock budget.
+
+    The methods are the dispatching rules in every schedule mode (rules), batched random restarts
+    (random), tabu search (tabu), the genetic algorithm (ga), shifting bottleneck (sb) and branch
+    and bound (bnb). They share every improvement through a SharedIncumbent: tabu search restarts
+    from it after restart_after iterations without improvement, the genetic algorithm after a
+    tenth as many generations, and branch and bound prunes with its makespan. The portfolio stops at the time limit, once the target makespan (the
+    optimum or a lower bound) is reached or when a method proves the incumbent optimal, and
+    returns the best schedule with the anytime trace of improvements.
+    """
+
+    def __init__(self, instance: ArrayJobShop, methods: Sequence[str] = PORTFOLIO_METHODS,
+                 target_makespan: Optional[int] = None, seed: Optional[int] = None,
+                 restart_after: int = 1000):
+        unknown = [method for method in methods if method not in PORTFOLIO_METHODS]
+        if unknown:
+            raise ValueError(f"Unknown portfolio methods: {', '.join(unknown)}. "
+                             f"Available methods: {', '.join(PORTFOLIO_METHODS)}")
+        self.instance = instance
+        self.methods = list(methods)
+        # The bound of the instance itself is always valid, a catalog bound may be stronger
+        bound = lower_bound(instance)
+        self.target_makespan = bound if target_makespan is None else max(target_makespan, bound)
+        self.seed = seed if seed is not None else 0
+        self.restart_after = restart_after
+
+    def solve(self, time_limit: float = 10.0, grace_period: float = 0.5) -> PortfolioResult:
+        """
+        Run all methods for at most time_limit seconds. Workers that are still busy grace_period
+        seconds after the portfolio stopped are terminated; their results are already shared.
+        """
+        context = multiprocessing.get_context()
+        incumbent = SharedIncumbent(self.instance, self.methods, self.target_makespan, context)
+        deadline = incumbent.start + time_limit
+        processes = {method: context.Process(target=_run_method, daemon=True,
+                                             args=(method, self.instance, incumbent, deadline,
+                                                   self.seed + index, self.restart_after))
+                     for index, method in enumerate(self.methods)}
+        for process in processes.values():
+            process.start()
+
+        running = [process.sentinel for process in processes.values()]
+        while running and not incumbent.stopped and _remaining(deadline) > 0:
+            finished = wait(running, timeout=min(0.05, max(_remaining(deadline), 0)))
+            running = [sentinel for sentinel in running if sentinel not in finished]
+        if running:
+            incumbent.stop()
+
+        grace_end = time.time() + grace_period
+        exit_codes = {}
+        for method, process in processes.items():
+            process.join(max(grace_end - time.time(), 0))
+            if process.is_alive():
+                process.terminate()
+                process.join()
+                exit_codes[method] = None
+            else:
+                exit_codes[method] = process.exitcode
+        seconds = time.time() - incumbent.start
+
+        best_state = incumbent.best_state(self.instance, lock=False)
+        if best_state is None:
+            raise RuntimeError(f"No method of the portfolio found a schedule: exit codes {exit_codes}")
+        stop_reason = STOP_REASONS[incumbent.stop_code]
+        return PortfolioResult(best_state, best_state.makespan, self.target_makespan, seconds,
+                               incumbent.trace(), stop_reason, exit_codes)
@@ -0,0 +1,121 @@
+import time
+from typing import List, Optional, Tuple
+from src.common.array_shop import ArrayJobShop
+from src.common.schedule_state import ScheduleState
+from src.solvers.disjunctive_graph import DisjunctiveGraph
+from src.solvers.one_machine import carlier
+
+
+class ShiftingBottleneckResult:
+    def __init__(self, best_state: ScheduleState, best_makespan: int, subproblems: int, seconds: float,
+                 trace: List[Tuple[float, int, int]], stop_reason: str):
+        self.best_state = best_state
+        self.best_makespan = best_makespan
+        self.subproblems = subproblems
+        self.seconds = seconds
+        self.trace = trace # (seconds, fixed machines, makespan of the partial selection) after every iteration
+        self.stop_reason = stop_reason
+
+    def __str__(self):
+        return (f"Shifting bottleneck: {self.best_makespan} in {self.seconds:.2f}s, "
+                f"{self.subproblems} one-machine subproblems ({self.stop_reason})")
+
+
+class ShiftingBottleneck:
+    """
+    Shifting bottleneck procedure on the disjunctive graph.
+
+    Machines are sequenced one at a time. In every iteration the heads and tails of the
+    partial selection (only the machines fixed so far have machine arcs) define a one-machine
+    problem for every unscheduled machine, which is solved with Carlier's algorithm. The
+    machine with the largest value is the bottleneck and its sequence is fixed. Afterwards
+    every previously fixed machine is re-optimized: its arcs are removed and it is sequenced
+    again with the new heads and tails, keeping the new sequence only if the makespan does
+    not get worse.
+
+    max_nodes limits the Carlier search per subproblem. After time_limit seconds the remaining
+    machines are fixed with Schrage's rule and without re-optimization, so a complete schedule
+    is always returned.
+    """
+
+    def __init__(self, instance: ArrayJobShop, reoptimization_cycles: int = 3, max_nodes: Optional[int] = 100):
+        self.instance = instance
+        self.reoptimization_cycles = reoptimization_cycles
+        self.max_nodes = max_nodes
+        self.processing_times = instance.processing_times.tolist()
+        self.machine_operations = [[] for _ in range(instance.nr_of_machines)]
+        for op, machine_id in enumerate(instance.machine_ids.tolist()):
+            self.machine_operations[machine_id].append(op)
+        self.subproblems = 0
+
+    def sequence_machine(self, graph: DisjunctiveGraph, machine_id: int, max_nodes: Optional[int]) -> Tuple[List[int], int]:
+        """Solve the one-machine problem of a machine with the current heads and tails."""
+        operations = self.machine_operations[machine_id]
+        heads = [graph.heads[op] for op in operations]
+        times = [self.processing_times[op] for op in operations]
+        tails = [graph.tails[op] for op in operations]
+        sequence, value, _ = carlier(heads, times, tails, max_nodes=max_nodes)
+        self.subproblems += 1
+        return [operations[index] for index in sequence], value
+
+    def fix_machine(self, graph: DisjunctiveGraph, machine_id: int, sequence: List[int]) -> None:
+        """
+        Fix the sequence of a machine and update heads and tails. If the sequence closes a cycle
+        with the paths through other machines, the machine is sequenced by heads in topological
+        order instead, which is always acyclic.
+        """
+        order = graph.topological_order()
+        graph.set_machine_sequence(machine_id, sequence)
+        if graph.compute_heads_tails():
+            return
+        position = {op: index for index, op in enumerate(order)}
+        graph.set_machine_sequence(machine_id, sorted(sequence, key=lambda op: (graph.heads[op], position[op])))
+        graph.compute_heads_tails()
+
+    def reoptimize(self, graph: DisjunctiveGraph, fixed: List[int]) -> None:
+        for _ in range(self.reoptimization_cycles):
+            improved = False
+            for machine_id in fixed:
+                makespan = graph.makespan
+                previous = list(graph.machine_sequences[machine_id])
+                graph.set_machine_sequence(machine_id, [])
+                graph.compute_heads_tails()
+                sequence, _ = self.sequence_machine(graph, machine_id, self.max_nodes)
+                self.fix_machine(graph, machine_id, sequence)
+                if graph.makespan > makespan:
+                    self.fix_machine(graph, machine_id, previous)
+                elif graph.makespan < makespan:
+                    improved = True
+            if not improved:
+                break
+
+    def solve(self, time_limit: Optional[float] = None) -> ShiftingBottleneckResult:
+        start = time.perf_counter()
+        self.subproblems = 0
+        graph = DisjunctiveGraph(self.instance, [[] for _ in range(self.instance.nr_of_machines)])
+        graph.compute_heads_tails()
+        unscheduled = [machine_id for machine_id, operations in enumerate(self.machine_operations) if operations]
+        fixed = []
+        trace = []
+        stop_reason = "complete"
+
+        while unscheduled:
+            fast = time_limit is not None and time.perf_counter() - start >= time_limit
+            if fast:
+                stop_reason = "time limit, remaining machines sequenced with Schrage"
+            best_machine, best_sequence, best_value = None, None, None
+            for machine_id in unscheduled:
+                sequence, value = self.sequence_machine(graph, machine_id, 0 if fast else self.max_nodes)
+                if best_value is None or value > best_value:
+                    best_machine, best_sequence, best_value = machine_id, sequence, value
+
+            self.fix_machine(graph, best_machine, best_sequence)
+            unscheduled.remove(best_machine)
+            fixed.append(best_machine)
+            if not fast:
+                self.reoptimize(graph, fixed)
+            trace.append((time.perf_counter() - start, len(fixed), graph.makespan))
+
+        state = graph.to_state()
+        return ShiftingBottleneckResult(state, state.makespan, self.subproblems,
+                                        time.perf_counter() - start, trace, stop_reason)
@@ -0,0 +1,234 @@
+import random
+import time
+from typing import Callable, List, Optional, Tuple
+from src.common.array_shop import ArrayJobShop
+from src.common.schedule_state import ScheduleState
+from src.solvers.disjunctive_graph import DisjunctiveGraph
+
+# A move reorders the segment machine_sequences[machine_id][first:last + 1]:
+# (machine_id, first, last, forward). forward=True moves the first operation of the
+# segment right behind the last one, forward=False moves the last one right before the first.
+Move = Tuple[int, int, int, bool]
+
+
+class TabuSearchResult:
+    def __init__(self, best_state: ScheduleState, best_makespan: int, initial_makespan: int,
+                 iterations: int, seconds: float, trace: List[Tuple[float, int, int]], stop_reason: str):
+        self.best_state = best_state
+        self.best_makespan = best_makespan
+        self.initial_makespan = initial_makespan
+        self.iterations = iterations
+        self.seconds = seconds
+        self.trace = trace # (seconds, iteration, makespan) whenever the best makespan improved
+        self.stop_reason = stop_reason
+
+    @property
+    def iterations_per_second(self) -> float:
+        return self.iterations / self.seconds if self.seconds > 0 else float('inf')
+
+    def __str__(self):
+        return (f"Tabu search: {self.initial_makespan} -> {self.best_makespan} in {self.iterations} iterations, "
+                f"{self.seconds:.2f}s, {self.iterations_per_second:,.0f} iterations/s ({self.stop_reason})")
+
+
+class TabuSearch:
+    """
+    Tabu search on the critical path of a schedule.
+
+    The neighbourhood consists of moves inside the critical blocks: the N5 swaps of the
+    first two and the last two operations of a block and N6-style moves of an operation
+    to the front or the back of its block (only if the move cannot create a cycle).
+    Every move is evaluated incrementally from the heads and tails of the current
+    solution; only the reordered segment of one machine is recomputed. Heads and tails
+    of the whole graph are recomputed only for the move that is actually applied.
+
+    Moves that would restore an order of two operations that was reversed during the last
+    `tenure` iterations are tabu, unless their estimate beats the best makespan (aspiration).
+    """
+
+    def __init__(self, instance: ArrayJobShop, tenure: Optional[int] = None, seed: Optional[int] = None):
+        self.instance = instance
+        self.tenure = tenure if tenure is not None else 10 + instance.nr_of_jobs // max(instance.nr_of_machines, 1)
+        self.rng = random.Random(seed)
+
+    def neighbourhood(self, graph: DisjunctiveGraph, blocks: List[List[int]]) -> List[Move]:
+        p, heads, tails = graph.processing_times, graph.heads, graph.tails
+        moves = set()
+        last_block = len(blocks) - 1
+        for index, block in enumerate(blocks):
+            if len(block) < 2:
+                continue
+            machine_id = graph.machine_ids[block[0]]
+            first = graph.position[block[0]]
+            last = graph.position[block[-1]]
+
+            # N5: swap the first two operations (not in the first block) and the last two (not in the last block)
+            if index > 0:
+                moves.add((machine_id, first, first + 1, True))
+            if index < last_block:
+                moves.add((machine_id, last - 1, last, True))
+
+            if len(block) < 3:
+                continue
+            # N6-style: move an operation behind the last one or in front of the first one of the block
+            v = block[-1]
+            for k in range(0 if index > 0 else 1, len(block) - 1):
+                u = block[k]
+                successor = graph.job_succ[u]
+                if successor == -1 or tails[v] + p[v] >= tails[successor] + p[successor]:
+                    moves.add((machine_id, first + k, last, True))
+            u = block[0]
+            for k in range(1, len(block) - (1 if index < last_block else 0)):
+                v = block[k]
+                predecessor = graph.job_pred[v]
+                if predecessor == -1 or heads[u] + p[u] >= heads[predecessor] + p[predecessor]:
+                    moves.add((machine_id, first, first + k, False))
+        return list(moves)
+
+    @staticmethod
+    def reordered_segment(graph: DisjunctiveGraph, move: Move) -> List[int]:
+        machine_id, first, last, forward = move
+        segment = graph.machine_sequences[machine_id][first:last + 1]
+        if forward:
+            return segment[1:] + segment[:1]
+        return segment[-1:] + segment[:-1]
+
+    @staticmethod
+    def estimate(graph: DisjunctiveGraph, move: Move, segment: List[int]) -> int:
+        """
+        Estimate the makespan after a move from the current heads and tails: heads are
+        propagated forward and tails backward through the reordered segment only.
+        """
+        p, heads, tails = graph.processing_times, graph.heads, graph.tails
+        machine_id, first, last, _ = move
+        sequence = graph.machine_sequences[machine_id]
+
+        new_heads = []
+        ready = heads[sequence[first - 1]] + p[sequence[first - 1]] if first > 0 else 0
+        for op in segment:
+            predecessor = graph.job_pred[op]
+            head = heads[predecessor] + p[predecessor] if predecessor != -1 else 0
+            head = max(head, ready)
+            new_heads.append(head)
+            ready = head + p[op]
+
+        estimate = 0
+        after = tails[sequence[last + 1]] + p[sequence[last + 1]] if last + 1 < len(sequence) else 0
+        for op, head in zip(reversed(segment), reversed(new_heads)):
+            successor = graph.job_succ[op]
+            tail = tails[successor] + p[successor] if successor != -1 else 0
+            tail = max(tail, after)
+            estimate = max(estimate, head + p[op] + tail)
+            after = tail + p[op]
+        return estimate
+
+    @staticmethod
+    def created_orders(graph: DisjunctiveGraph, move: Move) -> List[Tuple[int, int]]:
+        """Pairs (a, b) such that a is processed before b after the move but not before."""
+        machine_id, first, last, forward = move
+        sequence = graph.machine_sequences[machine_id]
+        if forward:
+            moved = sequence[first]
+            return [(op, moved) for op in sequence[first + 1:last + 1]]
+        moved = sequence[last]
+        return [(moved, op) for op in sequence[first:last]]
+
+    def apply(self, graph: DisjunctiveGraph, move: Move, segment: List[int]) -> List[Tuple[int, int]]:
+        machine_id, first, last, _ = move
+        created = self.created_orders(graph, move)
+        graph.machine_sequences[machine_id][first:last + 1] = segment
+        graph.update_machine(machine_id)
+        return created
+
+    def solve(self, initial_state: ScheduleState,
+              max_iterations: Optional[int] = 10000,
+              time_limit: Optional[float] = None,
+              max_no_improve: Optional[int] = None,
+              target_makespan: Optional[int] = None,
+              on_improvement: Optional[Callable[[ScheduleState], None]] = None) -> TabuSearchResult:
+        """
+        Improve a complete schedule. The search stops after max_iterations, time_limit seconds,
+        max_no_improve iterations without a new best makespan, when target_makespan (e.g. a lower
+        bound) is reached, when the critical path is a single block or when it has no moves (every block
+        is a single operation, so the path is one job); both prove optimality.
+        on_improvement is called with every new best schedule.
+        """
+        graph = DisjunctiveGraph.from_state(self.instance, initial_state)
+        if not graph.compute_heads_tails():
+            raise ValueError("The initial schedule contains a cycle.")
+
+        start = time.perf_counter()
+        initial_makespan = best_makespan = graph.makespan
+        best_state = graph.to_state()
+        trace = [(0.0, 0, best_makespan)]
+        tabu = {} # (a, b) -> last iteration in which a must not be put before b again
+        iteration = 0
+        last_improvement = 0
+        stop_reason = "iteration limit"
+
+        while max_iterations is None or iteration < max_iterations:
+            if target_makespan is not None and best_makespan <= target_makespan:
+                stop_reason = "target reached"
+                break
+            if time_limit is not None and time.perf_counter() - start >= time_limit:
+                stop_reason = "time limit"
+                break
+            if max_no_improve is not None and iteration - last_improvement >= max_no_improve:
+                stop_reason = "no improvement"
+                break
+
+            blocks = graph.critical_blocks()
+            if len(blocks) == 1:
+                # The critical path runs on one machine without idle time: the makespan is the work of that machine
+                stop_reason = "optimal"
+                break
+            moves = self.neighbourhood(graph, blocks)
+            if not moves:
+                stop_reason = "optimal"
+                break
+
+            best_move, best_segment, best_estimate = None, None, None
+            tabu_moves = []
+            for move in moves:
+                segment = self.reordered_segment(graph, move)
+                estimate = self.estimate(graph, move, segment)
+                is_tabu = any(tabu.get(order, -1) >= iteration for order in self.created_orders(graph, move))
+                if is_tabu and estimate >= best_makespan:
+                    tabu_moves.append((move, segment))
+                    continue
+                if best_estimate is None or estimate < best_estimate or (
+                        estimate == best_estimate and self.rng.random() < 0.5):
+                    best_move, best_segment, best_estimate = move, segment, estimate
+
+            if best_move is None:
+                # All moves are tabu: take a random one so the search keeps moving
+                best_move, best_segment = self.rng.choice(tabu_moves)
+
+            backup = [list(graph.machine_sequences[best_move[0]])]
+            created = self.apply(graph, best_move, best_segment)
+            if not graph.compute_heads_tails():
+                # Should not happen for the moves above; undo and forbid the move
+                graph.machine_sequences[best_move[0]] = backup[0]
+                graph.update_machine(best_move[0])
+                graph.compute_heads_tails()
+                for order in created:
+                    tabu[order] = iteration + self.tenure
+                iteration += 1
+                continue
+
+            iteration += 1
+            tenure = self.tenure + self.rng.randint(0, max(self.tenure // 2, 1))
+            for before, after in created:
+                # after was processed before `before`; forbid restoring that order
+                tabu[(after, before)] = iteration + tenure
+
+            if graph.makespan < best_makespan:
+                best_makespan = graph.makespan
+                best_state = graph.to_state()
+                last_improvement = iteration
+                trace.append((time.perf_counter() - start, iteration, best_makespan))
+                if on_improvement is not None:
+                    on_improvement(best_state)
+
+        seconds = time.perf_counter() - start
+        return TabuSearchResult(best_state, best_makespan, initial_makespan, iteration, seconds, trace, stop_reason)
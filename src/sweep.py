@@ -0,0 +1,257 @@
+import fnmatch
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional
+from src.common.array_dispatcher import ArrayDispatcher, schedule_label
+from src.common.array_shop import ArrayJobShop
+from src.common.bounds import lower_bound
+from src.io.catalog import get_nested
+from src.io.result_cache import DEFAULT_CACHE_BYTES, ResultCache, dispatch_parameters
+from src.io.store import InstanceStore
+
+SWEEP_FIELDS = ['Instance', 'Algorithm', 'Mode', 'Seed', 'Jobs', 'Machines', 'Makespan', 'Optimum', 'Lower bound',
+                'Upper bound', 'Computed lower bound', 'Reference', 'Gap (%)', 'Gap to lower bound (%)', 'Optimal',
+                'Verified', 'Violations', 'Mean utilization (%)', 'Idle time', 'Total flow time', 'Wall time (s)']
+
+
+def select_instances(json_instances: List[Dict],
+                     authors: Optional[List[str]] = None,
+                     names: Optional[List[str]] = None,
+                     min_jobs: Optional[int] = None,
+                     max_jobs: Optional[int] = None,
+                     min_machines: Optional[int] = None,
+                     max_machines: Optional[int] = None) -> List[Dict]:
+    """
+    Filter the entries of instances.json. Authors are compared case-insensitively,
+    names are glob patterns (e.g. "ta*", "la0?") and the size ranges are inclusive.
+    """
+    authors = {author.lower() for author in authors} if authors else None
+    selected = []
+    for instance in json_instances:
+        if authors and instance["author"].lower() not in authors:
+            continue
+        if names and not any(fnmatch.fnmatch(instance["name"], pattern) for pattern in names):
+            continue
+        if min_jobs is not None and instance["jobs"] < min_jobs:
+            continue
+        if max_jobs is not None and instance["jobs"] > max_jobs:
+            continue
+        if min_machines is not None and instance["machines"] < min_machines:
+            continue
+        if max_machines is not None and instance["machines"] > max_machines:
+            continue
+        selected.append(instance)
+    return selected
+
+
+def get_reference(instance: Dict, computed_lower_bound: Optional[int] = None):
+    """
+    Return the makespan to compare against: the optimum if known, otherwise the best of the
+    catalog lower bound and the computed one.
+    """
+    if instance.get("optimum") is not None:
+        return instance["optimum"]
+    return best_lower_bound(instance, computed_lower_bound)
+
+
+def best_lower_bound(instance: Dict, computed_lower_bound: Optional[int] = None):
+    """Return the largest known lower bound: the optimum, the catalog lower bound or the computed one."""
+    candidates = [instance.get("optimum"), get_nested(instance, ["bounds", "lower"]), computed_lower_bound]
+    candidates = [candidate for candidate in candidates if candidate is not None]
+    return max(candidates) if candidates else None
+
+
+def gap_percent(makespan: int, reference) -> Optional[float]:
+    """Percent gap of a makespan above a reference value."""
+    if reference is None or reference <= 0:
+        return None
+    return 100.0 * (makespan - reference) / reference
+
+
+@lru_cache(maxsize=None)
+def get_cache(cache_folder: str, cache_bytes: int) -> ResultCache:
+    """Open the result cache once per worker process."""
+    return ResultCache(cache_folder, max_bytes=cache_bytes)
+
+
+@lru_cache(maxsize=None)
+def get_store(store_path: str) -> InstanceStore:
+    """Map the instance store once per worker process."""
+    return InstanceStore(store_path)
+
+
+@lru_cache(maxsize=None)
+def load_array_instance(file_path: str, name: str, store_path: Optional[str] = None) -> ArrayJobShop:
+    """
+    Load an instance once per worker process; all rules of that instance reuse it.
+    With a store_path the instance is a view into the memory-mapped store instead of parsed text.
+    """
+    if store_path is not None:
+        return get_store(store_path).open(name)
+    return ArrayJobShop.from_file(file_path, name=name)
+
+
+@lru_cache(maxsize=None)
+def load_lower_bound(file_path: str, name: str, store_path: Optional[str] = None) -> int:
+    """Compute the lower bound of an instance once per worker process."""
+    return lower_bound(load_array_instance(file_path, name, store_path))
+
+
+def run_pair(instance: Dict, rule: str, seed: Optional[int] = None, plot_folder: Optional[str] = None,
+             store_path: Optional[str] = None, mode: str = "semi-active", plot_format: str = "png",
+             dpi: Optional[int] = None, export_folder: Optional[str] = None, export_format: str = "json",
+             cache_folder: Optional[str] = None, cache_bytes: int = DEFAULT_CACHE_BYTES) -> Dict:
+    """
+    Dispatch one (instance, rule) pair in the given schedule mode and return one result row.
+    The Gantt chart is saved to plot_folder and the schedule exported to export_folder if given.
+    With a cache_folder, deterministic schedules come from the ResultCache (src.io.result_cache)
+    if they were computed before; the row then reports the wall time of the original run.
+    """
+    array_shop = load_array_instance(instance["path"], instance["name"], store_path)
+    dispatcher = ArrayDispatcher(array_shop)
+    parameters = dispatch_parameters(rule, mode, seed)
+    cache = get_cache(cache_folder, cache_bytes) if cache_folder is not None and parameters is not None else None
+    entry = cache.get(array_shop, rule, parameters) if cache is not None else None
+
+    if entry is not None:
+        dispatcher.state.set_start_times(entry['start_times'])
+        makespan = entry['makespan']
+        wall_time = entry['seconds']
+    else:
+        start = time.perf_counter()
+        makespan = dispatcher.dispatch(rule, seed=seed, mode=mode)
+        wall_time = time.perf_counter() - start
+        if cache is not None:
+            cache.put(array_shop, rule, parameters, dispatcher.state.start_times, makespan, wall_time)
+
+    label = schedule_label(rule, mode)
+    file_name = f"{label}_applied_to_{instance['name']}"
+    if plot_folder is not None:
+        array_shop.plot_gantt_chart(dispatcher.state,
+                                    title=f"{label} applied to instance {instance['name']} with makespan {makespan}",
+                                    file_path=os.path.join(plot_folder, f"{file_name}.{plot_format}"),
+                                    dpi=dpi)
+    if export_folder is not None:
+        array_shop.export_schedule(dispatcher.state, os.path.join(export_folder, f"{file_name}.{export_format}"),
+                                   algorithm=label)
+
+    report = array_shop.check_schedule(dispatcher.state)
+    computed_lower_bound = load_lower_bound(instance["path"], instance["name"], store_path)
+    reference = get_reference(instance, computed_lower_bound)
+    lower = best_lower_bound(instance, computed_lower_bound)
+    return {
+        'Instance': instance["name"],
+        'Algorithm': rule,
+        'Mode': mode,
+        'Seed': seed,
+        'Jobs': instance["jobs"],
+        'Machines': instance["machines"],
+        'Makespan': makespan,
+        'Optimum': instance.get("optimum"),
+        'Lower bound': get_nested(instance, ["bounds", "lower"]),
+        'Upper bound': get_nested(instance, ["bounds", "upper"]),
+        'Computed lower bound': computed_lower_bound,
+        'Reference': reference,
+        'Gap (%)': gap_percent(makespan, reference),
+        'Gap to lower bound (%)': gap_percent(makespan, lower),
+        'Optimal': makespan <= lower,
+        'Verified': report.valid,
+        'Violations': len(report.violations),
+        'Mean utilization (%)': 100.0 * report.mean_utilization,
+        'Idle time': report.idle_time,
+        'Total flow time': report.total_flow_time,
+        'Wall time (s)': wall_time,
+    }
+
+
+def run_instance(instance: Dict, rules: List[str], seed: Optional[int] = None, plot_folder: Optional[str] = None,
+                 store_path: Optional[str] = None, stop_at_bound: bool = False, **options) -> List[Dict]:
+    """
+    Run the rules on one instance and return one row per rule. With stop_at_bound the
+    remaining rules are skipped as soon as a schedule reaches the lower bound (it is optimal).
+    Further keyword options (mode, plot_format, dpi, export_folder, export_format, cache_folder,
+    cache_bytes) go to run_pair.
+    """
+    rows = []
+    for rule in rules:
+        rows.append(run_pair(instance, rule, seed, plot_folder, store_path, **options))
+        if stop_at_bound and rows[-1]['Optimal']:
+            break
+    return rows
+
+
+def iter_sweep(instances: List[Dict],
+               rules: List[str],
+               processes: Optional[int] = None,
+               seed: Optional[int] = None,
+               plot_folder: Optional[str] = None,
+               store_path: Optional[str] = None,
+               stop_at_bound: bool = False,
+               skip: Optional[Callable[[Dict, str], bool]] = None,
+               **options) -> Iterator[Dict]:
+    """
+    Yield the result rows of a sweep as soon as they are done: one by one on a single process,
+    per instance (in completion order) on a process pool. skip(instance, rule) excludes pairs,
+    e.g. the ones already in a results file; instances without remaining rules are not loaded.
+    """
+    tasks = [(instance, [rule for rule in rules if skip is None or not skip(instance, rule)]) for instance in instances]
+    tasks = [(instance, instance_rules) for instance, instance_rules in tasks if instance_rules]
+    if not tasks:
+        return
+
+    options = dict(seed=seed, plot_folder=plot_folder, store_path=store_path, **options)
+    processes = processes or os.cpu_count()
+    if processes == 1:
+        for instance, instance_rules in tasks:
+            for rule in instance_rules:
+                row = run_pair(instance, rule, **options)
+                yield row
+                if stop_at_bound and row['Optimal']:
+                    break
+        return
+
+    # All rules of an instance run in the same task so each worker loads it only once
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [executor.submit(run_instance, instance, instance_rules, stop_at_bound=stop_at_bound, **options)
+                   for instance, instance_rules in tasks]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def run_sweep(instances: List[Dict],
+              rules: List[str],
+              processes: Optional[int] = None,
+              seed: Optional[int] = None,
+              plot_folder: Optional[str] = None,
+              store_path: Optional[str] = None,
+              stop_at_bound: bool = False,
+              **options) -> List[Dict]:
+    """
+    Run every (instance, rule) pair on a process pool using all cores by default.
+    Plots are only rendered if a plot_folder is given. With a store_path, workers
+    map the compiled instance store (see src.io.store) instead of parsing text files.
+    With stop_at_bound, the rules of an instance stop once one of them reaches its lower bound.
+    The keyword options of run_pair select the schedule mode (see ArrayDispatcher), the plot
+    format and dpi, an export_folder for the schedules and a cache_folder for deterministic results.
+    Rows are returned in (instance, rule) order.
+    """
+    rows = list(iter_sweep(instances, rules, processes, seed, plot_folder, store_path, stop_at_bound, **options))
+    instance_order = {instance["name"]: index for index, instance in enumerate(instances)}
+    rule_order = {rule: index for index, rule in enumerate(rules)}
+    return sorted(rows, key=lambda row: (instance_order[row['Instance']], rule_order[row['Algorithm']]))
+
+
+def print_sweep_summary(results: List[Dict]) -> None:
+    print(f"{'Instance':<12}{'Algorithm':<10}{'Makespan':>10}{'Reference':>11}{'Gap (%)':>9}{'LB gap (%)':>12}"
+          f"{'Optimal':>9}{'Verified':>10}{'Time (ms)':>11}")
+    for row in results:
+        gap = f"{row['Gap (%)']:.2f}" if row['Gap (%)'] is not None else "-"
+        lower_bound_gap = f"{row['Gap to lower bound (%)']:.2f}" if row['Gap to lower bound (%)'] is not None else "-"
+        reference = row['Reference'] if row['Reference'] is not None else "-"
+        print(f"{row['Instance']:<12}{row['Algorithm']:<10}{row['Makespan']:>10}{reference:>11}{gap:>9}{lower_bound_gap:>12}"
+              f"{str(row['Optimal']):>9}{str(row['Verified']):>10}{row['Wall time (s)'] * 1e3:>11.2f}")
+    optimal_instances = {row['Instance'] for row in results if row['Optimal']}
+    print(f"Schedules at the lower bound (proven optimal) for {len(optimal_instances)} of "
+          f"{len({row['Instance'] for row in results})} instances")
@@ -0,0 +1,268 @@
+import argparse
+import os
+import time
+from typing import Iterator, List, Optional, Tuple
+import numpy as np
+from src.common.array_shop import ArrayJobShop
+
+'''
+Taillard's job shop generator (E. Taillard, Benchmarks for basic scheduling problems, 1993).
+
+The random numbers come from the Lehmer generator seed = 16807 * seed mod (2^31 - 1), computed
+with Schrage's method to stay within 32 bits. A draw in [low, high] is
+low + floor(seed / (2^31 - 1) * (high - low + 1)). For every job, the time seed draws the m
+processing times in [1, 99]; the machine seed then shuffles the identity routing of the job,
+swapping position j with a position drawn in [j, m - 1] for j = 0 .. m - 1.
+
+TaillardRandom follows the published procedure step by step. The vectorized path computes the
+same states with jump-ahead: state k after the seed is seed * 16807^k mod (2^31 - 1), so any block
+of states is one outer product of block starts and powers. Both reproduce ta01-ta80 exactly.
+'''
+
+MODULUS = 2147483647 # 2^31 - 1
+MULTIPLIER = 16807
+SCHRAGE_Q = MODULUS // MULTIPLIER # 127773
+SCHRAGE_R = MODULUS % MULTIPLIER # 2836
+MIN_TIME, MAX_TIME = 1, 99
+
+# (jobs, machines, time seed, machine seed) of the Taillard job shop instances
+TAILLARD_SEEDS = {
+    "ta01": (15, 15, 840612802, 398197754),
+    "ta02": (15, 15, 1314640371, 386720536),
+    "ta03": (15, 15, 1227221349, 316176388),
+    "ta04": (15, 15, 342269428, 1806358582),
+    "ta05": (15, 15, 1603221416, 1501949241),
+    "ta06": (15, 15, 1357584978, 1734077082),
+    "ta07": (15, 15, 44531661, 1374316395),
+    "ta08": (15, 15, 302545136, 2092186050),
+    "ta09": (15, 15, 1153780144, 1393392374),
+    "ta10": (15, 15, 73896786, 1544979948),
+    "ta11": (20, 15, 533484900, 317419073),
+    "ta12": (20, 15, 1894307698, 1474268163),
+    "ta13": (20, 15, 874340513, 509669280),
+    "ta14": (20, 15, 1124986343, 1209573668),
+    "ta15": (20, 15, 1463788335, 529048107),
+    "ta16": (20, 15, 1056908795, 25321885),
+    "ta17": (20, 15, 195672285, 1717580117),
+    "ta18": (20, 15, 961965583, 1353003786),
+    "ta19": (20, 15, 1610169733, 1734469503),
+    "ta20": (20, 15, 532794656, 998486810),
+    "ta21": (20, 20, 1035939303, 773961798),
+    "ta22": (20, 20, 5997802, 1872541150),
+    "ta23": (20, 20, 1357503601, 722225039),
+    "ta24": (20, 20, 806159563, 1166962073),
+    "ta25": (20, 20, 1902815253, 1879990068),
+    "ta26": (20, 20, 1503184031, 1850351876),
+    "ta27": (20, 20, 1032645967, 99711329),
+    "ta28": (20, 20, 229894219, 1158117804),
+    "ta29": (20, 20, 823349822, 108033225),
+    "ta30": (20, 20, 1297900341, 489486403),
+    "ta31": (30, 15, 98640593, 1981283465),
+    "ta32": (30, 15, 1839268120, 248890888),
+    "ta33": (30, 15, 573875290, 2081512253),
+    "ta34": (30, 15, 1670898570, 788294565),
+    "ta35": (30, 15, 1118914567, 1074349202),
+    "ta36": (30, 15, 178750207, 294279708),
+    "ta37": (30, 15, 1549372605, 596993084),
+    "ta38": (30, 15, 798174738, 151685779),
+    "ta39": (30, 15, 553410952, 1329272528),
+    "ta40": (30, 15, 1661531649, 1173386294),
+    "ta41": (30, 20, 1841414609, 1357882888),
+    "ta42": (30, 20, 2116959593, 1546338557),
+    "ta43": (30, 20, 796392706, 1230864158),
+    "ta44": (30, 20, 532496463, 254174057),
+    "ta45": (30, 20, 2020525633, 978943053),
+    "ta46": (30, 20, 524444252, 185526083),
+    "ta47": (30, 20, 1569394691, 487269855),
+    "ta48": (30, 20, 1460267840, 1631446539),
+    "ta49": (30, 20, 198324822, 1937476577),
+    "ta50": (30, 20, 38071822, 1541985579),
+    "ta51": (50, 15, 17271, 718939),
+    "ta52": (50, 15, 660481279, 449650254),
+    "ta53": (50, 15, 352229765, 949737911),
+    "ta54": (50, 15, 1197518780, 166840558),
+    "ta55": (50, 15, 1376020303, 483922052),
+    "ta56": (50, 15, 2106639239, 955932362),
+    "ta57": (50, 15, 1765352082, 1209982549),
+    "ta58": (50, 15, 1105092880, 1349003108),
+    "ta59": (50, 15, 907248070, 919544535),
+    "ta60": (50, 15, 2011630757, 1845447001),
+    "ta61": (50, 20, 8493988, 2738939),
+    "ta62": (50, 20, 1991925010, 709517751),
+    "ta63": (50, 20, 342093237, 786960785),
+    "ta64": (50, 20, 1634043183, 973178279),
+    "ta65": (50, 20, 341706507, 286513148),
+    "ta66": (50, 20, 320167954, 1411193018),
+    "ta67": (50, 20, 1089696753, 298068750),
+    "ta68": (50, 20, 433032965, 1589656152),
+    "ta69": (50, 20, 615974477, 331205412),
+    "ta70": (50, 20, 236150141, 592292984),
+    "ta71": (100, 20, 302034063, 1203569070),
+    "ta72": (100, 20, 1437643198, 1692025209),
+    "ta73": (100, 20, 1792475497, 1039908559),
+    "ta74": (100, 20, 1647273132, 1012841433),
+    "ta75": (100, 20, 696480901, 1689682358),
+    "ta76": (100, 20, 1785569423, 1092647459),
+    "ta77": (100, 20, 117806902, 739059626),
+    "ta78": (100, 20, 1639154709, 1319962509),
+    "ta79": (100, 20, 2007423389, 749368241),
+    "ta80": (100, 20, 682761130, 262763021),
+}
+
+
+class TaillardRandom:
+    """Taillard's random number generator, one draw at a time."""
+
+    def __init__(self, seed: int):
+        self.seed = seed
+
+    def next_state(self) -> int:
+        k = self.seed // SCHRAGE_Q
+        self.seed = MULTIPLIER * (self.seed % SCHRAGE_Q) - k * SCHRAGE_R
+        if self.seed < 0:
+            self.seed += MODULUS
+        return self.seed
+
+    def uniform(self, low: int, high: int) -> int:
+        value_0_1 = self.next_state() / MODULUS
+        return low + int(value_0_1 * (high - low + 1))
+
+
+def generate_job_list(time_seed: int, machine_seed: int, nr_of_jobs: int,
+                      nr_of_machines: int) -> List[List[Tuple[int, int]]]:
+    """Reference implementation: the instance as nested list of (machine_id, processing_time) tuples per job."""
+    times = TaillardRandom(time_seed)
+    processing_times = [[times.uniform(MIN_TIME, MAX_TIME) for _ in range(nr_of_machines)] for _ in range(nr_of_jobs)]
+    machines = TaillardRandom(machine_seed)
+    job_list = []
+    for job_id in range(nr_of_jobs):
+        routing = list(range(nr_of_machines))
+        for j in range(nr_of_machines):
+            k = machines.uniform(j, nr_of_machines - 1)
+            routing[j], routing[k] = routing[k], routing[j]
+        job_list.append(list(zip(routing, processing_times[job_id])))
+    return job_list
+
+
+def _geometric(first: int, ratio: int, count: int) -> np.ndarray:
+    """first * ratio^k mod MODULUS for k = 0 .. count - 1, doubling the array in every step."""
+    values = np.array([first % MODULUS], dtype=np.int64)
+    while len(values) < count:
+        values = np.concatenate((values, values * pow(ratio, len(values), MODULUS) % MODULUS))
+    return values[:count]
+
+
+def lcg_states(seed: int, start: int, count: int, block_size: int = 4096) -> np.ndarray:
+    """The states start + 1 .. start + count after seed, i.e. the ones the draws start + 1 .. use."""
+    if count <= 0:
+        return np.zeros(0, dtype=np.int64)
+    block_size = min(block_size, count)
+    powers = _geometric(MULTIPLIER, MULTIPLIER, block_size) # 16807^1 .. 16807^block_size
+    nr_of_blocks = -(-count // block_size)
+    block_starts = _geometric(seed * pow(MULTIPLIER, start, MODULUS), pow(MULTIPLIER, block_size, MODULUS), nr_of_blocks)
+    # Both factors are below 2^31, so the products fit into int64
+    return (block_starts[:, None] * powers[None, :] % MODULUS).ravel()[:count]
+
+
+def uniform_draws(states: np.ndarray, low, high) -> np.ndarray:
+    """Vectorized uniform(): the same double precision operations as the scalar draw."""
+    return low + np.floor(states / MODULUS * (high - low + 1)).astype(np.int64)
+
+
+def generate_arrays(time_seed: int, machine_seed: int, nr_of_jobs: int, nr_of_machines: int,
+                    first_job: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Machine ids and processing times (both nr_of_jobs x nr_of_machines, in routing order) of the
+    jobs first_job .. first_job + nr_of_jobs - 1 of an instance with these seeds. Every job uses m
+    draws of both generators, so any range of jobs is computed without the jobs before it.
+    """
+    start, count = first_job * nr_of_machines, nr_of_jobs * nr_of_machines
+    processing_times = uniform_draws(lcg_states(time_seed, start, count), MIN_TIME, MAX_TIME)
+    lows = np.tile(np.arange(nr_of_machines), nr_of_jobs)
+    swaps = uniform_draws(lcg_states(machine_seed, start, count), lows, nr_of_machines - 1)
+    swaps = swaps.reshape(nr_of_jobs, nr_of_machines)
+
+    routings = np.tile(np.arange(nr_of_machines, dtype=np.int64), (nr_of_jobs, 1))
+    rows = np.arange(nr_of_jobs)
+    for j in range(nr_of_machines):
+        swapped = routings[rows, swaps[:, j]]
+        routings[rows, swaps[:, j]] = routings[:, j]
+        routings[:, j] = swapped
+    return routings, processing_times.reshape(nr_of_jobs, nr_of_machines)
+
+
+def generate_instance(time_seed: int, machine_seed: int, nr_of_jobs: int, nr_of_machines: int,
+                      name: Optional[str] = None) -> ArrayJobShop:
+    machine_ids, processing_times = generate_arrays(time_seed, machine_seed, nr_of_jobs, nr_of_machines)
+    return ArrayJobShop(machine_ids.ravel(), processing_times.ravel(),
+                        np.arange(nr_of_jobs + 1) * nr_of_machines, nr_of_machines,
+                        name=name, author="Taillard", info=f"time seed {time_seed}, machine seed {machine_seed}")
+
+
+def taillard_instance(name: str) -> ArrayJobShop:
+    """Regenerate one of ta01-ta80 from its seeds."""
+    nr_of_jobs, nr_of_machines, time_seed, machine_seed = TAILLARD_SEEDS[name]
+    return generate_instance(time_seed, machine_seed, nr_of_jobs, nr_of_machines, name=name)
+
+
+def iter_job_blocks(time_seed: int, machine_seed: int, nr_of_jobs: int, nr_of_machines: int,
+                    block_jobs: int = 1000) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Yield (machine ids, processing times) of block_jobs jobs at a time, so memory stays bounded."""
+    for first_job in range(0, nr_of_jobs, block_jobs):
+        yield generate_arrays(time_seed, machine_seed, min(block_jobs, nr_of_jobs - first_job), nr_of_machines,
+                              first_job=first_job)
+
+
+def write_instance_file(file_path: str, time_seed: int, machine_seed: int, nr_of_jobs: int, nr_of_machines: int,
+                        block_jobs: int = 1000) -> None:
+    """Stream an instance into the text format of JobShopGenerator.store_instance, block by block."""
+    folder = os.path.dirname(file_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(file_path, 'w') as file:
+        file.write(f"{nr_of_jobs} {nr_of_machines}\n")
+        for machine_ids, processing_times in iter_job_blocks(time_seed, machine_seed, nr_of_jobs, nr_of_machines,
+                                                             block_jobs):
+            pairs = np.empty((len(machine_ids), 2 * nr_of_machines), dtype=np.int64)
+            pairs[:, 0::2] = machine_ids
+            pairs[:, 1::2] = processing_times
+            np.savetxt(file, pairs, fmt='%d', delimiter=' ')
+
+
+def write_instances_store(store_path: str, instances: List[Tuple[str, int, int, int, int]]) -> None:
+    """Generate (name, time seed, machine seed, jobs, machines) instances into a binary store (see src.io.store)."""
+    from src.io.store import write_store
+    write_store(((name,
+                  {"entry": {"name": name, "jobs": nr_of_jobs, "machines": nr_of_machines, "author": "Taillard",
+                             "info": f"time seed {time_seed}, machine seed {machine_seed}", "path": None}},
+                  generate_instance(time_seed, machine_seed, nr_of_jobs, nr_of_machines, name=name))
+                 for name, time_seed, machine_seed, nr_of_jobs, nr_of_machines in instances), store_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate job shop instances with Taillard's generator")
+    parser.add_argument('--jobs', '-j', type=int, default=5000, help='Number of jobs')
+    parser.add_argument('--machines', '-m', type=int, default=100, help='Number of machines')
+    parser.add_argument('--time_seed', type=int, default=840612802, help='Seed of the processing times')
+    parser.add_argument('--machine_seed', type=int, default=398197754, help='Seed of the routings')
+    parser.add_argument('--count', '-c', type=int, default=1,
+                        help='Number of instances; instance i uses the seeds advanced by i * jobs * machines draws')
+    parser.add_argument('--output', '-o', type=str, default='./data/generated/taillard',
+                        help='Output: a .store file for all instances, otherwise a prefix for one .txt file per instance')
+    args = parser.parse_args()
+
+    # Consecutive instances continue the random streams, so no two of them share numbers
+    draws = args.jobs * args.machines
+    seeds = [(args.time_seed * pow(MULTIPLIER, i * draws, MODULUS) % MODULUS,
+              args.machine_seed * pow(MULTIPLIER, i * draws, MODULUS) % MODULUS) for i in range(args.count)]
+    start = time.perf_counter()
+    if args.output.endswith(".store"):
+        write_instances_store(args.output, [(f"taillard_{args.jobs}x{args.machines}_{i}", time_seed, machine_seed,
+                                             args.jobs, args.machines) for i, (time_seed, machine_seed) in enumerate(seeds)])
+        print(f"Wrote {args.count} instances of {args.jobs}x{args.machines} to {args.output}")
+    else:
+        for i, (time_seed, machine_seed) in enumerate(seeds):
+            file_path = f"{args.output}_{args.jobs}x{args.machines}_{i}.txt"
+            write_instance_file(file_path, time_seed, machine_seed, args.jobs, args.machines)
+            print(f"Wrote {file_path}")
+    print(f"{args.count * draws:,} operations in {time.perf_counter() - start:.2f}s")